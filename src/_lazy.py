@@ -0,0 +1,33 @@
+"""Deferred package exports (PEP 562).
+
+Package ``__init__`` modules map each public name to the submodule defining
+it; the submodule, and whatever heavy dependency it needs (torch,
+scikit-learn, matplotlib, SciPy, requests), is imported on first access.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
+
+
+def lazy_exports(
+    package: str, submodules: Mapping[str, Iterable[str]]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """Return ``(__getattr__, __dir__, __all__)`` for ``package``."""
+
+    owners: Dict[str, str] = {name: module for module, names in submodules.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        module = owners.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f"{package}.{module}"), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(owners))
+
+    return __getattr__, __dir__, sorted(owners)
@@ -1,9 +1,35 @@
-from .inheritance import InheritanceResult, solve_inheritance
-from .structure import nearest_neighbors, similarity_matrix
+from typing import TYPE_CHECKING
 
-__all__ = [
-    "InheritanceResult",
-    "nearest_neighbors",
-    "similarity_matrix",
-    "solve_inheritance",
-]
+from src._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "bootstrap": ["BootstrapResult", "bootstrap_inheritance"],
+        "citation_graph": ["CitationGraph", "build_citation_graph"],
+        "inheritance": [
+            "CompactInheritanceResult",
+            "InheritanceResult",
+            "solve_inheritance",
+            "solve_inheritance_batch",
+        ],
+        "lineage": ["LineageEngine", "inheritance_matrix"],
+        "neighbor_index": ["ExactIndex", "IVFIndex", "NeighborIndex", "evaluate_recall", "recall_at_k"],
+        "parallel": ["solve_inheritance_parallel"],
+        "structure": ["NeighborResult", "nearest_neighbors", "similarity_matrix"],
+    },
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .bootstrap import BootstrapResult, bootstrap_inheritance
+    from .citation_graph import CitationGraph, build_citation_graph
+    from .inheritance import (
+        CompactInheritanceResult,
+        InheritanceResult,
+        solve_inheritance,
+        solve_inheritance_batch,
+    )
+    from .lineage import LineageEngine, inheritance_matrix
+    from .neighbor_index import ExactIndex, IVFIndex, NeighborIndex, evaluate_recall, recall_at_k
+    from .parallel import solve_inheritance_parallel
+    from .structure import NeighborResult, nearest_neighbors, similarity_matrix
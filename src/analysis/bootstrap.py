@@ -0,0 +1,153 @@
+"""Bootstrap confidence intervals for inheritance weights.
+
+Each resample re-fits the focal paper on a bootstrap draw of its parents. The
+parent Gram matrix and linear term are built once; every resample slices its
+sub-Gram from them, starts from the full-set solution and is solved together
+with all other resamples of the same size as one stacked problem.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.analysis.inheritance import (
+    Constraint,
+    InheritanceResult,
+    Method,
+    SparseProjection,
+    _build_result,
+    _check_options,
+    _empty_result,
+    _initial_weights,
+    _lipschitz_step,
+    _project_rows_to_simplex,
+    _solve_gram,
+    _solve_stacked,
+    _validate_problem,
+)
+
+
+@dataclass(frozen=True)
+class BootstrapResult:
+    """Point estimate plus bootstrap distribution of inheritance weights."""
+
+    point: InheritanceResult
+    samples: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    inclusion: np.ndarray
+    confidence: float
+
+
+def bootstrap_inheritance(
+    target_embedding: np.ndarray,
+    parent_matrix: np.ndarray,
+    *,
+    n_resamples: int = 1_000,
+    confidence: float = 0.95,
+    constraint: Constraint = "simplex",
+    sparsity: Optional[int] = None,
+    l2_regularizer: float = 1e-6,
+    max_iter: int = 5_000,
+    learning_rate: Optional[float] = 0.05,
+    tolerance: float = 1e-10,
+    method: Method = "fista",
+    random_state: Optional[int] = None,
+    sparse_projection: SparseProjection = "renormalise",
+) -> BootstrapResult:
+    """Estimate percentile confidence intervals for each parent weight.
+
+    Every resample draws ``p`` parents with replacement and re-fits on the
+    distinct parents drawn; parents left out get weight zero in that sample.
+    ``samples`` is ``(n_resamples, p)``, ``lower``/``upper`` are the
+    ``confidence`` percentile bounds and ``inclusion`` is the fraction of
+    resamples that contained each parent. Solver options match
+    :func:`~src.analysis.inheritance.solve_inheritance`.
+    """
+
+    _check_options(constraint, method, sparse_projection)
+    if n_resamples <= 0:
+        raise ValueError("n_resamples must be a positive integer")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be between 0 and 1")
+
+    target, parents = _validate_problem(target_embedding, parent_matrix)
+    num_parents = parents.shape[1]
+    if num_parents == 0:
+        empty = np.zeros((n_resamples, 0))
+        return BootstrapResult(
+            point=_empty_result(target),
+            samples=empty,
+            lower=np.zeros(0),
+            upper=np.zeros(0),
+            inclusion=np.zeros(0),
+            confidence=confidence,
+        )
+
+    options = dict(
+        constraint=constraint,
+        sparsity=sparsity,
+        l2_regularizer=l2_regularizer,
+        max_iter=max_iter,
+        tolerance=tolerance,
+        sparse_projection=sparse_projection,
+    )
+    gram = parents.T @ parents
+    linear = parents.T @ target
+    full_weights, converged, iterations = _solve_gram(
+        gram,
+        linear,
+        _initial_weights(num_parents, constraint, None),
+        learning_rate=learning_rate,
+        method=method,
+        **options,
+    )
+    point = _build_result(target, parents, full_weights, l2_regularizer, converged, iterations)
+
+    rng = np.random.default_rng(random_state)
+    draws = rng.integers(0, num_parents, size=(n_resamples, num_parents))
+    included = np.zeros((n_resamples, num_parents), dtype=bool)
+    included[np.arange(n_resamples)[:, None], draws] = True
+
+    groups: Dict[int, List[int]] = {}
+    for row, size in enumerate(included.sum(axis=1)):
+        groups.setdefault(int(size), []).append(row)
+
+    samples = np.zeros((n_resamples, num_parents))
+    for size, rows in groups.items():
+        subsets = np.stack([np.flatnonzero(included[row]) for row in rows])
+        sub_gram = gram[subsets[:, :, None], subsets[:, None, :]]
+        sub_linear = linear[subsets]
+        warm = full_weights[subsets]
+        if constraint == "simplex":
+            warm = _project_rows_to_simplex(warm)
+
+        if method == "active_set":
+            fitted = np.stack(
+                [
+                    _solve_gram(g, b, w, learning_rate=learning_rate, method=method, **options)[0]
+                    for g, b, w in zip(sub_gram, sub_linear, warm)
+                ]
+            )
+        else:
+            accelerated = method == "fista"
+            if accelerated or learning_rate is None:
+                step = _lipschitz_step(sub_gram, l2_regularizer)
+            else:
+                step = np.full(len(rows), learning_rate)
+            fitted = _solve_stacked(sub_gram, sub_linear, warm, step=step, accelerated=accelerated, **options)[0]
+        samples[np.asarray(rows)[:, None], subsets] = fitted
+
+    tail = 0.5 * (1.0 - confidence) * 100.0
+    lower, upper = np.percentile(samples, [tail, 100.0 - tail], axis=0)
+    return BootstrapResult(
+        point=point,
+        samples=samples,
+        lower=lower,
+        upper=upper,
+        inclusion=included.mean(axis=0),
+        confidence=confidence,
+    )
@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from typing import Literal, Optional
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
 
 import numpy as np
 
 
 Constraint = Literal["simplex", "nonnegative"]
+Method = Literal["projected_gradient", "fista", "active_set"]
+SparseProjection = Literal["renormalise", "exact"]
 
 
 @dataclass(frozen=True)
@@ -21,82 +24,170 @@ class InheritanceResult:
     objective: float
     converged: bool
     iterations: int
+    solve_time: float = 0.0
 
+    @property
+    def contribution(self) -> float:
+        """Contribution factor ``c_i = 1 - sum_j w_ij`` (mass not explained by parents)."""
 
-def _project_to_simplex(vector: np.ndarray) -> np.ndarray:
-    """Project vector onto the probability simplex."""
+        return 1.0 - float(self.weights.sum())
 
-    if vector.size == 0:
-        return vector
-    sorted_vec = np.sort(vector)[::-1]
-    cumulative = np.cumsum(sorted_vec)
-    rho_candidates = sorted_vec + (1.0 - cumulative) / (np.arange(vector.size) + 1)
-    rho = np.nonzero(rho_candidates > 0)[0]
-    if rho.size == 0:
-        return np.full_like(vector, 1.0 / vector.size)
-    rho_idx = rho[-1]
-    theta = (cumulative[rho_idx] - 1.0) / (rho_idx + 1)
-    projected = np.maximum(vector - theta, 0.0)
-    return projected
-
-
-def _apply_sparsity(weights: np.ndarray, sparsity: Optional[int], constraint: Constraint) -> np.ndarray:
-    """Keep only top-k entries when sparsity is requested."""
-
-    if sparsity is None or sparsity <= 0 or sparsity >= weights.size:
+    def compact(self) -> "CompactInheritanceResult":
+        """Drop the dense vectors, keeping only the non-zero weights."""
+
+        support = np.flatnonzero(self.weights)
+        return CompactInheritanceResult(
+            support=support.astype(np.int32),
+            weights=self.weights[support],
+            num_parents=int(self.weights.size),
+            objective=self.objective,
+            contribution=self.contribution,
+            converged=self.converged,
+            iterations=self.iterations,
+            solve_time=self.solve_time,
+        )
+
+
+@dataclass(frozen=True)
+class CompactInheritanceResult:
+    """Memory-light inheritance result.
+
+    ``support`` holds the columns of the parent matrix with non-zero weight
+    and ``weights`` their values. Reconstruction and residual are recomputed
+    on demand from the parent matrix.
+    """
+
+    support: np.ndarray
+    weights: np.ndarray
+    num_parents: int
+    objective: float
+    contribution: float
+    converged: bool
+    iterations: int
+    solve_time: float = 0.0
+
+    def dense_weights(self) -> np.ndarray:
+        weights = np.zeros(self.num_parents, dtype=float)
+        weights[self.support] = self.weights
         return weights
 
-    keep_idx = np.argpartition(weights, -sparsity)[-sparsity:]
-    sparse_weights = np.zeros_like(weights)
-    sparse_weights[keep_idx] = weights[keep_idx]
+    def reconstruction(self, parent_matrix: np.ndarray) -> np.ndarray:
+        return np.asarray(parent_matrix, dtype=float)[:, self.support] @ self.weights
 
-    if constraint == "simplex":
-        total = sparse_weights.sum()
-        if total > 0:
-            sparse_weights /= total
-        else:
-            sparse_weights = np.full_like(weights, 1.0 / weights.size)
-    return sparse_weights
+    def residual(self, target_embedding: np.ndarray, parent_matrix: np.ndarray) -> np.ndarray:
+        return np.asarray(target_embedding, dtype=float).reshape(-1) - self.reconstruction(parent_matrix)
 
 
-def solve_inheritance(
-    target_embedding: np.ndarray,
-    parent_matrix: np.ndarray,
-    *,
-    constraint: Constraint = "simplex",
-    sparsity: Optional[int] = None,
-    l2_regularizer: float = 1e-6,
-    max_iter: int = 5_000,
-    learning_rate: float = 0.05,
-    tolerance: float = 1e-10,
-    random_state: Optional[int] = None,
-) -> InheritanceResult:
-    """Solve e_i ≈ P_i w_i under simplex/non-negative constraints.
+class _SparseSimplexProjector:
+    """Row-wise projection onto ``{w >= 0, sum(w) == 1, ||w||_0 <= k}``.
 
-    The optimizer uses projected gradient descent with deterministic updates.
+    The ``sum(w) == 1`` part applies to the ``"simplex"`` constraint only, and
+    ``k`` to ``sparsity`` in ``(0, n)``. With ``sparse_projection="exact"``
+    the ``k`` largest entries are selected first and only those are projected,
+    which is the exact Euclidean projection onto the sparse set. The default
+    ``"renormalise"`` projects first, then keeps the top ``k`` and rescales
+    them to sum to one. One descending sort per row gives both the simplex
+    threshold and the ``k``-th largest entry, and all work happens in scratch
+    buffers allocated once for up to ``shape[0]`` rows, so a solver loop can
+    call it without allocating row-sized arrays.
     """
 
-    if constraint not in {"simplex", "nonnegative"}:
-        raise ValueError("constraint must be either 'simplex' or 'nonnegative'")
+    def __init__(
+        self,
+        shape: Tuple[int, int],
+        constraint: Constraint,
+        sparsity: Optional[int],
+        sparse_projection: SparseProjection = "renormalise",
+    ):
+        rows, size = shape
+        self.simplex = constraint == "simplex"
+        self.k = sparsity if sparsity is not None and 0 < sparsity < size else None
+        self.exact = sparse_projection == "exact"
+        self._sorted = np.empty(shape)
+        self._thresholds = np.empty(shape)
+        self._drop = np.empty(shape, dtype=bool)
+        self._counts = np.arange(1.0, size + 1.0)
+        self._views = (-1, ())
+
+    def _buffers(self, rows: int) -> Tuple[np.ndarray, ...]:
+        """Buffer views for ``rows`` rows, cached because solver loops repeat the same count."""
 
+        if self._views[0] != rows:
+            width = self.k if self.exact and self.k is not None else self._sorted.shape[1]
+            self._views = (rows, (self._sorted[:rows], self._thresholds[:rows, :width], self._drop[:rows]))
+        return self._views[1]
+
+    def _drop_below_kth(self, values: np.ndarray, ordered: np.ndarray, drop: np.ndarray) -> None:
+        """Mark all but the ``k`` largest entries of each row, keeping the earliest of tied entries."""
+
+        kth = ordered[:, self.k - 1, None]
+        np.less(values, kth, out=drop)
+        if (ordered[:, self.k] == kth[:, 0]).any():
+            ties = values == kth
+            ties &= np.cumsum(ties, axis=1) <= self.k - (values > kth).sum(axis=1, keepdims=True)
+            np.less_equal(values, kth, out=drop)
+            drop &= ~ties
+
+    def __call__(self, values: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Project ``values`` (``(rows, n)``) into ``out``, which may be ``values`` itself."""
+
+        ordered, thresholds, drop = self._buffers(values.shape[0])
+        if self.simplex or self.k is not None:
+            np.copyto(ordered, values)
+            ordered.sort(axis=1)
+            ordered = ordered[:, ::-1]
+        if self.k is not None:
+            self._drop_below_kth(values, ordered, drop)
+        if self.simplex:
+            # theta = max_j (sum of the j largest entries - 1) / j
+            width = thresholds.shape[1]
+            np.add.accumulate(ordered[:, :width], axis=1, out=thresholds)
+            thresholds -= 1.0
+            thresholds /= self._counts[:width]
+            np.subtract(values, thresholds.max(axis=1, keepdims=True), out=out)
+        elif out is not values:
+            np.copyto(out, values)
+        np.maximum(out, 0.0, out=out)
+        if self.k is not None:
+            np.copyto(out, 0.0, where=drop)
+            if self.simplex and not self.exact:
+                out /= out.sum(axis=1, keepdims=True)
+        return out
+
+
+def _project_rows_to_simplex(matrix: np.ndarray) -> np.ndarray:
+    """Project each row of a ``(batch, n)`` array onto the probability simplex."""
+
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.shape[1] == 0:
+        return matrix
+    return _SparseSimplexProjector(matrix.shape, "simplex", None)(matrix, np.empty_like(matrix))
+
+
+def _project_to_simplex(vector: np.ndarray) -> np.ndarray:
+    """Project vector onto the probability simplex."""
+
+    if vector.size == 0:
+        return vector
+    return _project_rows_to_simplex(vector[None, :])[0]
+
+
+def _validate_problem(
+    target_embedding: np.ndarray, parent_matrix: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
     target = np.asarray(target_embedding, dtype=float).reshape(-1)
     parents = np.asarray(parent_matrix, dtype=float)
     if parents.ndim == 1:
         parents = parents.reshape(-1, 1)
     if parents.shape[0] != target.shape[0]:
         raise ValueError("parent_matrix rows must match target embedding size")
+    return target, parents
 
-    num_parents = parents.shape[1]
-    if num_parents == 0:
-        residual = target.copy()
-        return InheritanceResult(
-            weights=np.zeros(0, dtype=float),
-            residual=residual,
-            reconstruction=np.zeros_like(target),
-            objective=0.5 * float(np.dot(residual, residual)),
-            converged=True,
-            iterations=0,
-        )
+
+def _initial_weights(
+    num_parents: int, constraint: Constraint, random_state: Optional[int]
+) -> np.ndarray:
+    """Deterministic starting point shared by the single and batched solvers."""
 
     # Deterministic initialization: seed only controls tiny perturbation in rare flat regions.
     if constraint == "simplex":
@@ -111,39 +202,530 @@ def solve_inheritance(
             weights = _project_to_simplex(weights)
         else:
             weights = np.maximum(weights, 0.0)
+    return weights
 
-    gram = parents.T @ parents
-    linear = parents.T @ target
-    converged = False
 
-    for iteration in range(1, max_iter + 1):
-        gradient = gram @ weights - linear + l2_regularizer * weights
-        candidate = weights - learning_rate * gradient
+def _warm_start(initial_weights: np.ndarray, num_parents: int, constraint: Constraint) -> np.ndarray:
+    """Project caller-supplied starting weights onto the feasible set."""
 
-        if constraint == "simplex":
-            candidate = _project_to_simplex(candidate)
-        else:
-            candidate = np.maximum(candidate, 0.0)
+    weights = np.array(initial_weights, dtype=float).reshape(-1)
+    if weights.size != num_parents:
+        raise ValueError("initial_weights must have one entry per parent")
+    if constraint == "simplex":
+        return _project_to_simplex(weights)
+    return np.maximum(weights, 0.0)
 
-        candidate = _apply_sparsity(candidate, sparsity, constraint)
 
-        delta = np.linalg.norm(candidate - weights, ord=2)
-        weights = candidate
-        if delta <= tolerance:
-            converged = True
-            break
+def _empty_result(target: np.ndarray) -> InheritanceResult:
+    """Result for a paper with no parents: everything is residual."""
+
+    residual = target.copy()
+    return InheritanceResult(
+        weights=np.zeros(0, dtype=float),
+        residual=residual,
+        reconstruction=np.zeros_like(target),
+        objective=0.5 * float(np.dot(residual, residual)),
+        converged=True,
+        iterations=0,
+    )
+
 
+def _build_result(
+    target: np.ndarray,
+    parents: np.ndarray,
+    weights: np.ndarray,
+    l2_regularizer: float,
+    converged: bool,
+    iterations: int,
+    solve_time: float = 0.0,
+) -> InheritanceResult:
     reconstruction = parents @ weights
     residual = target - reconstruction
     objective = 0.5 * float(np.dot(residual, residual)) + 0.5 * l2_regularizer * float(
         np.dot(weights, weights)
     )
-
     return InheritanceResult(
         weights=weights,
         residual=residual,
         reconstruction=reconstruction,
         objective=objective,
         converged=converged,
-        iterations=iteration,
+        iterations=iterations,
+        solve_time=solve_time,
     )
+
+
+def _solve_stacked(
+    gram: np.ndarray,
+    linear: np.ndarray,
+    weights: np.ndarray,
+    *,
+    constraint: Constraint,
+    sparsity: Optional[int],
+    l2_regularizer: float,
+    max_iter: int,
+    step: np.ndarray,
+    tolerance: float,
+    accelerated: bool = False,
+    sparse_projection: SparseProjection = "renormalise",
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Run projected gradient (or FISTA) on ``batch`` stacked problems of equal size.
+
+    ``gram`` is ``(batch, n, n)``, ``linear`` and ``weights`` are ``(batch, n)``
+    and ``step`` is ``(batch,)``. Each problem stops updating as soon as it
+    meets ``tolerance``, so its trajectory matches a standalone solve. Returns
+    ``(weights, converged, iterations)``.
+    """
+
+    weights = np.array(weights, dtype=float)
+    batch, size = weights.shape
+    converged = np.zeros(batch, dtype=bool)
+    iterations = np.zeros(batch, dtype=int)
+    projector = _SparseSimplexProjector(weights.shape, constraint, sparsity, sparse_projection)
+
+    # Iterates live in buffers allocated once; finished rows are compacted to the front.
+    current, point = weights.copy(), weights.copy()
+    candidate, gradient, change, lookahead = (np.empty_like(weights) for _ in range(4))
+    active = np.arange(batch)
+    active_hessian = gram + l2_regularizer * np.eye(size)
+    active_linear, active_step = linear, np.asarray(step, dtype=float)
+    momentum = np.ones(batch)
+    rows = batch
+    for iteration in range(1, max_iter + 1):
+        cur, pt, cand, grad, chg = current[:rows], point[:rows], candidate[:rows], gradient[:rows], change[:rows]
+        np.matmul(active_hessian, pt[..., None], out=grad[..., None])
+        grad -= active_linear
+        np.multiply(grad, -active_step[:, None], out=cand)
+        cand += pt
+        projector(cand, out=cand)
+
+        np.subtract(cand, cur, out=chg)
+        delta = np.linalg.norm(chg, ord=2, axis=1)
+        if accelerated:
+            ahead = lookahead[:rows]
+            np.subtract(pt, cand, out=ahead)
+            restart = np.einsum("ij,ij->i", ahead, chg) > 0
+            momentum[restart] = 1.0
+            next_momentum = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * momentum**2))
+            np.multiply(chg, ((momentum - 1.0) / next_momentum)[:, None], out=pt)
+            pt += cand
+            momentum = next_momentum
+        else:
+            np.copyto(pt, cand)
+        np.copyto(cur, cand)
+        iterations[active] = iteration
+        done = delta <= tolerance
+        if done.any():
+            weights[active[done]] = cur[done]
+            converged[active[done]] = True
+            keep = ~done
+            active = active[keep]
+            if active.size == 0:
+                break
+            current[: active.size] = cur[keep]
+            point[: active.size] = pt[keep]
+            rows = active.size
+            active_hessian, active_linear, active_step = active_hessian[keep], active_linear[keep], active_step[keep]
+            momentum = momentum[keep]
+
+    if active.size:
+        weights[active] = current[:rows]
+    return weights, converged, iterations
+
+
+def _solve_projected(
+    gram: np.ndarray,
+    linear: np.ndarray,
+    weights: np.ndarray,
+    *,
+    constraint: Constraint,
+    sparsity: Optional[int],
+    l2_regularizer: float,
+    max_iter: int,
+    step: float,
+    tolerance: float,
+    accelerated: bool = False,
+    sparse_projection: SparseProjection = "renormalise",
+) -> Tuple[np.ndarray, bool, int]:
+    """Projected gradient, or FISTA with gradient-based restart when ``accelerated``."""
+
+    weights = np.array(weights, dtype=float)
+    size = weights.size
+    hessian = gram + l2_regularizer * np.eye(size)
+    projector = _SparseSimplexProjector((1, size), constraint, sparsity, sparse_projection)
+    point = weights.copy()
+    candidate, gradient, change, lookahead = (np.empty(size) for _ in range(4))
+    converged = False
+    momentum = 1.0
+    for iteration in range(1, max_iter + 1):
+        np.matmul(hessian, point, out=gradient)
+        gradient -= linear
+        np.multiply(gradient, -step, out=candidate)
+        candidate += point
+        projector(candidate[None, :], out=candidate[None, :])
+
+        np.subtract(candidate, weights, out=change)
+        delta = np.linalg.norm(change, ord=2)
+        if accelerated:
+            np.subtract(point, candidate, out=lookahead)
+            if np.dot(lookahead, change) > 0:
+                momentum = 1.0
+            next_momentum = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * momentum**2))
+            np.multiply(change, (momentum - 1.0) / next_momentum, out=point)
+            point += candidate
+            momentum = next_momentum
+        else:
+            np.copyto(point, candidate)
+        weights, candidate = candidate, weights
+        if delta <= tolerance:
+            converged = True
+            break
+
+    return weights, converged, iteration
+
+
+def _solve_equality_qp(hessian: np.ndarray, linear: np.ndarray, simplex: bool) -> np.ndarray:
+    """Minimise ``0.5 w'Hw - b'w`` (subject to ``sum(w) == 1`` when ``simplex``)."""
+
+    size = linear.size
+    if simplex:
+        system = np.zeros((size + 1, size + 1))
+        system[:size, :size] = hessian
+        system[:size, size] = 1.0
+        system[size, :size] = 1.0
+        rhs = np.append(linear, 1.0)
+    else:
+        system, rhs = hessian, linear
+    try:
+        solution = np.linalg.solve(system, rhs)
+    except np.linalg.LinAlgError:
+        solution = np.linalg.lstsq(system, rhs, rcond=None)[0]
+    return solution[:size]
+
+
+def _solve_active_set(
+    gram: np.ndarray,
+    linear: np.ndarray,
+    *,
+    constraint: Constraint,
+    l2_regularizer: float,
+    max_iter: int,
+    tolerance: float,
+) -> Tuple[np.ndarray, bool, int]:
+    """Exact primal active-set solver for the NNLS / simplex-constrained QP.
+
+    Suited to small parent sets: each iteration solves the KKT system on the
+    current free set, then either steps to the nearest blocking bound or frees
+    the bound weight with the most negative multiplier.
+    """
+
+    size = linear.size
+    simplex = constraint == "simplex"
+    hessian = gram + l2_regularizer * np.eye(size)
+    scale = max(1.0, float(np.abs(linear).max()), float(np.abs(hessian).max()))
+    if simplex:
+        weights = np.full(size, 1.0 / size)
+        free = np.ones(size, dtype=bool)
+    else:
+        weights = np.zeros(size, dtype=float)
+        free = np.zeros(size, dtype=bool)
+
+    converged = False
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        idx = np.flatnonzero(free)
+        candidate = np.zeros(size)
+        if idx.size:
+            candidate[idx] = _solve_equality_qp(hessian[np.ix_(idx, idx)], linear[idx], simplex)
+
+        if np.all(candidate[idx] >= 0.0):
+            weights = candidate
+            gradient = hessian @ weights - linear
+            multipliers = gradient - gradient[idx].mean() if simplex and idx.size else gradient
+            bound = np.flatnonzero(~free)
+            if bound.size == 0 or multipliers[bound].min() >= -tolerance * scale:
+                converged = True
+                break
+            free[bound[np.argmin(multipliers[bound])]] = True
+        else:
+            direction = candidate - weights
+            blocking = idx[candidate[idx] < 0.0]
+            ratios = weights[blocking] / (weights[blocking] - candidate[blocking])
+            leaving = blocking[np.argmin(ratios)]
+            weights = np.maximum(weights + ratios.min() * direction, 0.0)
+            weights[leaving] = 0.0
+            free[leaving] = False
+
+    return weights, converged, iteration
+
+
+def _lipschitz_step(gram: np.ndarray, l2_regularizer: float) -> np.ndarray:
+    """Return ``1 / L`` with ``L`` the spectral norm of the (stacked) regularised Gram."""
+
+    lipschitz = np.linalg.norm(gram, ord=2, axis=(-2, -1)) + l2_regularizer
+    return 1.0 / np.maximum(lipschitz, np.finfo(float).tiny)
+
+
+def _check_options(constraint: str, method: str, sparse_projection: str = "renormalise") -> None:
+    if constraint not in {"simplex", "nonnegative"}:
+        raise ValueError("constraint must be either 'simplex' or 'nonnegative'")
+    if method not in {"projected_gradient", "fista", "active_set"}:
+        raise ValueError("method must be one of 'projected_gradient', 'fista' or 'active_set'")
+    if sparse_projection not in {"renormalise", "exact"}:
+        raise ValueError("sparse_projection must be either 'renormalise' or 'exact'")
+
+
+def _solve_gram(
+    gram: np.ndarray,
+    linear: np.ndarray,
+    weights: np.ndarray,
+    *,
+    constraint: Constraint,
+    sparsity: Optional[int],
+    l2_regularizer: float,
+    max_iter: int,
+    learning_rate: Optional[float],
+    tolerance: float,
+    method: Method,
+    sparse_projection: SparseProjection = "renormalise",
+) -> Tuple[np.ndarray, bool, int]:
+    """Dispatch a single Gram-form problem to the requested solver."""
+
+    if method == "active_set":
+        weights, converged, iterations = _solve_active_set(
+            gram,
+            linear,
+            constraint=constraint,
+            l2_regularizer=l2_regularizer,
+            max_iter=max_iter,
+            tolerance=tolerance,
+        )
+        if sparsity is None or sparsity <= 0 or np.count_nonzero(weights) <= sparsity:
+            return weights, converged, iterations
+        # Exact refit on the k strongest parents of the unconstrained-support solution.
+        support = np.sort(np.argpartition(weights, -sparsity)[-sparsity:])
+        sub_weights, converged, extra = _solve_active_set(
+            gram[np.ix_(support, support)],
+            linear[support],
+            constraint=constraint,
+            l2_regularizer=l2_regularizer,
+            max_iter=max_iter,
+            tolerance=tolerance,
+        )
+        weights = np.zeros_like(weights)
+        weights[support] = sub_weights
+        return weights, converged, iterations + extra
+
+    accelerated = method == "fista"
+    step = float(_lipschitz_step(gram, l2_regularizer)) if accelerated or learning_rate is None else learning_rate
+    return _solve_projected(
+        gram,
+        linear,
+        weights,
+        constraint=constraint,
+        sparsity=sparsity,
+        l2_regularizer=l2_regularizer,
+        max_iter=max_iter,
+        step=step,
+        tolerance=tolerance,
+        accelerated=accelerated,
+        sparse_projection=sparse_projection,
+    )
+
+
+def solve_inheritance(
+    target_embedding: np.ndarray,
+    parent_matrix: np.ndarray,
+    *,
+    constraint: Constraint = "simplex",
+    sparsity: Optional[int] = None,
+    l2_regularizer: float = 1e-6,
+    max_iter: int = 5_000,
+    learning_rate: Optional[float] = 0.05,
+    tolerance: float = 1e-10,
+    random_state: Optional[int] = None,
+    method: Method = "projected_gradient",
+    initial_weights: Optional[np.ndarray] = None,
+    compact: bool = False,
+    sparse_projection: SparseProjection = "renormalise",
+) -> InheritanceResult | CompactInheritanceResult:
+    """Solve e_i ≈ P_i w_i under simplex/non-negative constraints.
+
+    ``method`` selects the optimizer:
+
+    * ``"projected_gradient"`` – deterministic projected gradient descent with a
+      fixed ``learning_rate`` (``None`` uses ``1 / L``, where ``L`` is the
+      spectral norm of the regularised parent Gram matrix).
+    * ``"fista"`` – Nesterov-accelerated projected gradient with step ``1 / L``
+      and adaptive restart; ``learning_rate`` is ignored.
+    * ``"active_set"`` – exact active-set NNLS / simplex QP, best for small
+      parent sets. With ``sparsity`` the exact fit is repeated on the top-k
+      parents.
+
+    ``sparsity`` caps the number of non-zero weights. By default every
+    iterate is projected onto the feasible set and then truncated to its
+    ``sparsity`` largest weights (renormalised under ``"simplex"``);
+    ``sparse_projection="exact"`` instead uses the exact projection onto the
+    sparse feasible set (top ``sparsity`` entries of the gradient step,
+    projected alone). It has no effect on ``"active_set"``.
+
+    ``initial_weights`` warm-starts the iterative methods, e.g. from the
+    weights of a previous fit after an incremental corpus update; it is
+    projected onto the feasible set first and ignored by ``"active_set"``.
+    With ``compact=True`` a :class:`CompactInheritanceResult` is returned.
+
+    The result records the iteration count and wall-clock ``solve_time``.
+    """
+
+    _check_options(constraint, method, sparse_projection)
+
+    target, parents = _validate_problem(target_embedding, parent_matrix)
+
+    num_parents = parents.shape[1]
+    if num_parents == 0:
+        result = _empty_result(target)
+        return result.compact() if compact else result
+
+    started = time.perf_counter()
+    if initial_weights is not None:
+        weights = _warm_start(initial_weights, num_parents, constraint)
+    else:
+        weights = _initial_weights(num_parents, constraint, random_state)
+
+    gram = parents.T @ parents
+    linear = parents.T @ target
+    weights, converged, iterations = _solve_gram(
+        gram,
+        linear,
+        weights,
+        constraint=constraint,
+        sparsity=sparsity,
+        l2_regularizer=l2_regularizer,
+        max_iter=max_iter,
+        learning_rate=learning_rate,
+        tolerance=tolerance,
+        method=method,
+        sparse_projection=sparse_projection,
+    )
+    solve_time = time.perf_counter() - started
+
+    result = _build_result(target, parents, weights, l2_regularizer, converged, iterations, solve_time)
+    return result.compact() if compact else result
+
+
+def solve_inheritance_batch(
+    target_embeddings: Sequence[np.ndarray] | np.ndarray,
+    parent_matrices: Sequence[np.ndarray],
+    *,
+    constraint: Constraint = "simplex",
+    sparsity: Optional[int] = None,
+    l2_regularizer: float = 1e-6,
+    max_iter: int = 5_000,
+    learning_rate: Optional[float] = 0.05,
+    tolerance: float = 1e-10,
+    random_state: Optional[int] = None,
+    method: Method = "projected_gradient",
+    batch_size: int = 4_096,
+    initial_weights: Optional[Sequence[Optional[np.ndarray]]] = None,
+    compact: bool = False,
+    sparse_projection: SparseProjection = "renormalise",
+) -> List[InheritanceResult] | List[CompactInheritanceResult]:
+    """Solve many inheritance problems at once.
+
+    ``parent_matrices[i]`` is the ``(d, p_i)`` parent matrix for
+    ``target_embeddings[i]``; parent counts may differ. Problems are grouped by
+    parent count and the projected-gradient (or FISTA) updates run as stacked
+    NumPy operations over at most ``batch_size`` problems at a time. The
+    ``"active_set"`` method solves each problem in turn. Each returned
+    :class:`InheritanceResult` matches :func:`solve_inheritance` called with the
+    same arguments on that paper alone; ``solve_time`` is the chunk time shared
+    evenly across its problems. ``initial_weights[i]`` (``None`` for a cold
+    start), ``compact`` and ``sparse_projection`` behave as in
+    :func:`solve_inheritance`.
+    """
+
+    _check_options(constraint, method, sparse_projection)
+    if len(target_embeddings) != len(parent_matrices):
+        raise ValueError("target_embeddings and parent_matrices must have the same length")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer")
+    if initial_weights is not None and len(initial_weights) != len(parent_matrices):
+        raise ValueError("initial_weights must have one entry per problem")
+
+    problems = [
+        _validate_problem(target, parents) for target, parents in zip(target_embeddings, parent_matrices)
+    ]
+    if method == "active_set":
+        options = dict(
+            constraint=constraint,
+            sparsity=sparsity,
+            l2_regularizer=l2_regularizer,
+            max_iter=max_iter,
+            tolerance=tolerance,
+            random_state=random_state,
+            method=method,
+            compact=compact,
+        )
+        return [solve_inheritance(target, parents, **options) for target, parents in problems]
+
+    results: List[Optional[InheritanceResult | CompactInheritanceResult]] = [None] * len(problems)
+
+    groups: Dict[int, List[int]] = {}
+    for idx, (_, parents) in enumerate(problems):
+        groups.setdefault(parents.shape[1], []).append(idx)
+
+    accelerated = method == "fista"
+    for num_parents, members in sorted(groups.items()):
+        if num_parents == 0:
+            for idx in members:
+                result = _empty_result(problems[idx][0])
+                results[idx] = result.compact() if compact else result
+            continue
+
+        start_weights = _initial_weights(num_parents, constraint, random_state)
+        for start in range(0, len(members), batch_size):
+            started = time.perf_counter()
+            chunk = members[start : start + batch_size]
+            stacked_parents = np.stack([problems[idx][1] for idx in chunk])
+            stacked_targets = np.stack([problems[idx][0] for idx in chunk])
+            parents_t = stacked_parents.transpose(0, 2, 1)
+            gram = np.matmul(parents_t, stacked_parents)
+            linear = np.matmul(parents_t, stacked_targets[..., None])[..., 0]
+            if accelerated or learning_rate is None:
+                step = _lipschitz_step(gram, l2_regularizer)
+            else:
+                step = np.full(len(chunk), learning_rate)
+            chunk_weights = np.tile(start_weights, (len(chunk), 1))
+            if initial_weights is not None:
+                for row, idx in enumerate(chunk):
+                    if initial_weights[idx] is not None:
+                        chunk_weights[row] = _warm_start(initial_weights[idx], num_parents, constraint)
+
+            weights, converged, iterations = _solve_stacked(
+                gram,
+                linear,
+                chunk_weights,
+                constraint=constraint,
+                sparsity=sparsity,
+                l2_regularizer=l2_regularizer,
+                max_iter=max_iter,
+                step=step,
+                tolerance=tolerance,
+                accelerated=accelerated,
+                sparse_projection=sparse_projection,
+            )
+            solve_time = (time.perf_counter() - started) / len(chunk)
+            for row, idx in enumerate(chunk):
+                target, parents = problems[idx]
+                result = _build_result(
+                    target,
+                    parents,
+                    weights[row],
+                    l2_regularizer,
+                    bool(converged[row]),
+                    int(iterations[row]),
+                    solve_time,
+                )
+                results[idx] = result.compact() if compact else result
+
+    return results  # type: ignore[return-value]
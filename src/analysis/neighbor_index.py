@@ -0,0 +1,347 @@
+"""Persistent cosine nearest-neighbour indexes.
+
+:class:`ExactIndex` is a blocked brute-force search. :class:`IVFIndex` is a
+pure-NumPy inverted-file index: a spherical k-means coarse quantiser splits the
+corpus into ``n_lists`` cells and each query only scans its ``n_probe`` closest
+cells. Both support incremental ``add``, batched ``search`` and ``save``/``load``,
+and :func:`evaluate_recall` measures an approximate index against the exact one.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Type, Union
+
+import numpy as np
+
+
+DEFAULT_QUERY_BLOCK = 1_024
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return matrix / norms
+
+
+def _top_k(scores: np.ndarray, candidates: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Pick the ``k`` best-scoring candidates per row, ties broken by lower index."""
+
+    if scores.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, keep, axis=1)
+        candidates = np.take_along_axis(candidates, keep, axis=1)
+    order = np.lexsort((candidates, -scores), axis=1)
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(candidates, order, axis=1)
+
+
+def _reserve(buffer: np.ndarray, size: int, needed: int) -> np.ndarray:
+    """``buffer`` if it has room for ``needed`` rows, else a copy of its first ``size`` rows with doubled capacity."""
+
+    if needed <= buffer.shape[0]:
+        return buffer
+    grown = np.empty((max(needed, 2 * buffer.shape[0]),) + buffer.shape[1:], dtype=buffer.dtype)
+    grown[:size] = buffer[:size]
+    return grown
+
+
+class NeighborIndex(ABC):
+    """Base class for cosine-distance neighbour indexes.
+
+    Vectors live in a buffer whose capacity doubles when full, so a long run
+    of small ``add`` calls costs amortised constant time per vector.
+    """
+
+    kind = "base"
+
+    def __init__(self) -> None:
+        self._buffer = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dim(self) -> int:
+        return self._buffer.shape[1]
+
+    @property
+    def _vectors(self) -> np.ndarray:
+        return self._buffer[: self._size]
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Append vectors; their ids continue from the current ``len(index)``."""
+
+        normalised = _normalise(vectors)
+        if len(self) and normalised.shape[1] != self.dim:
+            raise ValueError(f"index stores {self.dim}-d vectors, got {normalised.shape[1]}-d")
+        if not len(self):
+            self._buffer = np.zeros((0, normalised.shape[1]), dtype=np.float32)
+        needed = self._size + normalised.shape[0]
+        self._buffer = _reserve(self._buffer, self._size, needed)
+        self._buffer[self._size : needed] = normalised
+        self._size = needed
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(distances, indices)`` of shape ``(n_queries, k)``.
+
+        Distances are cosine distances (``1 - cosine similarity``). Rows with
+        fewer than ``k`` reachable vectors are padded with index ``-1`` and
+        distance ``inf``.
+        """
+
+        if k <= 0:
+            raise ValueError("k must be a positive integer")
+        normalised = _normalise(queries)
+        distances = np.full((normalised.shape[0], k), np.inf, dtype=np.float32)
+        indices = np.full((normalised.shape[0], k), -1, dtype=np.int64)
+        if len(self):
+            self._search(normalised, k, distances, indices)
+        return distances, indices
+
+    @abstractmethod
+    def _search(self, queries: np.ndarray, k: int, distances: np.ndarray, indices: np.ndarray) -> None:
+        """Fill ``distances``/``indices`` for normalised ``queries`` against a non-empty index."""
+
+    def _state(self) -> Dict[str, Any]:
+        return {"vectors": self._vectors}
+
+    def _restore(self, state: Dict[str, np.ndarray]) -> None:
+        self._buffer = state["vectors"]
+        self._size = self._buffer.shape[0]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the index to a ``.npz`` archive."""
+
+        np.savez(path, kind=np.array(self.kind), **self._state())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "NeighborIndex":
+        """Load any index written by :meth:`save`."""
+
+        with np.load(path, allow_pickle=False) as archive:
+            state = {name: archive[name] for name in archive.files}
+        index_cls = _INDEX_TYPES.get(str(state.pop("kind")))
+        if index_cls is None:
+            raise ValueError("Unknown neighbour index kind in archive")
+        if cls is not NeighborIndex and index_cls is not cls:
+            raise ValueError(f"Archive holds a {index_cls.__name__}, not a {cls.__name__}")
+        index = index_cls.__new__(index_cls)
+        index._restore(state)
+        return index
+
+
+class ExactIndex(NeighborIndex):
+    """Brute-force cosine search over query blocks."""
+
+    kind = "exact"
+
+    def __init__(self, query_block: int = DEFAULT_QUERY_BLOCK) -> None:
+        super().__init__()
+        self.query_block = query_block
+
+    def _search(self, queries: np.ndarray, k: int, distances: np.ndarray, indices: np.ndarray) -> None:
+        width = min(k, len(self))
+        ids = np.arange(len(self))
+        for start in range(0, queries.shape[0], self.query_block):
+            scores = queries[start : start + self.query_block] @ self._vectors.T
+            candidates = np.broadcast_to(ids, scores.shape)
+            best_scores, best_ids = _top_k(scores, candidates, width)
+            distances[start : start + self.query_block, :width] = 1.0 - best_scores
+            indices[start : start + self.query_block, :width] = best_ids
+
+    def _restore(self, state: Dict[str, np.ndarray]) -> None:
+        super()._restore(state)
+        self.query_block = DEFAULT_QUERY_BLOCK
+
+
+def _spherical_kmeans(
+    vectors: np.ndarray, n_clusters: int, n_iter: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Cosine k-means with k-means++ seeding; returns unit-norm centroids."""
+
+    centroids = np.empty((n_clusters, vectors.shape[1]), dtype=np.float32)
+    centroids[0] = vectors[rng.integers(vectors.shape[0])]
+    closest = 1.0 - vectors @ centroids[0]
+    for cluster in range(1, n_clusters):
+        weights = np.maximum(closest, 0.0)
+        total = weights.sum()
+        pick = rng.choice(vectors.shape[0], p=weights / total) if total > 0 else rng.integers(vectors.shape[0])
+        centroids[cluster] = vectors[pick]
+        closest = np.minimum(closest, 1.0 - vectors @ centroids[cluster])
+
+    for _ in range(n_iter):
+        labels = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty = ~np.bincount(labels, minlength=n_clusters).astype(bool)
+        sums[empty] = centroids[empty]
+        updated = _normalise(sums)
+        if np.allclose(updated, centroids, atol=1e-6):
+            centroids = updated
+            break
+        centroids = updated
+    return centroids
+
+
+class IVFIndex(NeighborIndex):
+    """Approximate inverted-file index with a k-means coarse quantiser.
+
+    The quantiser is trained on the first ``add`` (at most ``train_size``
+    vectors) unless :meth:`train` is called explicitly. Raising ``n_probe``
+    trades speed for recall; ``n_probe == n_lists`` is exact.
+    """
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        n_lists: int = 256,
+        n_probe: int = 8,
+        *,
+        n_iter: int = 25,
+        train_size: int = 100_000,
+        random_state: Optional[int] = 0,
+    ) -> None:
+        super().__init__()
+        if n_lists <= 0 or n_probe <= 0:
+            raise ValueError("n_lists and n_probe must be positive integers")
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.train_size = train_size
+        self.random_state = random_state
+        self.centroids: Optional[np.ndarray] = None
+        self._labels = np.zeros(0, dtype=np.int64)
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Fit the coarse quantiser on a sample of ``vectors``."""
+
+        normalised = _normalise(vectors)
+        rng = np.random.default_rng(self.random_state)
+        if normalised.shape[0] > self.train_size:
+            normalised = normalised[rng.choice(normalised.shape[0], self.train_size, replace=False)]
+        n_clusters = min(self.n_lists, normalised.shape[0])
+        self.centroids = _spherical_kmeans(normalised, n_clusters, self.n_iter, rng)
+        if len(self):
+            self._labels = self._assign(self._vectors)
+            self._order = None
+
+    @property
+    def _assignments(self) -> np.ndarray:
+        return self._labels[: len(self)]
+
+    def _assign(self, normalised: np.ndarray) -> np.ndarray:
+        labels = np.empty(normalised.shape[0], dtype=np.int64)
+        for start in range(0, normalised.shape[0], DEFAULT_QUERY_BLOCK):
+            block = normalised[start : start + DEFAULT_QUERY_BLOCK]
+            labels[start : start + DEFAULT_QUERY_BLOCK] = np.argmax(block @ self.centroids.T, axis=1)
+        return labels
+
+    def add(self, vectors: np.ndarray) -> None:
+        if self.centroids is None:
+            self.train(vectors)
+        start = len(self)
+        super().add(vectors)
+        self._labels = _reserve(self._labels, start, len(self))
+        self._labels[start : len(self)] = self._assign(self._vectors[start:])
+        self._order = None
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._order is None:
+            self._order = np.argsort(self._assignments, kind="stable")
+            counts = np.bincount(self._assignments, minlength=self.centroids.shape[0])
+            self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        return self._order, self._offsets
+
+    def _search(self, queries: np.ndarray, k: int, distances: np.ndarray, indices: np.ndarray) -> None:
+        for start in range(0, queries.shape[0], DEFAULT_QUERY_BLOCK):
+            block = slice(start, start + DEFAULT_QUERY_BLOCK)
+            self._search_block(queries[block], k, distances[block], indices[block])
+
+    def _search_block(self, queries: np.ndarray, k: int, distances: np.ndarray, indices: np.ndarray) -> None:
+        """Scan each probed cell once for all queries probing it, then merge per query."""
+
+        order, offsets = self._inverted_lists()
+        n_queries = queries.shape[0]
+        n_probe = min(self.n_probe, self.centroids.shape[0])
+        probes = np.argpartition(-(queries @ self.centroids.T), n_probe - 1, axis=1)[:, :n_probe]
+
+        # Slot (query, p) holds the best k candidates of that query's p-th probed cell.
+        scores = np.full((n_queries, n_probe, k), -np.inf, dtype=np.float32)
+        ids = np.full((n_queries, n_probe, k), -1, dtype=np.int64)
+        cells = probes.ravel()
+        by_cell = np.argsort(cells, kind="stable")
+        bounds = np.searchsorted(cells[by_cell], np.arange(self.centroids.shape[0] + 1))
+        for cell in np.flatnonzero(np.diff(bounds)):
+            members = order[offsets[cell] : offsets[cell + 1]]
+            if members.size == 0:
+                continue
+            rows, slots = np.divmod(by_cell[bounds[cell] : bounds[cell + 1]], n_probe)
+            cell_scores = queries[rows] @ self._vectors[members].T
+            width = min(k, members.size)
+            best_scores, best_ids = _top_k(cell_scores, np.broadcast_to(members, cell_scores.shape), width)
+            scores[rows, slots, :width] = best_scores
+            ids[rows, slots, :width] = best_ids
+
+        best_scores, best_ids = _top_k(scores.reshape(n_queries, -1), ids.reshape(n_queries, -1), k)
+        found = best_ids >= 0
+        distances[found] = 1.0 - best_scores[found]
+        indices[found] = best_ids[found]
+
+    def _state(self) -> Dict[str, Any]:
+        state = super()._state()
+        state.update(
+            centroids=self.centroids if self.centroids is not None else np.zeros((0, 0), dtype=np.float32),
+            assignments=self._assignments,
+            params=np.array([self.n_lists, self.n_probe, self.n_iter, self.train_size]),
+            random_state=np.array(-1 if self.random_state is None else self.random_state),
+        )
+        return state
+
+    def _restore(self, state: Dict[str, np.ndarray]) -> None:
+        super()._restore(state)
+        self.n_lists, self.n_probe, self.n_iter, self.train_size = (int(v) for v in state["params"])
+        seed = int(state["random_state"])
+        self.random_state = None if seed < 0 else seed
+        self.centroids = state["centroids"] if state["centroids"].size else None
+        self._labels = state["assignments"]
+        self._order = None
+        self._offsets = None
+
+
+_INDEX_TYPES: Dict[str, Type[NeighborIndex]] = {
+    ExactIndex.kind: ExactIndex,
+    IVFIndex.kind: IVFIndex,
+}
+
+
+def recall_at_k(approximate: np.ndarray, exact: np.ndarray) -> float:
+    """Mean fraction of each row's exact neighbours found by the approximate search."""
+
+    approximate = np.asarray(approximate)
+    exact = np.asarray(exact)
+    if approximate.shape[0] != exact.shape[0]:
+        raise ValueError("approximate and exact results must have the same number of rows")
+    if exact.size == 0:
+        return 1.0
+    hits = sum(
+        np.intersect1d(found[found >= 0], truth[truth >= 0]).size for found, truth in zip(approximate, exact)
+    )
+    total = int(np.count_nonzero(exact >= 0))
+    return hits / total if total else 1.0
+
+
+def evaluate_recall(index: NeighborIndex, queries: np.ndarray, k: int, reference: Optional[ExactIndex] = None) -> float:
+    """Recall@k of ``index`` against exact search over the same vectors."""
+
+    if reference is None:
+        reference = ExactIndex()
+        reference.add(index._vectors)
+    _, approximate = index.search(queries, k)
+    _, exact = reference.search(queries, k)
+    return recall_at_k(approximate, exact)
@@ -0,0 +1,132 @@
+"""Process-parallel inheritance fitting across a whole corpus.
+
+The corpus embedding matrix is placed in shared memory (or reused directly when
+it is already a file-backed ``np.memmap``) once per run. Tasks only carry focal
+indices and parent index arrays, so parent matrices are never pickled; each
+worker gathers them locally and solves its chunk with
+:func:`~src.analysis.inheritance.solve_inheritance_batch`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.analysis.inheritance import InheritanceResult, solve_inheritance_batch
+
+try:  # Optional; ships with scikit-learn and stops BLAS oversubscription
+    from threadpoolctl import threadpool_limits
+except Exception:  # pragma: no cover - optional dependency
+    threadpool_limits = None
+
+
+Task = List[Tuple[int, np.ndarray]]
+
+_WORKER_EMBEDDINGS: Optional[np.ndarray] = None
+_WORKER_OPTIONS: Dict[str, Any] = {}
+_WORKER_HANDLES: List[Any] = []
+
+
+def _attach_embeddings(source: Tuple[Any, ...]) -> np.ndarray:
+    kind, name, shape, dtype, offset = source
+    if kind == "memmap":
+        return np.memmap(name, dtype=dtype, mode="r", shape=shape, offset=offset)
+    shm = shared_memory.SharedMemory(name=name)
+    _WORKER_HANDLES.append(shm)
+    return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _init_worker(source: Tuple[Any, ...], options: Dict[str, Any], blas_threads: Optional[int]) -> None:
+    global _WORKER_EMBEDDINGS, _WORKER_OPTIONS
+    _WORKER_EMBEDDINGS = _attach_embeddings(source)
+    _WORKER_OPTIONS = options
+    if blas_threads is not None and threadpool_limits is not None:
+        _WORKER_HANDLES.append(threadpool_limits(limits=blas_threads))
+
+
+def _solve_task(
+    embeddings: np.ndarray, task: Task, options: Dict[str, Any]
+) -> List[Tuple[int, InheritanceResult]]:
+    targets = [embeddings[focal] for focal, _ in task]
+    parent_matrices = [embeddings[parents].T for _, parents in task]
+    results = solve_inheritance_batch(targets, parent_matrices, **options)
+    return [(focal, result) for (focal, _), result in zip(task, results)]
+
+
+def _worker_solve(task: Task) -> List[Tuple[int, InheritanceResult]]:
+    return _solve_task(_WORKER_EMBEDDINGS, task, _WORKER_OPTIONS)
+
+
+def _chunk_tasks(
+    parent_indices: Sequence[Sequence[int]], focal_indices: Sequence[int], chunk_size: int
+) -> Iterator[Task]:
+    for start in range(0, len(focal_indices), chunk_size):
+        yield [
+            (int(focal), np.asarray(parent_indices[focal], dtype=np.int64))
+            for focal in focal_indices[start : start + chunk_size]
+        ]
+
+
+def solve_inheritance_parallel(
+    embeddings: np.ndarray,
+    parent_indices: Sequence[Sequence[int]],
+    focal_indices: Optional[Sequence[int]] = None,
+    *,
+    n_workers: Optional[int] = None,
+    chunk_size: int = 256,
+    blas_threads: Optional[int] = 1,
+    mp_context: Optional[str] = None,
+    **solver_options: Any,
+) -> Iterator[Tuple[int, InheritanceResult]]:
+    """Fit inheritance weights for many focal papers on a process pool.
+
+    ``embeddings`` is the ``(n, d)`` corpus matrix and ``parent_indices[i]``
+    lists the rows of paper ``i``'s parents. ``focal_indices`` defaults to every
+    paper. Results are yielded as ``(focal_index, result)`` pairs in
+    ``focal_indices`` order as chunks complete. Chunk boundaries depend only on
+    ``chunk_size``, so output is identical for any ``n_workers``.
+    ``solver_options`` are forwarded to :func:`solve_inheritance_batch`.
+    """
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    if focal_indices is None:
+        focal_indices = range(len(parent_indices))
+    workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+    tasks = _chunk_tasks(parent_indices, focal_indices, chunk_size)
+
+    if workers <= 1:
+        matrix = np.asarray(embeddings)
+        for task in tasks:
+            yield from _solve_task(matrix, task, solver_options)
+        return
+
+    shm: Optional[shared_memory.SharedMemory] = None
+    if (
+        isinstance(embeddings, np.memmap)
+        and isinstance(embeddings.base, mmap.mmap)
+        and embeddings.flags.c_contiguous
+    ):
+        source = ("memmap", embeddings.filename, embeddings.shape, embeddings.dtype.str, embeddings.offset)
+    else:
+        matrix = np.ascontiguousarray(embeddings)
+        shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)[...] = matrix
+        source = ("shm", shm.name, matrix.shape, matrix.dtype.str, 0)
+
+    context = multiprocessing.get_context(mp_context)
+    try:
+        with context.Pool(
+            processes=workers, initializer=_init_worker, initargs=(source, solver_options, blas_threads)
+        ) as pool:
+            for results in pool.imap(_worker_solve, tasks):
+                yield from results
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
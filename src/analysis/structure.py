@@ -2,33 +2,179 @@
 
 from __future__ import annotations
 
-from typing import Iterable, List, Tuple
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.neighbors import NearestNeighbors
 
+from src.analysis.neighbor_index import ExactIndex, NeighborIndex
 from src.models import Paper
 
+if TYPE_CHECKING:  # pragma: no cover
+    from scipy import sparse
 
-def similarity_matrix(embeddings: np.ndarray) -> np.ndarray:
-    """Compute a cosine similarity matrix for the embedding space."""
 
-    return cosine_similarity(embeddings)
+DEFAULT_BLOCK_SIZE = 1_024
+
+
+def _normalise_rows(embeddings: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """L2-normalise rows; all-zero rows stay zero like sklearn's ``normalize``."""
+
+    matrix = np.asarray(embeddings, dtype=dtype)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return matrix / norms
+
+
+def _block_rows(
+    num_rows: int, row_bytes: int, block_size: Optional[int], memory_budget: Optional[int]
+) -> int:
+    rows = block_size or DEFAULT_BLOCK_SIZE
+    if memory_budget is not None:
+        rows = min(rows, memory_budget // max(row_bytes, 1))
+        if rows < 1:
+            raise ValueError("memory_budget is too small to hold a single row of the similarity matrix")
+    return max(1, min(rows, num_rows))
+
+
+def similarity_matrix(
+    embeddings: np.ndarray,
+    *,
+    dtype: Union[str, np.dtype, type] = np.float64,
+    block_size: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    top_k: Optional[int] = None,
+    output_path: Optional[Union[str, Path]] = None,
+) -> Union[np.ndarray, sparse.csr_matrix]:
+    """Compute a cosine similarity matrix for the embedding space.
+
+    Rows are L2-normalised once and the matrix is produced in row tiles of
+    ``block_size`` rows, shrunk further so a tile never exceeds
+    ``memory_budget`` bytes. The result is one of:
+
+    * a dense in-memory array (default), which must itself fit the budget;
+    * a ``.npy`` memory map at ``output_path`` written tile by tile;
+    * with ``top_k``, a CSR matrix keeping the ``top_k`` largest entries of
+      each row (the row's own entry included).
+
+    ``dtype`` sets the working and output precision, e.g. ``np.float32``.
+    ``memory_budget`` covers the tiles, their selection scratch and any dense
+    output; the normalised ``(n, d)`` copy of ``embeddings`` is not counted.
+    """
+
+    if top_k is not None and top_k <= 0:
+        raise ValueError("top_k must be a positive integer")
+    if top_k is not None and output_path is not None:
+        raise ValueError("top_k and output_path cannot be combined")
+
+    dtype = np.dtype(dtype)
+    normalised = _normalise_rows(embeddings, dtype)
+    num_rows = normalised.shape[0]
+    # Each tile row holds n similarities plus, for dense output, one more
+    # temporary row, or for top-k selection the full-width argpartition indices.
+    scratch = np.dtype(np.intp).itemsize if top_k is not None else dtype.itemsize
+    rows = _block_rows(num_rows, num_rows * (dtype.itemsize + scratch), block_size, memory_budget)
+
+    if top_k is not None:
+        return _top_k_similarity(normalised, min(top_k, num_rows), rows)
+
+    if output_path is not None:
+        output = np.lib.format.open_memmap(output_path, mode="w+", dtype=dtype, shape=(num_rows, num_rows))
+    else:
+        if memory_budget is not None and num_rows * num_rows * dtype.itemsize > memory_budget:
+            raise ValueError("dense similarity matrix exceeds memory_budget; use output_path or top_k")
+        output = np.empty((num_rows, num_rows), dtype=dtype)
+
+    for start in range(0, num_rows, rows):
+        np.matmul(normalised[start : start + rows], normalised.T, out=output[start : start + rows])
+    if isinstance(output, np.memmap):
+        output.flush()
+    return output
+
+
+def _top_k_similarity(normalised: np.ndarray, top_k: int, rows: int) -> sparse.csr_matrix:
+    num_rows = normalised.shape[0]
+    indices = np.empty((num_rows, top_k), dtype=np.int64)
+    values = np.empty((num_rows, top_k), dtype=normalised.dtype)
+    for start in range(0, num_rows, rows):
+        tile = normalised[start : start + rows] @ normalised.T
+        keep = indices[start : start + rows]
+        # Copy out of the full-width argpartition result so it is freed at once.
+        keep[...] = np.argpartition(tile, -top_k, axis=1)[:, -top_k:]
+        keep.sort(axis=1)
+        values[start : start + rows] = np.take_along_axis(tile, keep, axis=1)
+        del tile
+
+    from scipy import sparse
+
+    indptr = np.arange(0, num_rows * top_k + 1, top_k, dtype=np.int64)
+    return sparse.csr_matrix(
+        (values.reshape(-1), indices.reshape(-1), indptr), shape=(num_rows, num_rows)
+    )
+
+
+@dataclass(frozen=True)
+class NeighborResult:
+    """Neighbour search output held as ``(n_queries, k)`` index/distance arrays.
+
+    ``indices[r]`` are corpus rows nearest to corpus row ``query_indices[r]``
+    (``-1`` pads rows with fewer than ``k`` neighbours). Indexing or iterating
+    yields ``(Paper, List[Paper])`` pairs, built only when accessed.
+    """
+
+    indices: np.ndarray
+    distances: np.ndarray
+    query_indices: np.ndarray
+    papers: Sequence[Paper]
+
+    def __len__(self) -> int:
+        return self.indices.shape[0]
+
+    def neighbors(self, row: int) -> List[Paper]:
+        return [self.papers[i] for i in self.indices[row] if i >= 0]
+
+    def __getitem__(self, row: int) -> Tuple[Paper, List[Paper]]:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("neighbour result row out of range")
+        return self.papers[self.query_indices[row]], self.neighbors(row)
+
+    def __iter__(self) -> Iterator[Tuple[Paper, List[Paper]]]:
+        return (self[row] for row in range(len(self)))
 
 
 def nearest_neighbors(
-    embeddings: np.ndarray, papers: Iterable[Paper], n_neighbors: int = 3
-) -> List[Tuple[Paper, List[Paper]]]:
-    """Return the closest neighbors for each paper."""
-
-    neighbor_model = NearestNeighbors(n_neighbors=n_neighbors + 1, metric="cosine")
-    neighbor_model.fit(embeddings)
-    indices = neighbor_model.kneighbors(return_distance=False)
-
-    paper_list = list(papers)
-    results: List[Tuple[Paper, List[Paper]]] = []
-    for idx, row in enumerate(indices):
-        neighbors = [paper_list[i] for i in row if i != idx][:n_neighbors]
-        results.append((paper_list[idx], neighbors))
-    return results
+    embeddings: np.ndarray,
+    papers: Iterable[Paper],
+    n_neighbors: int = 3,
+    *,
+    index: Optional[NeighborIndex] = None,
+    query_indices: Optional[Sequence[int]] = None,
+) -> NeighborResult:
+    """Return the closest neighbors for each paper.
+
+    ``query_indices`` restricts the queries to those corpus rows (all rows by
+    default); each is searched against the full corpus and never returned as
+    its own neighbour. ``index`` may be a prebuilt (e.g. approximate or loaded)
+    index over the same embeddings; otherwise an exact cosine index is built
+    for this call.
+    """
+
+    if index is None:
+        index = ExactIndex()
+        index.add(embeddings)
+    matrix = np.asarray(embeddings)
+    queries = np.arange(matrix.shape[0]) if query_indices is None else np.asarray(query_indices, dtype=np.int64)
+    distances, indices = index.search(matrix[queries], n_neighbors + 1)
+
+    # Move the query itself and padding to the back, keeping rank order otherwise.
+    valid = (indices != queries[:, None]) & (indices >= 0)
+    order = np.argsort(~valid, axis=1, kind="stable")[:, :n_neighbors]
+    keep = np.take_along_axis(valid, order, axis=1)
+    indices = np.where(keep, np.take_along_axis(indices, order, axis=1), -1)
+    distances = np.where(keep, np.take_along_axis(distances, order, axis=1), np.inf)
+
+    paper_list = papers if isinstance(papers, Sequence) else list(papers)
+    return NeighborResult(indices=indices, distances=distances, query_indices=queries, papers=paper_list)
@@ -7,10 +7,22 @@ from src.data.corpus_builder import (
     save_corpus_with_manifest,
     validate_manifest,
 )
+from src.data.harvest_state import (
+    HARVEST_STATE_SCHEMA_VERSION,
+    HarvestCursor,
+    harvest_state_path,
+    load_harvest_state,
+    persist_harvest_state,
+)
 
 __all__ = [
+    "HARVEST_STATE_SCHEMA_VERSION",
+    "HarvestCursor",
     "MANIFEST_SCHEMA_VERSION",
     "build_manifest",
+    "harvest_state_path",
+    "load_harvest_state",
+    "persist_harvest_state",
     "persist_manifest",
     "save_corpus_with_manifest",
     "validate_manifest",
@@ -0,0 +1,73 @@
+"""Resumable harvest cursors stored next to a corpus manifest.
+
+If ``corpus_path`` is ``assets/corpus.json`` the cursors live in
+``assets/corpus.harvest.json``, beside ``assets/corpus.manifest.json``. Each
+query has one cursor recording the date window being harvested, how many
+entries of that window were already consumed and when it last completed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+
+HARVEST_STATE_SCHEMA_VERSION = "1.0"
+
+
+@dataclass
+class HarvestCursor:
+    """Progress of one query through its current date window."""
+
+    query: str
+    endpoint: str
+    window_start: str
+    window_end: str
+    offset: int = 0
+    complete: bool = False
+    retrieved_at: Optional[str] = None
+
+    def to_source(self) -> Dict[str, Any]:
+        """Return the cursor as a manifest ``sources`` entry."""
+
+        return {
+            "endpoint": self.endpoint,
+            "query_terms": [self.query],
+            "date_window": {"start": self.window_start, "end": self.window_end},
+            "retrieved_at": self.retrieved_at or self.window_end,
+        }
+
+
+def harvest_state_path(corpus_path: str | Path) -> Path:
+    corpus = Path(corpus_path)
+    return corpus.with_name(f"{corpus.stem}.harvest.json")
+
+
+def load_harvest_state(corpus_path: str | Path) -> Dict[str, HarvestCursor]:
+    """Load the per-query cursors for a corpus; empty when none were saved."""
+
+    path = harvest_state_path(corpus_path)
+    if not path.exists():
+        return {}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("schema_version") != HARVEST_STATE_SCHEMA_VERSION:
+        raise ValueError(f"schema_version must be '{HARVEST_STATE_SCHEMA_VERSION}'.")
+    return {entry["query"]: HarvestCursor(**entry) for entry in payload["cursors"]}
+
+
+def persist_harvest_state(corpus_path: str | Path, cursors: Mapping[str, HarvestCursor]) -> Path:
+    """Atomically write the cursors next to the corpus file."""
+
+    path = harvest_state_path(corpus_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "schema_version": HARVEST_STATE_SCHEMA_VERSION,
+        "cursors": [asdict(cursors[query]) for query in sorted(cursors)],
+    }
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
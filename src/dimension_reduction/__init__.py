@@ -1,3 +1,15 @@
-from .basic import reduce_dimensions
+from typing import TYPE_CHECKING
 
-__all__ = ["reduce_dimensions"]
+from src._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "basic": ["reduce_dimensions"],
+        "reducer": ["FittedReducer", "LandmarkReducer", "LinearReducer", "fit_reducer"],
+    },
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .basic import reduce_dimensions
+    from .reducer import FittedReducer, LandmarkReducer, LinearReducer, fit_reducer
@@ -2,35 +2,69 @@
 
 from __future__ import annotations
 
-from typing import Literal
+from typing import Literal, Optional
 
 import numpy as np
-from sklearn.decomposition import PCA
-from sklearn.manifold import TSNE
 
-try:  # Optional; keeps dependencies light
-    import umap  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    umap = None
+from src.dimension_reduction.reducer import DEFAULT_CHUNK_SIZE, fit_reducer
+
+
+def _load_umap():
+    """Import umap-learn on first use; ``None`` when it is not installed."""
+
+    try:  # Optional; keeps dependencies light
+        import umap  # type: ignore
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return umap
 
 
 def reduce_dimensions(
     embeddings: np.ndarray,
-    method: Literal["pca", "tsne", "umap"] = "pca",
+    method: Literal["pca", "randomized_pca", "incremental_pca", "tsne", "umap"] = "pca",
     n_components: int = 2,
     random_state: int = 0,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    n_landmarks: Optional[int] = None,
 ) -> np.ndarray:
-    """Project embeddings into a lower-dimensional space."""
+    """Project embeddings into a lower-dimensional space.
+
+    ``"randomized_pca"`` and ``"incremental_pca"`` stream over ``chunk_size``
+    rows at a time, so ``embeddings`` may be a large ``np.memmap``. With
+    ``n_landmarks`` smaller than the corpus, t-SNE is fitted on that many
+    sampled papers and the rest are placed from their nearest landmarks. Use
+    :func:`~src.dimension_reduction.reducer.fit_reducer` to keep the fitted
+    projection for new papers.
+    """
 
     if method == "pca":
+        from sklearn.decomposition import PCA
+
         reducer = PCA(n_components=n_components, random_state=random_state)
         return reducer.fit_transform(embeddings)
 
+    if method in ("randomized_pca", "incremental_pca") or (
+        method == "tsne" and n_landmarks is not None and n_landmarks < len(embeddings)
+    ):
+        fitted = fit_reducer(
+            embeddings,
+            method,
+            n_components,
+            random_state,
+            chunk_size=chunk_size,
+            n_landmarks=n_landmarks or 1,
+        )
+        return fitted.transform(embeddings, chunk_size=chunk_size)
+
     if method == "tsne":
+        from sklearn.manifold import TSNE
+
         reducer = TSNE(n_components=n_components, random_state=random_state, init="random")
         return reducer.fit_transform(embeddings)
 
     if method == "umap":
+        umap = _load_umap()
         if umap is None:
             raise ImportError("umap-learn is not installed")
         reducer = umap.UMAP(n_components=n_components, random_state=random_state)
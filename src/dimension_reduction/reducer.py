@@ -0,0 +1,284 @@
+"""Fitted, persistable reducers for corpora that do not fit in memory.
+
+:func:`fit_reducer` learns a projection once and returns a
+:class:`FittedReducer` whose :meth:`~FittedReducer.transform` places new
+papers without refitting. Linear reducers (exact, streamed randomized and
+incremental PCA) read the embeddings in row chunks, so a ``np.memmap`` is
+never loaded whole. t-SNE is fitted on a random landmark sample and every
+other point is placed at the distance-weighted mean of its nearest landmarks'
+map coordinates. Reducers are saved to ``.npz`` archives like the neighbour
+indexes in :mod:`src.analysis.neighbor_index`.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, Literal, Type, Union
+
+import numpy as np
+
+
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_LANDMARKS = 10_000
+DEFAULT_TRANSFORM_MEMORY = 128 * 2**20
+ReducerMethod = Literal["pca", "randomized_pca", "incremental_pca", "tsne"]
+
+
+def _chunks(embeddings: np.ndarray, chunk_size: int) -> Iterator[np.ndarray]:
+    for start in range(0, embeddings.shape[0], chunk_size):
+        yield np.asarray(embeddings[start : start + chunk_size], dtype=np.float64)
+
+
+class FittedReducer(ABC):
+    """Base class for reducers that can project unseen embeddings."""
+
+    kind = "base"
+
+    @property
+    @abstractmethod
+    def n_components(self) -> int:
+        """Number of output dimensions."""
+
+    def transform(self, embeddings: np.ndarray, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+        """Project ``(n, d)`` embeddings to ``(n, n_components)``, one chunk of rows at a time."""
+
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        reduced = np.empty((embeddings.shape[0], self.n_components))
+        for start, chunk in zip(range(0, embeddings.shape[0], chunk_size), _chunks(embeddings, chunk_size)):
+            reduced[start : start + chunk_size] = self._transform_chunk(chunk)
+        return reduced
+
+    @abstractmethod
+    def _transform_chunk(self, chunk: np.ndarray) -> np.ndarray:
+        """Project one in-memory chunk of rows."""
+
+    @abstractmethod
+    def _state(self) -> Dict[str, Any]:
+        """Arrays that :meth:`load` passes back to the constructor."""
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the fitted reducer to a ``.npz`` archive."""
+
+        np.savez(path, kind=np.array(self.kind), **self._state())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "FittedReducer":
+        """Load a reducer written by :meth:`save`."""
+
+        with np.load(path, allow_pickle=False) as archive:
+            state = {name: archive[name] for name in archive.files}
+        reducer_cls = _REDUCER_TYPES.get(str(state.pop("kind")))
+        if reducer_cls is None:
+            raise ValueError("Unknown reducer kind in archive")
+        return reducer_cls(**state)
+
+
+class LinearReducer(FittedReducer):
+    """Centre and project onto fixed principal axes."""
+
+    kind = "linear"
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.components = np.asarray(components, dtype=np.float64)
+
+    @property
+    def n_components(self) -> int:
+        return self.components.shape[0]
+
+    def _transform_chunk(self, chunk: np.ndarray) -> np.ndarray:
+        return (chunk - self.mean) @ self.components.T
+
+    def _state(self) -> Dict[str, Any]:
+        return {"mean": self.mean, "components": self.components}
+
+
+class LandmarkReducer(FittedReducer):
+    """Place points at the inverse-distance-weighted mean of their nearest landmarks.
+
+    Distances are computed for as many rows at a time as fit in
+    ``memory_budget`` bytes (a float64 distance and an int64 selection index
+    per landmark per row), so transforms against large landmark sets stay
+    bounded whatever ``chunk_size`` is.
+    """
+
+    kind = "landmark"
+
+    def __init__(
+        self,
+        landmarks: np.ndarray,
+        coordinates: np.ndarray,
+        n_neighbors: Union[int, np.ndarray] = 10,
+        *,
+        memory_budget: int = DEFAULT_TRANSFORM_MEMORY,
+    ):
+        if memory_budget <= 0:
+            raise ValueError("memory_budget must be a positive integer")
+        self.landmarks = np.asarray(landmarks, dtype=np.float64)
+        self.coordinates = np.asarray(coordinates, dtype=np.float64)
+        self.n_neighbors = int(n_neighbors)
+        self.memory_budget = memory_budget
+        self._squared_norms = np.einsum("ij,ij->i", self.landmarks, self.landmarks)
+
+    @property
+    def n_components(self) -> int:
+        return self.coordinates.shape[1]
+
+    def _transform_chunk(self, chunk: np.ndarray) -> np.ndarray:
+        rows = max(1, self.memory_budget // (16 * self.landmarks.shape[0]))
+        placed = np.empty((chunk.shape[0], self.n_components))
+        for start in range(0, chunk.shape[0], rows):
+            placed[start : start + rows] = self._place(chunk[start : start + rows])
+        return placed
+
+    def _place(self, block: np.ndarray) -> np.ndarray:
+        k = min(self.n_neighbors, self.landmarks.shape[0])
+        squared = block @ self.landmarks.T
+        squared *= -2.0
+        squared += self._squared_norms
+        squared += np.einsum("ij,ij->i", block, block)[:, None]
+        nearest = np.argpartition(squared, k - 1, axis=1)[:, :k].copy()
+        nearest_squared = np.maximum(np.take_along_axis(squared, nearest, axis=1), 0.0)
+        del squared
+        # Points that coincide with a landmark (up to rounding) take its coordinates.
+        exact = nearest_squared <= 1e-10 * (1.0 + self._squared_norms[nearest])
+        weights = exact.astype(np.float64)
+        inexact = ~exact.any(axis=1)
+        weights[inexact] = 1.0 / np.sqrt(nearest_squared[inexact])
+        weights /= weights.sum(axis=1, keepdims=True)
+        return np.einsum("ij,ijk->ik", weights, self.coordinates[nearest])
+
+    def _state(self) -> Dict[str, Any]:
+        return {
+            "landmarks": self.landmarks,
+            "coordinates": self.coordinates,
+            "n_neighbors": np.array(self.n_neighbors),
+        }
+
+
+_REDUCER_TYPES: Dict[str, Type[FittedReducer]] = {
+    LinearReducer.kind: LinearReducer,
+    LandmarkReducer.kind: LandmarkReducer,
+}
+
+
+def _streamed_mean(embeddings: np.ndarray, chunk_size: int) -> np.ndarray:
+    total = np.zeros(embeddings.shape[1])
+    for chunk in _chunks(embeddings, chunk_size):
+        total += chunk.sum(axis=0)
+    return total / embeddings.shape[0]
+
+
+def _randomized_pca(
+    embeddings: np.ndarray,
+    n_components: int,
+    rng: np.random.Generator,
+    chunk_size: int,
+    oversamples: int = 10,
+    power_iterations: int = 4,
+) -> LinearReducer:
+    """Halko-style randomized SVD of the centred matrix, streaming over row chunks.
+
+    Only the ``(n, n_components + oversamples)`` sketch and ``d``-sized
+    accumulators are held in memory.
+    """
+
+    n, d = embeddings.shape
+    width = min(n_components + oversamples, n, d)
+    mean = _streamed_mean(embeddings, chunk_size)
+
+    def left(basis: np.ndarray) -> np.ndarray:  # (X - mean) @ basis
+        return np.vstack([(chunk - mean) @ basis for chunk in _chunks(embeddings, chunk_size)])
+
+    def right(sketch: np.ndarray) -> np.ndarray:  # (X - mean).T @ sketch
+        total = np.zeros((d, sketch.shape[1]))
+        for start, chunk in zip(range(0, n, chunk_size), _chunks(embeddings, chunk_size)):
+            total += (chunk - mean).T @ sketch[start : start + chunk_size]
+        return total
+
+    sketch = left(rng.standard_normal((d, width)))
+    for _ in range(power_iterations):
+        sketch, _ = np.linalg.qr(sketch)
+        basis, _ = np.linalg.qr(right(sketch))
+        sketch = left(basis)
+    sketch, _ = np.linalg.qr(sketch)
+    _, _, vt = np.linalg.svd(right(sketch).T, full_matrices=False)
+    components = vt[:n_components]
+    # Deterministic signs: largest-magnitude loading of each axis is positive.
+    signs = np.sign(components[np.arange(components.shape[0]), np.argmax(np.abs(components), axis=1)])
+    return LinearReducer(mean, components * signs[:, None])
+
+
+def _incremental_pca(embeddings: np.ndarray, n_components: int, chunk_size: int) -> LinearReducer:
+    from sklearn.decomposition import IncrementalPCA
+
+    model = IncrementalPCA(n_components=n_components)
+    n = embeddings.shape[0]
+    step = max(chunk_size, n_components)
+    for start in range(0, n, step):
+        stop = start + step
+        if n - stop < n_components:  # fold a too-short tail into this batch
+            stop = n
+        model.partial_fit(np.asarray(embeddings[start:stop], dtype=np.float64))
+        if stop == n:
+            break
+    return LinearReducer(model.mean_, model.components_)
+
+
+def _landmark_tsne(
+    embeddings: np.ndarray,
+    n_components: int,
+    rng: np.random.Generator,
+    random_state: int,
+    n_landmarks: int,
+    n_neighbors: int,
+) -> LandmarkReducer:
+    n = embeddings.shape[0]
+    sample = np.sort(rng.choice(n, size=n_landmarks, replace=False)) if n > n_landmarks else np.arange(n)
+    landmarks = np.asarray(embeddings[sample], dtype=np.float64)
+    from sklearn.manifold import TSNE
+
+    perplexity = min(30.0, max(1.0, (landmarks.shape[0] - 1) / 3.0))
+    tsne = TSNE(n_components=n_components, random_state=random_state, init="random", perplexity=perplexity)
+    return LandmarkReducer(landmarks, tsne.fit_transform(landmarks), n_neighbors)
+
+
+def fit_reducer(
+    embeddings: np.ndarray,
+    method: ReducerMethod = "pca",
+    n_components: int = 2,
+    random_state: int = 0,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    n_landmarks: int = DEFAULT_LANDMARKS,
+    n_neighbors: int = 10,
+) -> FittedReducer:
+    """Fit a reusable projection of ``embeddings`` (an array or ``np.memmap``).
+
+    * ``"pca"`` – exact PCA (loads the matrix).
+    * ``"randomized_pca"`` – randomized SVD streamed over ``chunk_size`` rows.
+    * ``"incremental_pca"`` – scikit-learn ``IncrementalPCA`` fed chunk by chunk.
+    * ``"tsne"`` – t-SNE on ``n_landmarks`` sampled rows; other points are
+      placed from their ``n_neighbors`` nearest landmarks.
+    """
+
+    if chunk_size <= 0 or n_landmarks <= 0 or n_neighbors <= 0:
+        raise ValueError("chunk_size, n_landmarks and n_neighbors must be positive integers")
+    rng = np.random.default_rng(random_state)
+
+    if method == "pca":
+        from sklearn.decomposition import PCA
+
+        model = PCA(n_components=n_components, random_state=random_state)
+        model.fit(np.asarray(embeddings))
+        return LinearReducer(model.mean_, model.components_)
+    if method == "randomized_pca":
+        return _randomized_pca(embeddings, n_components, rng, chunk_size)
+    if method == "incremental_pca":
+        return _incremental_pca(embeddings, n_components, chunk_size)
+    if method == "tsne":
+        return _landmark_tsne(embeddings, n_components, rng, random_state, n_landmarks, n_neighbors)
+
+    raise ValueError(f"Unknown reduction method: {method}")
@@ -1,3 +1,23 @@
-from .basic import embed_papers
+from typing import TYPE_CHECKING
 
-__all__ = ["embed_papers"]
+from src._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "basic": ["embed_papers"],
+        "cache": ["EmbeddingCache"],
+        "cpu": ["CPUInferenceProfile", "DriftReport", "measure_profile_drift"],
+        "pipeline": ["embed_stream"],
+        "service": ["EmbeddingClient", "EmbeddingService", "ServiceStats", "run_load_test"],
+        "sharded": ["embed_papers_sharded"],
+    },
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .basic import embed_papers
+    from .cache import EmbeddingCache
+    from .cpu import CPUInferenceProfile, DriftReport, measure_profile_drift
+    from .pipeline import embed_stream
+    from .service import EmbeddingClient, EmbeddingService, ServiceStats, run_load_test
+    from .sharded import embed_papers_sharded
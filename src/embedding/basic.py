@@ -2,16 +2,24 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 import numpy as np
-import torch
-from transformers import AutoModel, AutoTokenizer
 
+from src.embedding.cache import EmbeddingCache, embedding_cache_key
+from src.embedding.cpu import CPUInferenceProfile
 from src.models import Paper
 
+if TYPE_CHECKING:  # pragma: no cover - torch/transformers load on first use
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    from src.embedding.service import EmbeddingClient
+
 
 DEFAULT_MODEL_NAME = "allenai/scibert_scivocab_uncased"
+DEFAULT_BATCH_SIZE = 32
+LENGTH_CHUNK_SIZE = 1_024
 _CACHED_TOKENIZER: Optional[AutoTokenizer] = None
 _CACHED_MODEL: Optional[AutoModel] = None
 
@@ -21,6 +29,8 @@ def _get_sci_bert(model_name: str = DEFAULT_MODEL_NAME) -> Tuple[AutoTokenizer,
 
     global _CACHED_TOKENIZER, _CACHED_MODEL
     if _CACHED_TOKENIZER is None or _CACHED_MODEL is None:
+        from transformers import AutoModel, AutoTokenizer
+
         _CACHED_TOKENIZER = AutoTokenizer.from_pretrained(model_name)
         _CACHED_MODEL = AutoModel.from_pretrained(model_name)
         _CACHED_MODEL.eval()
@@ -33,34 +43,168 @@ def _mean_pool(hidden_states: torch.Tensor, attention_mask: torch.Tensor) -> tor
     return masked_states.sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
 
 
+def _paper_text(paper: Paper) -> str:
+    return f"{paper.title}\n{paper.abstract}".strip()
+
+
+def _token_lengths(tokenizer: AutoTokenizer, texts: Sequence[str], max_length: int) -> np.ndarray:
+    """Return the truncated token count of each text without padding.
+
+    Texts are tokenized ``LENGTH_CHUNK_SIZE`` at a time and only the counts are
+    kept, so this pass needs memory for one chunk of token ids, not the corpus.
+    """
+
+    lengths = np.empty(len(texts), dtype=np.int64)
+    for start in range(0, len(texts), LENGTH_CHUNK_SIZE):
+        chunk = list(texts[start : start + LENGTH_CHUNK_SIZE])
+        encoded = tokenizer(chunk, padding=False, truncation=True, max_length=max_length)
+        lengths[start : start + len(chunk)] = [len(ids) for ids in encoded["input_ids"]]
+    return lengths
+
+
+def _length_sorted_batches(lengths: np.ndarray, batch_size: int) -> Iterator[np.ndarray]:
+    """Yield index batches of similar token length so each pads only to its own max."""
+
+    order = np.argsort(lengths, kind="stable")
+    for start in range(0, order.size, batch_size):
+        yield order[start : start + batch_size]
+
+
+def _tokenize_batch(tokenizer: AutoTokenizer, texts: List[str], max_length: int) -> Mapping[str, torch.Tensor]:
+    return tokenizer(
+        texts,
+        padding=True,
+        truncation=True,
+        max_length=max_length,
+        return_tensors="pt",
+    )
+
+
+def _forward_batch(model: AutoModel, encoded: Mapping[str, torch.Tensor]) -> np.ndarray:
+    import torch
+
+    with torch.no_grad():
+        outputs = model(**encoded)
+    return _mean_pool(outputs.last_hidden_state, encoded["attention_mask"]).cpu().numpy()
+
+
+def _embed_batch(
+    tokenizer: AutoTokenizer, model: AutoModel, texts: List[str], max_length: int
+) -> np.ndarray:
+    return _forward_batch(model, _tokenize_batch(tokenizer, texts, max_length))
+
+
+def _embed_texts(
+    tokenizer: AutoTokenizer,
+    model: AutoModel,
+    texts: Sequence[str],
+    max_length: int,
+    batch_size: int,
+) -> Optional[np.ndarray]:
+    """Run the batched engine over ``texts``; ``None`` when there is nothing to embed."""
+
+    embeddings: Optional[np.ndarray] = None
+    if not texts:
+        return embeddings
+    lengths = _token_lengths(tokenizer, texts, max_length)
+    for batch in _length_sorted_batches(lengths, batch_size):
+        vectors = _embed_batch(tokenizer, model, [texts[i] for i in batch], max_length)
+        if embeddings is None:
+            embeddings = np.empty((len(texts), vectors.shape[1]), dtype=vectors.dtype)
+        embeddings[batch] = vectors
+    return embeddings
+
+
+def _embed_with_cache(
+    embed: Callable[[List[str]], Optional[np.ndarray]],
+    texts: List[str],
+    max_length: int,
+    cache: EmbeddingCache,
+    model_name: str,
+) -> Optional[np.ndarray]:
+    if not texts:
+        return None
+    keys = [embedding_cache_key(text, model_name, max_length) for text in texts]
+    cached, hits = cache.lookup(keys)
+    misses = np.flatnonzero(~hits)
+
+    fresh = embed([texts[i] for i in misses])
+    if fresh is not None:
+        cache.put([keys[i] for i in misses], fresh)
+
+    dim = cached.shape[1] if fresh is None else fresh.shape[1]
+    embeddings = np.empty((len(texts), dim), dtype=np.float32)
+    if cached.size:
+        embeddings[hits] = cached
+    if fresh is not None:
+        embeddings[misses] = fresh
+    return embeddings
+
+
 def embed_papers(
     papers: Iterable[Paper],
     *,
     tokenizer: Optional[AutoTokenizer] = None,
     model: Optional[AutoModel] = None,
     max_length: int = 512,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    cache: Optional[EmbeddingCache] = None,
+    profile: Optional[CPUInferenceProfile] = None,
+    client: Optional[EmbeddingClient] = None,
 ) -> Tuple[np.ndarray, str]:
     """Embed papers with SciBERT.
 
     The tokenizer and model can be supplied (useful for lightweight testing);
     otherwise the default SciBERT weights are fetched and cached.
+
+    Papers are embedded in mini-batches of ``batch_size``. Texts are bucketed by
+    token length so each batch is padded only to its own longest member, and
+    rows are written back in input order.
+
+    When ``cache`` is given, only papers whose text, model name and
+    ``max_length`` are not already cached are run through the model.
+
+    ``profile`` opts into the CPU inference profile (int8 linear layers,
+    ``torch.inference_mode``, pinned thread counts); quantised vectors are
+    cached separately from fp32 ones.
+
+    ``client`` sends the texts to a running
+    :class:`~src.embedding.service.EmbeddingService` instead of loading a
+    model in this process; it cannot be combined with ``tokenizer``/``model``
+    or ``profile``.
     """
 
     if (tokenizer is None) != (model is None):
         raise ValueError("`tokenizer` and `model` must be provided together or omitted together.")
-
-    if tokenizer is None:
-        tokenizer, model = _get_sci_bert()
-    texts = [f"{paper.title}\n{paper.abstract}".strip() for paper in papers]
-    encoded = tokenizer(
-        texts,
-        padding=True,
-        truncation=True,
-        max_length=max_length,
-        return_tensors="pt",
-    )
-
-    with torch.no_grad():
-        outputs = model(**encoded)
-    embeddings = _mean_pool(outputs.last_hidden_state, encoded["attention_mask"])
-    return embeddings.cpu().numpy(), getattr(model.config, "name_or_path", DEFAULT_MODEL_NAME)
+    if batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer")
+    if client is not None and (model is not None or profile is not None):
+        raise ValueError("`client` cannot be combined with a local model or profile.")
+
+    if client is not None:
+        model_name, hidden_size, cache_name = client.model_name, client.hidden_size, client.cache_name
+
+        def embed(batch: List[str]) -> Optional[np.ndarray]:
+            return client.embed(batch, max_length=max_length) if batch else None
+
+    else:
+        if tokenizer is None:
+            tokenizer, model = _get_sci_bert()
+        model_name = getattr(model.config, "name_or_path", DEFAULT_MODEL_NAME)
+        hidden_size = getattr(model.config, "hidden_size", 0)
+        cache_name = model_name
+        if profile is not None:
+            model = profile.prepare(model)
+            cache_name = profile.cache_name(model_name)
+
+        def embed(batch: List[str]) -> Optional[np.ndarray]:
+            return _embed_texts(tokenizer, model, batch, max_length, batch_size)
+
+    texts = [_paper_text(paper) for paper in papers]
+    if cache is None:
+        embeddings = embed(texts)
+    else:
+        embeddings = _embed_with_cache(embed, texts, max_length, cache, cache_name)
+    if embeddings is None:
+        embeddings = np.zeros((0, hidden_size), dtype=np.float32)
+    return embeddings, model_name
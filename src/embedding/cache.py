@@ -0,0 +1,123 @@
+"""Content-addressed on-disk cache for paper embeddings.
+
+Vectors live in a flat float32 file that is opened as a memory map, and a small
+JSON index maps each content key to its row. Keys hash the embedded text
+together with the model name and ``max_length`` so a change to either never
+returns stale vectors.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+CACHE_SCHEMA_VERSION = "1.0"
+_VECTORS_FILE = "vectors.f32"
+_INDEX_FILE = "index.json"
+
+
+def embedding_cache_key(text: str, model_name: str, max_length: int) -> str:
+    """Return the content key for ``text`` embedded by ``model_name``."""
+
+    digest = hashlib.sha256()
+    digest.update(f"{model_name}\0{max_length}\0".encode("utf-8"))
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """Append-only embedding store backed by a memory-mapped float32 array."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / _VECTORS_FILE
+        self._index_path = self.directory / _INDEX_FILE
+        self._dim: Optional[int] = None
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._load_index()
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._dim
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    def _load_index(self) -> None:
+        if not self._index_path.exists():
+            return
+        index = json.loads(self._index_path.read_text(encoding="utf-8"))
+        if index.get("schema_version") != CACHE_SCHEMA_VERSION:
+            raise ValueError(f"Embedding cache schema_version must be '{CACHE_SCHEMA_VERSION}'.")
+        self._dim = index["dim"]
+        self._keys = list(index["keys"])
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+
+        expected = len(self._keys) * (self._dim or 0) * np.dtype(np.float32).itemsize
+        actual = self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+        if actual < expected:
+            raise ValueError("Embedding cache vectors file is shorter than its index.")
+
+    def _write_index(self) -> None:
+        payload = {"schema_version": CACHE_SCHEMA_VERSION, "dim": self._dim, "keys": self._keys}
+        tmp_path = self._index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, self._index_path)
+
+    def _matrix(self) -> np.ndarray:
+        if not self._keys:
+            return np.zeros((0, self._dim or 0), dtype=np.float32)
+        if self._vectors is None:
+            self._vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(len(self._keys), self._dim)
+            )
+        return self._vectors
+
+    def lookup(self, keys: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(vectors, hit_mask)``; ``vectors`` holds only the hits, in key order."""
+
+        rows = np.array([self._rows.get(key, -1) for key in keys], dtype=np.int64)
+        hits = rows >= 0
+        return np.asarray(self._matrix()[rows[hits]]), hits
+
+    def put(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Append vectors for keys that are not cached yet and persist the index."""
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != len(keys):
+            raise ValueError("vectors must be a 2D array with one row per key")
+        if self._dim is None:
+            self._dim = int(vectors.shape[1])
+        elif vectors.shape[1] != self._dim:
+            raise ValueError(f"Embedding cache stores {self._dim}-d vectors, got {vectors.shape[1]}-d")
+
+        offset = len(self._keys) * self._dim * np.dtype(np.float32).itemsize
+        fresh = []
+        for row, key in enumerate(keys):
+            if key not in self._rows:
+                self._rows[key] = len(self._keys)
+                self._keys.append(key)
+                fresh.append(row)
+        if not fresh:
+            return
+
+        # Drop any bytes left behind by an interrupted write before appending.
+        mode = "r+b" if self._vectors_path.exists() else "wb"
+        with self._vectors_path.open(mode) as handle:
+            handle.truncate(offset)
+            handle.seek(offset)
+            handle.write(np.ascontiguousarray(vectors[fresh]).tobytes())
+        self._vectors = None
+        self._write_index()
@@ -0,0 +1,165 @@
+"""Opt-in CPU inference profile for embedding on machines without a GPU.
+
+A :class:`CPUInferenceProfile` pins PyTorch's intra-op and inter-op thread
+pools, swaps every ``nn.Linear`` for a dynamically quantised int8 version and
+runs the forward pass under ``torch.inference_mode``. Quantisation changes the
+vectors slightly, so :func:`measure_profile_drift` embeds a reference set with
+and without the profile and reports the cosine similarity between the two
+alongside the speed-up.
+"""
+
+from __future__ import annotations
+
+import time
+import warnings
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+import numpy as np
+
+from src.models import Paper
+
+if TYPE_CHECKING:  # pragma: no cover
+    from transformers import AutoModel, AutoTokenizer
+
+
+_QUANTIZED_MODELS: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class CPUInferenceProfile:
+    """Settings applied by ``embed_papers(..., profile=...)``.
+
+    ``intra_op_threads``/``inter_op_threads`` of ``None`` leave PyTorch's
+    defaults alone. Thread counts are process-wide; PyTorch only accepts an
+    inter-op count before its first parallel operation, so a late request is
+    skipped with a warning.
+    """
+
+    quantize: bool = True
+    intra_op_threads: Optional[int] = None
+    inter_op_threads: Optional[int] = None
+
+    def configure_threads(self) -> None:
+        import torch
+
+        if self.intra_op_threads is not None:
+            torch.set_num_threads(self.intra_op_threads)
+        if self.inter_op_threads is not None and torch.get_num_interop_threads() != self.inter_op_threads:
+            try:
+                torch.set_num_interop_threads(self.inter_op_threads)
+            except RuntimeError:
+                warnings.warn("inter-op thread count can only be set before PyTorch starts parallel work")
+
+    def cache_name(self, model_name: str) -> str:
+        """Name under which vectors from this profile are cached; int8 vectors never share fp32 keys."""
+
+        return f"{model_name}+int8" if self.quantize else model_name
+
+    def prepare(self, model: "AutoModel") -> "_InferenceModel":
+        """Apply the profile and return a callable stand-in for ``model``."""
+
+        self.configure_threads()
+        return _InferenceModel(quantize_linear_layers(model) if self.quantize else model)
+
+
+class _InferenceModel:
+    """Runs the wrapped model under ``torch.inference_mode`` and exposes its config."""
+
+    def __init__(self, model: Any):
+        self.model = model
+        self.config = model.config
+
+    def __call__(self, **inputs: Any) -> Any:
+        import torch
+
+        with torch.inference_mode():
+            return self.model(**inputs)
+
+
+def quantize_linear_layers(model: "AutoModel") -> Any:
+    """Dynamically quantised (int8 weights) copy of ``model``, cached per model object."""
+
+    quantized = _QUANTIZED_MODELS.get(model)
+    if quantized is None:
+        import torch
+
+        if torch.backends.quantized.engine == "none":
+            raise RuntimeError("this PyTorch build has no quantized CPU engine")
+        with warnings.catch_warnings():
+            # torch.ao.quantization is deprecated in favour of torchao but still ships.
+            warnings.simplefilter("ignore", DeprecationWarning)
+            warnings.simplefilter("ignore", UserWarning)
+            quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        quantized.eval()
+        _QUANTIZED_MODELS[model] = quantized
+    return quantized
+
+
+@dataclass(frozen=True)
+class DriftReport:
+    """Per-paper cosine similarity between fp32 and profiled embeddings."""
+
+    mean_cosine: float
+    min_cosine: float
+    percentile_1_cosine: float
+    fp32_seconds: float
+    profiled_seconds: float
+    num_papers: int
+
+    @property
+    def speedup(self) -> float:
+        return self.fp32_seconds / self.profiled_seconds if self.profiled_seconds > 0 else float("inf")
+
+
+def _row_cosines(reference: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    dots = np.einsum("ij,ij->i", reference, candidate)
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    return dots / np.maximum(norms, np.finfo(np.float64).tiny)
+
+
+def measure_profile_drift(
+    papers: Iterable[Paper],
+    profile: CPUInferenceProfile = CPUInferenceProfile(),
+    *,
+    tokenizer: Optional["AutoTokenizer"] = None,
+    model: Optional["AutoModel"] = None,
+    **embed_options: Any,
+) -> DriftReport:
+    """Embed ``papers`` in fp32 and with ``profile`` and compare the results.
+
+    ``embed_options`` go to both :func:`~src.embedding.basic.embed_papers`
+    calls. The profiled run is timed after the quantised model is built, so
+    the speed-up reflects steady-state throughput.
+    """
+
+    from src.embedding.basic import _get_sci_bert, embed_papers
+
+    if (tokenizer is None) != (model is None):
+        raise ValueError("`tokenizer` and `model` must be provided together or omitted together.")
+    if tokenizer is None:
+        tokenizer, model = _get_sci_bert()
+    reference_papers = list(papers)
+    if not reference_papers:
+        raise ValueError("papers must not be empty")
+
+    started = time.perf_counter()
+    fp32, _ = embed_papers(reference_papers, tokenizer=tokenizer, model=model, **embed_options)
+    fp32_seconds = time.perf_counter() - started
+
+    if profile.quantize:
+        quantize_linear_layers(model)
+    started = time.perf_counter()
+    profiled, _ = embed_papers(reference_papers, tokenizer=tokenizer, model=model, profile=profile, **embed_options)
+    profiled_seconds = time.perf_counter() - started
+
+    cosines = _row_cosines(fp32.astype(np.float64), profiled.astype(np.float64))
+    return DriftReport(
+        mean_cosine=float(cosines.mean()),
+        min_cosine=float(cosines.min()),
+        percentile_1_cosine=float(np.percentile(cosines, 1)),
+        fp32_seconds=fp32_seconds,
+        profiled_seconds=profiled_seconds,
+        num_papers=len(reference_papers),
+    )
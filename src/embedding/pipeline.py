@@ -0,0 +1,202 @@
+"""Streaming embedding with tokenisation overlapped with inference.
+
+:func:`embed_stream` consumes any iterable of papers — a list, a JSON Lines
+reader, the scraper — on a background thread that groups papers into windows
+of ``window_batches * batch_size``, length-buckets each window and tokenises
+the batches into a bounded queue. The calling thread runs the model on one
+batch while the next ones are tokenised, and writes each batch's vectors
+straight into their rows of a preallocated (optionally memory-mapped) output.
+
+Bucketing only within a window keeps memory bounded for endless streams; the
+batches therefore differ from :func:`~src.embedding.basic.embed_papers`, which
+sorts the whole corpus, and padding can change the last bits of a vector.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional, Sized, Tuple, Union
+
+import numpy as np
+
+from src.embedding.basic import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MODEL_NAME,
+    _forward_batch,
+    _get_sci_bert,
+    _length_sorted_batches,
+    _paper_text,
+    _token_lengths,
+    _tokenize_batch,
+)
+from src.embedding.cpu import CPUInferenceProfile
+from src.models import Paper
+
+if TYPE_CHECKING:  # pragma: no cover
+    from transformers import AutoModel, AutoTokenizer
+
+
+DEFAULT_WINDOW_BATCHES = 8
+DEFAULT_QUEUE_SIZE = 4
+_DONE = object()
+
+
+def _windows(papers: Iterable[Paper], size: int) -> Iterator[Tuple[int, List[str]]]:
+    """Yield ``(first_row, texts)`` for consecutive windows of ``size`` papers."""
+
+    start, texts = 0, []
+    for paper in papers:
+        texts.append(_paper_text(paper))
+        if len(texts) == size:
+            yield start, texts
+            start, texts = start + size, []
+    if texts:
+        yield start, texts
+
+
+def _put(batches: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _tokenize_stream(
+    tokenizer: AutoTokenizer,
+    papers: Iterable[Paper],
+    max_length: int,
+    batch_size: int,
+    window_batches: int,
+    batches: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    """Producer: push ``(rows, encoded)`` batches, then ``_DONE`` or the raised error."""
+
+    try:
+        for start, texts in _windows(papers, batch_size * window_batches):
+            lengths = _token_lengths(tokenizer, texts, max_length)
+            for batch in _length_sorted_batches(lengths, batch_size):
+                encoded = _tokenize_batch(tokenizer, [texts[i] for i in batch], max_length)
+                if not _put(batches, (start + batch, encoded), stop):
+                    return
+        _put(batches, _DONE, stop)
+    except BaseException as error:  # re-raised on the consuming thread
+        _put(batches, error, stop)
+
+
+class _OutputRows:
+    """Rows written so far into a caller-supplied, preallocated or growing array."""
+
+    def __init__(
+        self,
+        output: Optional[np.ndarray],
+        output_path: Optional[Path],
+        num_papers: Optional[int],
+        initial_rows: int,
+    ):
+        self.array = output
+        self.fixed = output is not None or num_papers is not None
+        self.output_path = output_path
+        self.num_papers = num_papers
+        self.initial_rows = initial_rows
+        self.count = 0
+
+    def _allocate(self, rows: int, dim: int, dtype: np.dtype) -> np.ndarray:
+        if self.output_path is not None:
+            return np.lib.format.open_memmap(self.output_path, mode="w+", dtype=np.float32, shape=(rows, dim))
+        return np.empty((rows, dim), dtype=dtype)
+
+    def write(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        needed = int(rows.max()) + 1
+        if self.array is None:
+            capacity = self.num_papers if self.num_papers is not None else max(needed, self.initial_rows)
+            self.array = self._allocate(capacity, vectors.shape[1], vectors.dtype)
+        if needed > self.array.shape[0]:
+            if self.fixed:
+                raise ValueError("more papers than output rows")
+            grown = np.empty((max(needed, 2 * self.array.shape[0]), self.array.shape[1]), dtype=self.array.dtype)
+            grown[: self.count] = self.array[: self.count]
+            self.array = grown
+        self.array[rows] = vectors
+        self.count = max(self.count, needed)
+
+    def result(self, hidden_size: int) -> np.ndarray:
+        if self.array is None:
+            return np.zeros((0, hidden_size), dtype=np.float32)
+        if isinstance(self.array, np.memmap):
+            self.array.flush()
+        return self.array[: self.count]
+
+
+def embed_stream(
+    papers: Iterable[Paper],
+    *,
+    tokenizer: Optional[AutoTokenizer] = None,
+    model: Optional[AutoModel] = None,
+    max_length: int = 512,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    window_batches: int = DEFAULT_WINDOW_BATCHES,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    output: Optional[np.ndarray] = None,
+    output_path: Optional[Union[str, Path]] = None,
+    num_papers: Optional[int] = None,
+    profile: Optional[CPUInferenceProfile] = None,
+) -> Tuple[np.ndarray, str]:
+    """Embed a stream of papers, tokenising ahead of the model on a background thread.
+
+    Row ``i`` of the result is the embedding of the ``i``-th paper. Vectors go
+    into ``output`` when given (any ``(n, d)`` array or ``np.memmap``), else
+    into a new ``.npy`` memory map at ``output_path`` (which needs the paper
+    count), else into an in-memory array sized from ``num_papers`` or
+    ``len(papers)``, growing geometrically when the count is unknown. At most
+    ``queue_size`` tokenised batches wait ahead of the model.
+    """
+
+    if (tokenizer is None) != (model is None):
+        raise ValueError("`tokenizer` and `model` must be provided together or omitted together.")
+    if batch_size <= 0 or window_batches <= 0 or queue_size <= 0:
+        raise ValueError("batch_size, window_batches and queue_size must be positive integers")
+    if output is not None and output_path is not None:
+        raise ValueError("pass either `output` or `output_path`, not both")
+    if num_papers is None and output is None and isinstance(papers, Sized):
+        num_papers = len(papers)
+    if output_path is not None and num_papers is None:
+        raise ValueError("output_path needs `num_papers` when papers has no length")
+
+    if tokenizer is None:
+        tokenizer, model = _get_sci_bert()
+    model_name = getattr(model.config, "name_or_path", DEFAULT_MODEL_NAME)
+    hidden_size = getattr(model.config, "hidden_size", 0)
+    if profile is not None:
+        model = profile.prepare(model)
+
+    rows = _OutputRows(
+        output, None if output_path is None else Path(output_path), num_papers, batch_size * window_batches
+    )
+    batches: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_tokenize_stream,
+        args=(tokenizer, papers, max_length, batch_size, window_batches, batches, stop),
+        name="embedding-tokenizer",
+        daemon=True,
+    )
+    producer.start()
+    try:
+        while True:
+            item = batches.get()
+            if item is _DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            batch_rows, encoded = item
+            rows.write(batch_rows, _forward_batch(model, encoded))
+    finally:
+        stop.set()
+        producer.join()
+    return rows.result(hidden_size), model_name
@@ -0,0 +1,404 @@
+"""Long-lived local embedding service with dynamic micro-batching.
+
+:class:`EmbeddingService` keeps one model warm and listens on a Unix socket
+(``address`` is a path) or a localhost TCP port (``address`` is
+``(host, port)``). Requests arriving within ``batch_window`` seconds of each
+other are merged into one model call of up to ``max_batch_size`` texts, run on
+a single background thread so the event loop keeps accepting work.
+
+The protocol is JSON Lines. A request is ``{"id": 1, "texts": [...],
+"max_length": 512}`` and its reply ``{"id": 1, "shape": [n, d], "vectors":
+"<base64 little-endian float32>"}``, so vectors arrive bit-exact;
+``{"op": "info"}`` returns the model name, hidden size and the name its
+vectors are cached under (``"<model>+int8"`` when quantised), and
+``{"op": "stats"}`` the :class:`ServiceStats` counters.
+:class:`EmbeddingClient` is a blocking client that
+``embed_papers(..., client=...)`` uses in place of a local model, and
+:func:`run_load_test` drives a service with concurrent asyncio clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.embedding.basic import DEFAULT_BATCH_SIZE, DEFAULT_MODEL_NAME, _embed_texts, _get_sci_bert
+from src.embedding.cpu import CPUInferenceProfile
+
+if TYPE_CHECKING:  # pragma: no cover
+    from transformers import AutoModel, AutoTokenizer
+
+
+Address = Union[str, Path, Tuple[str, int]]
+DEFAULT_BATCH_WINDOW = 0.005
+_STREAM_LIMIT = 64 * 1024 * 1024
+
+
+def _encode_vectors(vectors: np.ndarray) -> Dict[str, Any]:
+    data = np.ascontiguousarray(vectors, dtype="<f4")
+    return {"shape": list(data.shape), "vectors": base64.b64encode(data.tobytes()).decode("ascii")}
+
+
+def _decode_vectors(reply: Dict[str, Any]) -> np.ndarray:
+    data = np.frombuffer(base64.b64decode(reply["vectors"]), dtype="<f4")
+    return data.reshape(reply["shape"]).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class ServiceStats:
+    """Counters since the service started; latencies cover the most recent requests."""
+
+    requests: int
+    texts: int
+    batches: int
+    mean_batch_size: float
+    latency_p50: float
+    latency_p95: float
+    texts_per_second: float
+    uptime: float
+
+
+@dataclass
+class _Pending:
+    texts: List[str]
+    max_length: int
+    future: asyncio.Future
+
+
+class EmbeddingService:
+    """Serve embeddings from one warm model, micro-batching concurrent requests."""
+
+    def __init__(
+        self,
+        tokenizer: Optional[AutoTokenizer] = None,
+        model: Optional[AutoModel] = None,
+        *,
+        max_batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        profile: Optional[CPUInferenceProfile] = None,
+        latency_window: int = 10_000,
+    ):
+        if (tokenizer is None) != (model is None):
+            raise ValueError("`tokenizer` and `model` must be provided together or omitted together.")
+        if max_batch_size <= 0 or batch_window < 0:
+            raise ValueError("max_batch_size must be positive and batch_window non-negative")
+        self.tokenizer = tokenizer
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.profile = profile
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-service")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._requests = self._texts = self._batches = 0
+        self._started = time.perf_counter()
+        self.model_name = DEFAULT_MODEL_NAME
+        self.hidden_size = 0
+        self.cache_name = DEFAULT_MODEL_NAME
+
+    def _load(self) -> None:
+        if self.model is None:
+            self.tokenizer, self.model = _get_sci_bert()
+        self.model_name = getattr(self.model.config, "name_or_path", DEFAULT_MODEL_NAME)
+        self.hidden_size = getattr(self.model.config, "hidden_size", 0)
+        self.cache_name = self.model_name
+        if self.profile is not None:
+            self.model = self.profile.prepare(self.model)
+            self.cache_name = self.profile.cache_name(self.model_name)
+
+    async def start(self, address: Address) -> Address:
+        """Load the model, start listening and return the bound address."""
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._load)
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._started = time.perf_counter()
+        if isinstance(address, tuple):
+            self._server = await asyncio.start_server(self._handle, *address, limit=_STREAM_LIMIT)
+            return self._server.sockets[0].getsockname()[:2]
+        self._server = await asyncio.start_unix_server(self._handle, str(address), limit=_STREAM_LIMIT)
+        return str(address)
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None, "call start() first"
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self._executor.shutdown(wait=True)
+
+    async def embed(self, texts: Sequence[str], max_length: int = 512) -> np.ndarray:
+        """Embed ``texts`` in whichever micro-batch they land in."""
+
+        assert self._queue is not None, "call start() first"
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_Pending(list(texts), max_length, future))
+        vectors = await future
+        self._latencies.append(time.perf_counter() - started)
+        self._requests += 1
+        self._texts += len(texts)
+        return vectors
+
+    def stats(self) -> ServiceStats:
+        latencies = np.array(self._latencies) if self._latencies else np.zeros(1)
+        uptime = time.perf_counter() - self._started
+        return ServiceStats(
+            requests=self._requests,
+            texts=self._texts,
+            batches=self._batches,
+            mean_batch_size=self._texts / self._batches if self._batches else 0.0,
+            latency_p50=float(np.percentile(latencies, 50)),
+            latency_p95=float(np.percentile(latencies, 95)),
+            texts_per_second=self._texts / uptime if uptime > 0 else 0.0,
+            uptime=uptime,
+        )
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0].texts)
+            deadline = loop.time() + self.batch_window
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    if self._queue.empty():
+                        break
+                    item = self._queue.get_nowait()
+                else:
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                pending.append(item)
+                size += len(item.texts)
+            for max_length in sorted({item.max_length for item in pending}):
+                await self._run([item for item in pending if item.max_length == max_length], max_length)
+
+    async def _run(self, pending: List[_Pending], max_length: int) -> None:
+        texts = [text for item in pending for text in item.texts]
+        try:
+            vectors = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _embed_texts, self.tokenizer, self.model, texts, max_length, self.max_batch_size
+            )
+        except Exception as error:
+            for item in pending:
+                if not item.future.done():
+                    item.future.set_exception(error)
+            return
+        if vectors is None:
+            vectors = np.zeros((0, self.hidden_size), dtype=np.float32)
+        self._batches += 1
+        start = 0
+        for item in pending:
+            stop = start + len(item.texts)
+            if not item.future.done():
+                item.future.set_result(vectors[start:stop])
+            start = stop
+
+    async def _reply(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        request: Dict[str, Any] = {}
+        try:
+            request = json.loads(line)
+            op = request.get("op", "embed")
+            if op == "embed":
+                reply = _encode_vectors(await self.embed(request["texts"], int(request.get("max_length", 512))))
+            elif op == "info":
+                reply = {
+                    "model": self.model_name,
+                    "hidden_size": self.hidden_size,
+                    "quantized": self.profile is not None and self.profile.quantize,
+                    "cache_name": self.cache_name,
+                }
+            elif op == "stats":
+                reply = asdict(self.stats())
+            else:
+                raise ValueError(f"Unknown op: {op}")
+        except Exception as error:
+            reply = {"error": f"{type(error).__name__}: {error}"}
+        reply["id"] = request.get("id") if isinstance(request, dict) else None
+        async with lock:
+            writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+            await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+        replies = set()
+        try:
+            while line := await reader.readline():
+                # Requests on one connection may be pipelined; answer them as they finish.
+                task = asyncio.create_task(self._reply(line, writer, lock))
+                replies.add(task)
+                task.add_done_callback(replies.discard)
+            if replies:
+                await asyncio.gather(*replies, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class EmbeddingClient:
+    """Blocking client for :class:`EmbeddingService`; safe to share between threads."""
+
+    def __init__(self, address: Address, *, timeout: Optional[float] = 60.0):
+        self.address = address
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._stream: Any = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._info: Optional[Dict[str, Any]] = None
+
+    def _connect(self) -> None:
+        if isinstance(self.address, tuple):
+            self._socket = socket.create_connection(self.address, timeout=self.timeout)
+        else:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+            self._socket.connect(str(self.address))
+        self._stream = self._socket.makefile("rwb")
+
+    def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            if self._socket is None:
+                self._connect()
+            self._next_id += 1
+            payload = {**payload, "id": self._next_id}
+            try:
+                self._stream.write(json.dumps(payload).encode("utf-8") + b"\n")
+                self._stream.flush()
+                line = self._stream.readline()
+            except OSError:
+                self.close()
+                raise
+            if not line:
+                self.close()
+                raise ConnectionError("embedding service closed the connection")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    def info(self) -> Dict[str, Any]:
+        if self._info is None:
+            self._info = self._request({"op": "info"})
+        return self._info
+
+    @property
+    def model_name(self) -> str:
+        return self.info()["model"]
+
+    @property
+    def hidden_size(self) -> int:
+        return self.info()["hidden_size"]
+
+    @property
+    def cache_name(self) -> str:
+        """Model name for :class:`~src.embedding.cache.EmbeddingCache` keys, marking quantised services."""
+
+        return self.info()["cache_name"]
+
+    def embed(self, texts: Sequence[str], *, max_length: int = 512) -> np.ndarray:
+        return _decode_vectors(self._request({"texts": list(texts), "max_length": max_length}))
+
+    def stats(self) -> ServiceStats:
+        reply = self._request({"op": "stats"})
+        reply.pop("id", None)
+        return ServiceStats(**reply)
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._stream.close()
+            self._socket.close()
+            self._socket = self._stream = None
+
+    def __enter__(self) -> "EmbeddingClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+@dataclass(frozen=True)
+class LoadTestReport:
+    """Client-side view of a :func:`run_load_test` run."""
+
+    requests: int
+    seconds: float
+    requests_per_second: float
+    latency_p50: float
+    latency_p95: float
+    server: ServiceStats
+
+
+async def _open(address: Address) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if isinstance(address, tuple):
+        return await asyncio.open_connection(*address, limit=_STREAM_LIMIT)
+    return await asyncio.open_unix_connection(str(address), limit=_STREAM_LIMIT)
+
+
+async def _load_client(address: Address, texts: Sequence[str], requests: int, latencies: List[float]) -> None:
+    reader, writer = await _open(address)
+    try:
+        for index in range(requests):
+            started = time.perf_counter()
+            writer.write(json.dumps({"id": index, "texts": [texts[index % len(texts)]]}).encode("utf-8") + b"\n")
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            if "error" in reply:
+                raise RuntimeError(reply["error"])
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load_test(
+    address: Address, texts: Sequence[str], *, clients: int = 16, requests_per_client: int = 20
+) -> LoadTestReport:
+    """Hit a running service with ``clients`` concurrent connections of single-text requests."""
+
+    if not texts or clients <= 0 or requests_per_client <= 0:
+        raise ValueError("texts must be non-empty and clients/requests_per_client positive")
+    latencies: List[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(_load_client(address, texts, requests_per_client, latencies) for _ in range(clients)))
+    seconds = time.perf_counter() - started
+
+    reader, writer = await _open(address)
+    writer.write(b'{"op": "stats"}\n')
+    await writer.drain()
+    server = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    server.pop("id", None)
+
+    return LoadTestReport(
+        requests=len(latencies),
+        seconds=seconds,
+        requests_per_second=len(latencies) / seconds,
+        latency_p50=float(np.percentile(latencies, 50)),
+        latency_p95=float(np.percentile(latencies, 95)),
+        server=ServiceStats(**server),
+    )
+
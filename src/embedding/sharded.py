@@ -0,0 +1,226 @@
+"""Multi-process sharded embedding for many-core machines.
+
+One PyTorch process rarely keeps a large many-socket box busy, so
+:func:`embed_papers_sharded` spreads the corpus over worker processes, each
+with its own model (loaded once per worker by ``loader``) and a fixed intra-op
+thread count. Workers first measure token lengths in parallel; the parent then
+cuts the same length-sorted batches :func:`~src.embedding.basic.embed_papers`
+would use and groups consecutive batches into shards. Each worker writes its
+shard's rows straight into a shared output (a ``.npy`` memory map or a shared
+memory segment), so every batch is padded exactly as in a single-process run
+and the rows are bit-identical to it for the same per-process thread count.
+
+A shard whose worker raises, or whose process dies, is re-queued on a fresh
+pool up to ``max_retries`` times.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.embedding.basic import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MODEL_NAME,
+    _embed_batch,
+    _embed_texts,
+    _get_sci_bert,
+    _length_sorted_batches,
+    _paper_text,
+    _token_lengths,
+)
+from src.models import Paper
+
+if TYPE_CHECKING:  # pragma: no cover
+    from transformers import AutoModel, AutoTokenizer
+
+
+Loader = Callable[[], Tuple["AutoTokenizer", "AutoModel"]]
+Shard = List[Tuple[np.ndarray, List[str]]]
+DEFAULT_SHARD_BATCHES = 4
+
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(loader: Loader, threads: Optional[int], max_length: int) -> None:
+    if threads is not None:
+        import torch
+
+        torch.set_num_threads(threads)
+    tokenizer, model = loader()
+    _WORKER_STATE.update(tokenizer=tokenizer, model=model, max_length=max_length, outputs={})
+
+
+def _attach_output(source: Tuple[Any, ...]) -> np.ndarray:
+    outputs = _WORKER_STATE["outputs"]
+    if source not in outputs:
+        kind, name, shape = source
+        if kind == "npy":
+            outputs[source] = np.load(name, mmap_mode="r+")
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            outputs[source] = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+            outputs[(source, "handle")] = shm
+    return outputs[source]
+
+
+def _worker_lengths(texts: List[str]) -> Tuple[np.ndarray, int, str]:
+    model = _WORKER_STATE["model"]
+    lengths = _token_lengths(_WORKER_STATE["tokenizer"], texts, _WORKER_STATE["max_length"])
+    return lengths, model.config.hidden_size, getattr(model.config, "name_or_path", DEFAULT_MODEL_NAME)
+
+
+def _worker_embed(shard: Shard, source: Tuple[Any, ...]) -> int:
+    output = _attach_output(source)
+    for rows, texts in shard:
+        output[rows] = _embed_batch(
+            _WORKER_STATE["tokenizer"], _WORKER_STATE["model"], texts, _WORKER_STATE["max_length"]
+        )
+    if isinstance(output, np.memmap):
+        output.flush()
+    return len(shard)
+
+
+class _RestartablePool:
+    """A process pool that is rebuilt, reloading the models, after a worker dies."""
+
+    def __init__(self, factory: Callable[[], ProcessPoolExecutor]):
+        self._factory = factory
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, function: Callable[..., Any], *args: Any) -> Future:
+        if self._pool is None:
+            self._pool = self._factory()
+        return self._pool.submit(function, *args)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+def _run_with_retries(
+    pool: _RestartablePool,
+    function: Callable[..., Any],
+    tasks: Dict[Hashable, Tuple[Any, ...]],
+    max_retries: int,
+) -> Dict[Hashable, Any]:
+    """Run ``function(*args)`` for every task, re-queueing failed tasks up to ``max_retries`` times."""
+
+    results: Dict[Hashable, Any] = {}
+    attempts = dict.fromkeys(tasks, 0)
+    pending = dict(tasks)
+    while pending:
+        futures = {pool.submit(function, *args): key for key, args in pending.items()}
+        broken = False
+        for future in as_completed(futures):
+            key = futures[future]
+            error = future.exception()
+            if error is None:
+                results[key] = future.result()
+                del pending[key]
+                continue
+            attempts[key] += 1
+            if attempts[key] > max_retries:
+                raise RuntimeError(f"shard {key} failed after {attempts[key]} attempts") from error
+            broken = broken or isinstance(error, BrokenProcessPool)
+        if broken:
+            pool.close()
+    return results
+
+
+def embed_papers_sharded(
+    papers: Iterable[Paper],
+    *,
+    n_workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = 1,
+    loader: Loader = _get_sci_bert,
+    max_length: int = 512,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    shard_batches: int = DEFAULT_SHARD_BATCHES,
+    output_path: Optional[Union[str, Path]] = None,
+    max_retries: int = 2,
+    mp_context: Optional[str] = None,
+) -> Tuple[np.ndarray, str]:
+    """Embed papers on ``n_workers`` processes; same result as ``embed_papers``.
+
+    ``loader`` returns ``(tokenizer, model)`` inside each worker and must be
+    picklable (a module-level function or ``functools.partial`` of one).
+    Shards hold ``shard_batches`` batches of ``batch_size`` papers. With
+    ``output_path`` the float32 matrix is written to a ``.npy`` file and
+    returned as a memory map; otherwise it is returned in memory. With one
+    worker (or no papers) everything runs in the calling process.
+    """
+
+    if batch_size <= 0 or shard_batches <= 0:
+        raise ValueError("batch_size and shard_batches must be positive integers")
+    if max_retries < 0:
+        raise ValueError("max_retries must be non-negative")
+    texts = [_paper_text(paper) for paper in papers]
+    workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+
+    if workers <= 1 or not texts:
+        tokenizer, model = loader()
+        model_name = getattr(model.config, "name_or_path", DEFAULT_MODEL_NAME)
+        embeddings = _embed_texts(tokenizer, model, texts, max_length, batch_size)
+        if embeddings is None:
+            embeddings = np.zeros((0, getattr(model.config, "hidden_size", 0)), dtype=np.float32)
+        if output_path is not None:
+            np.save(output_path, embeddings.astype(np.float32, copy=False))
+            embeddings = np.load(output_path, mmap_mode="r+")
+        return embeddings, model_name
+
+    context = multiprocessing.get_context(mp_context)
+    pool = _RestartablePool(
+        lambda: ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(loader, threads_per_worker, max_length),
+        )
+    )
+    shm: Optional[shared_memory.SharedMemory] = None
+    try:
+        step = batch_size * shard_batches
+        measured = _run_with_retries(
+            pool,
+            _worker_lengths,
+            {start: (texts[start : start + step],) for start in range(0, len(texts), step)},
+            max_retries,
+        )
+        lengths = np.concatenate([measured[start][0] for start in sorted(measured)])
+        _, hidden_size, model_name = measured[0]
+        shape = (len(texts), hidden_size)
+
+        batches = list(_length_sorted_batches(lengths, batch_size))
+        shards = {
+            index: ([(rows, [texts[i] for i in rows]) for rows in batches[start : start + shard_batches]],)
+            for index, start in enumerate(range(0, len(batches), shard_batches))
+        }
+
+        if output_path is not None:
+            output = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.float32, shape=shape)
+            source: Tuple[Any, ...] = ("npy", str(output_path), shape)
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 4, 1))
+            source = ("shm", shm.name, shape)
+            output = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        _run_with_retries(pool, _worker_embed, {index: args + (source,) for index, args in shards.items()}, max_retries)
+        if shm is None:
+            output.flush()
+            return output, model_name
+        embeddings = output.copy()
+        del output
+        return embeddings, model_name
+    finally:
+        pool.close()
+        if shm is not None:
+            shm.close()
+            shm.unlink()
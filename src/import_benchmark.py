@@ -0,0 +1,114 @@
+"""Startup cost of importing each part of the package.
+
+Every measurement runs ``import <module>`` in a fresh interpreter, so module
+caches from earlier imports do not hide the cost, and also records which heavy
+third-party libraries the import dragged in. Timings can be written to JSON
+with :func:`record_import_times` and compared against a saved baseline with
+:func:`find_regressions` to catch regressions.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+SUBPACKAGES = (
+    "src.models",
+    "src.storage",
+    "src.data",
+    "src.scraping",
+    "src.embedding",
+    "src.analysis",
+    "src.dimension_reduction",
+    "src.visualisation",
+)
+HEAVY_MODULES = ("matplotlib", "requests", "scipy", "sklearn", "torch", "transformers", "umap")
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps([elapsed, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """Best-of-``repeats`` import time and the heavy modules the import loaded."""
+
+    module: str
+    seconds: float
+    heavy_modules: Tuple[str, ...]
+
+
+def measure_import(module: str, *, repeats: int = 3, statement: Optional[str] = None) -> ImportTiming:
+    """Time ``import module`` (or ``statement``) in ``repeats`` fresh interpreters."""
+
+    if repeats <= 0:
+        raise ValueError("repeats must be a positive integer")
+    probe = _PROBE.format(statement=statement or f"import {module}", heavy=HEAVY_MODULES)
+    best = float("inf")
+    heavy: List[str] = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-c", probe], cwd=_REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        seconds, heavy = json.loads(completed.stdout.strip().splitlines()[-1])
+        best = min(best, seconds)
+    return ImportTiming(module=module, seconds=best, heavy_modules=tuple(heavy))
+
+
+def benchmark_imports(modules: Sequence[str] = SUBPACKAGES, *, repeats: int = 3) -> List[ImportTiming]:
+    return [measure_import(module, repeats=repeats) for module in modules]
+
+
+def record_import_times(path: str | Path, timings: Iterable[ImportTiming]) -> Path:
+    """Write timings to JSON, e.g. as the baseline for :func:`find_regressions`."""
+
+    payload = {
+        "python": sys.version.split()[0],
+        "timings": {
+            timing.module: {"seconds": timing.seconds, "heavy_modules": list(timing.heavy_modules)}
+            for timing in timings
+        },
+    }
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    return target
+
+
+def find_regressions(
+    timings: Iterable[ImportTiming],
+    baseline_path: str | Path,
+    *,
+    tolerance: float = 1.5,
+    slack: float = 0.05,
+) -> List[str]:
+    """Describe imports that got slower or started loading new heavy modules.
+
+    An import regresses when it takes longer than ``tolerance`` times its
+    baseline plus ``slack`` seconds (absorbing timer noise on fast imports),
+    or when it loads a heavy module the baseline import did not.
+    """
+
+    baseline: Dict[str, dict] = json.loads(Path(baseline_path).read_text(encoding="utf-8"))["timings"]
+    problems = []
+    for timing in timings:
+        reference = baseline.get(timing.module)
+        if reference is None:
+            continue
+        limit = reference["seconds"] * tolerance + slack
+        if timing.seconds > limit:
+            problems.append(f"{timing.module}: {timing.seconds:.3f}s exceeds {limit:.3f}s")
+        new_heavy = sorted(set(timing.heavy_modules) - set(reference["heavy_modules"]))
+        if new_heavy:
+            problems.append(f"{timing.module}: now imports {', '.join(new_heavy)}")
+    return problems
+
@@ -1,11 +1,251 @@
-from dataclasses import dataclass
-from typing import List
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class Paper:
-    """Simple container for scraped paper data."""
+    """Simple container for scraped paper data.
+
+    ``identifier`` is the version-less source id (e.g. an ArXiv id);
+    ``published`` and ``updated`` are ISO 8601 timestamps from the feed.
+    """
 
     title: str
     abstract: str
     references: List[str]
+    identifier: Optional[str] = None
+    published: Optional[str] = None
+    updated: Optional[str] = None
+
+    def freeze(self) -> "FrozenPaper":
+        """Return an immutable copy with interned reference strings."""
+
+        return FrozenPaper(
+            title=self.title,
+            abstract=self.abstract,
+            references=tuple(sys.intern(ref) for ref in self.references),
+            identifier=self.identifier,
+            published=self.published,
+            updated=self.updated,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenPaper:
+    """Hashable, immutable counterpart of :class:`Paper`."""
+
+    title: str
+    abstract: str
+    references: Tuple[str, ...]
+    identifier: Optional[str] = None
+    published: Optional[str] = None
+    updated: Optional[str] = None
+
+    def thaw(self) -> Paper:
+        return Paper(**paper_fields(self))
+
+
+PAPER_FIELDS = tuple(field.name for field in fields(Paper))
+_TEXT_FIELDS = tuple(name for name in PAPER_FIELDS if name != "references")
+
+
+def encode_strings(values: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings into one UTF-8 byte array plus ``len(values) + 1`` offsets."""
+
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def paper_fields(paper: Any) -> Dict[str, Any]:
+    """Return the :class:`Paper` fields of any paper-like object as a plain dict."""
+
+    values = {name: getattr(paper, name) for name in PAPER_FIELDS}
+    values["references"] = list(values["references"])
+    return values
+
+
+class ReferenceVocabulary:
+    """Corpus-level dictionary encoding reference strings as integer ids."""
+
+    __slots__ = ("_ids", "_strings")
+
+    def __init__(self, references: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+        for reference in references:
+            self.add(reference)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __contains__(self, reference: object) -> bool:
+        return reference in self._ids
+
+    def __getitem__(self, reference_id: int) -> str:
+        return self._strings[reference_id]
+
+    def add(self, reference: str) -> int:
+        """Return the id of ``reference``, assigning the next id if it is new."""
+
+        reference_id = self._ids.get(reference)
+        if reference_id is None:
+            reference_id = len(self._strings)
+            interned = sys.intern(reference)
+            self._ids[interned] = reference_id
+            self._strings.append(interned)
+        return reference_id
+
+    def encode(self, references: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.add(ref) for ref in references), dtype=np.int32)
+
+    def decode(self, reference_ids: Iterable[int]) -> List[str]:
+        return [self._strings[reference_id] for reference_id in reference_ids]
+
+
+class PaperView:
+    """Lightweight read-only row of a :class:`PaperTable` with Paper attributes."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "PaperTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def title(self) -> str:
+        return self._table.text("title", self._index)
+
+    @property
+    def abstract(self) -> str:
+        return self._table.text("abstract", self._index)
+
+    @property
+    def identifier(self) -> Optional[str]:
+        return self._table.text("identifier", self._index)
+
+    @property
+    def published(self) -> Optional[str]:
+        return self._table.text("published", self._index)
+
+    @property
+    def updated(self) -> Optional[str]:
+        return self._table.text("updated", self._index)
+
+    @property
+    def references(self) -> List[str]:
+        return self._table.references(self._index)
+
+    @property
+    def reference_ids(self) -> np.ndarray:
+        return self._table.reference_ids(self._index)
+
+    def to_paper(self) -> Paper:
+        return Paper(**paper_fields(self))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Paper, PaperView)):
+            return paper_fields(self) == paper_fields(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PaperView({self._index}, title={self.title!r})"
+
+
+class PaperTable(Sequence):
+    """Columnar container for many papers.
+
+    Text fields are stored as one UTF-8 byte array plus an offsets array each
+    (``None`` tracked by a mask), and references as dictionary-encoded ids in
+    a flat array with per-paper offsets against a shared
+    :class:`ReferenceVocabulary`. Indexing and iteration hand out
+    :class:`PaperView` rows, so the table can be passed wherever an
+    ``Iterable[Paper]`` is expected; slicing returns another table.
+    """
+
+    def __init__(
+        self,
+        text: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]],
+        reference_ids: np.ndarray,
+        reference_offsets: np.ndarray,
+        vocabulary: ReferenceVocabulary,
+    ):
+        self._text = text
+        self._reference_ids = reference_ids
+        self._reference_offsets = reference_offsets
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_papers(
+        cls, papers: Iterable[Any], vocabulary: Optional[ReferenceVocabulary] = None
+    ) -> "PaperTable":
+        """Pack paper-like objects into a table, sharing ``vocabulary`` if given."""
+
+        vocabulary = vocabulary if vocabulary is not None else ReferenceVocabulary()
+        values: Dict[str, List[Optional[str]]] = {name: [] for name in _TEXT_FIELDS}
+        reference_ids: List[int] = []
+        reference_counts: List[int] = []
+        for paper in papers:
+            for name in _TEXT_FIELDS:
+                values[name].append(getattr(paper, name))
+            refs = [vocabulary.add(ref) for ref in paper.references]
+            reference_ids.extend(refs)
+            reference_counts.append(len(refs))
+
+        text = {}
+        for name in _TEXT_FIELDS:
+            data, offsets = encode_strings([value or "" for value in values[name]])
+            text[name] = (data, offsets, np.array([value is None for value in values[name]], dtype=bool))
+        reference_offsets = np.zeros(len(reference_counts) + 1, dtype=np.int64)
+        np.cumsum(reference_counts, out=reference_offsets[1:])
+        return cls(text, np.array(reference_ids, dtype=np.int32), reference_offsets, vocabulary)
+
+    def __len__(self) -> int:
+        return self._reference_offsets.size - 1
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return self._slice(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("paper table index out of range")
+        return PaperView(self, index)
+
+    def _slice(self, index: slice) -> "PaperTable":
+        """Table of the selected rows sharing ``vocabulary``; contiguous slices view the columns."""
+
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            return PaperTable.from_papers((self[row] for row in range(start, stop, step)), self.vocabulary)
+        stop = max(start, stop)
+        text = {}
+        for name, (data, offsets, nulls) in self._text.items():
+            rows = offsets[start : stop + 1]
+            text[name] = (data[rows[0] : rows[-1]], rows - rows[0], nulls[start:stop])
+        reference_offsets = self._reference_offsets[start : stop + 1]
+        reference_ids = self._reference_ids[reference_offsets[0] : reference_offsets[-1]]
+        return PaperTable(text, reference_ids, reference_offsets - reference_offsets[0], self.vocabulary)
+
+    def __iter__(self) -> Iterator[PaperView]:
+        return (PaperView(self, index) for index in range(len(self)))
+
+    def text(self, name: str, index: int) -> Optional[str]:
+        data, offsets, nulls = self._text[name]
+        if nulls[index]:
+            return None
+        return bytes(data[offsets[index] : offsets[index + 1]]).decode("utf-8")
+
+    def reference_ids(self, index: int) -> np.ndarray:
+        return self._reference_ids[self._reference_offsets[index] : self._reference_offsets[index + 1]]
+
+    def references(self, index: int) -> List[str]:
+        return self.vocabulary.decode(self.reference_ids(index))
+
+    def to_papers(self) -> List[Paper]:
+        return [view.to_paper() for view in self]
@@ -1,3 +1,15 @@
-from .arxiv import ARXIV_API_URL, fetch_arxiv_papers, parse_arxiv_feed
+from typing import TYPE_CHECKING
 
-__all__ = ["ARXIV_API_URL", "fetch_arxiv_papers", "parse_arxiv_feed"]
+from src._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "arxiv": ["ARXIV_API_URL", "fetch_arxiv_papers", "iter_arxiv_feed", "parse_arxiv_feed"],
+        "harvest": ["TokenBucket", "harvest_arxiv", "harvest_incremental"],
+    },
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .arxiv import ARXIV_API_URL, fetch_arxiv_papers, iter_arxiv_feed, parse_arxiv_feed
+    from .harvest import TokenBucket, harvest_arxiv, harvest_incremental
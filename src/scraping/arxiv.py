@@ -2,54 +2,145 @@
 
 from __future__ import annotations
 
+import re
 import xml.etree.ElementTree as ET
-from typing import List, Optional
-
-import requests
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, List, Optional, Union
 
 from src.models import Paper
 
+if TYPE_CHECKING:  # pragma: no cover - requests loads on first fetch
+    import requests
+
 
 ARXIV_API_URL = "https://export.arxiv.org/api/query"
 
 
+FeedSource = Union[str, bytes, IO[Any], Iterable[Union[str, bytes]]]
+FEED_CHUNK_SIZE = 64 * 1024
+_ARXIV_ID_PATTERN = re.compile(r"^(?:https?://arxiv\.org/abs/)?(?P<id>.+?)(?:v\d+)?$")
+
+
 def _extract_text(element: Optional[ET.Element]) -> str:
     return (element.text or "").strip() if element is not None else ""
 
 
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def arxiv_identifier(entry_id: str) -> Optional[str]:
+    """Turn an entry ``id`` such as ``http://arxiv.org/abs/2101.00001v2`` into ``2101.00001``."""
+
+    match = _ARXIV_ID_PATTERN.match(entry_id.strip())
+    return match.group("id") if match else None
+
+
+def _paper_from_entry(entry: ET.Element) -> Paper:
+    title = _extract_text(entry.find("{*}title"))
+    abstract = _extract_text(entry.find("{*}summary"))
+    refs = [
+        _extract_text(ref)
+        for ref in entry.findall("{*}reference")
+        if _extract_text(ref)
+    ]
+    entry_id = _extract_text(entry.find("{*}id"))
+    return Paper(
+        title=title,
+        abstract=abstract,
+        references=refs,
+        identifier=arxiv_identifier(entry_id) if entry_id else None,
+        published=_extract_text(entry.find("{*}published")) or None,
+        updated=_extract_text(entry.find("{*}updated")) or None,
+    )
+
+
+def _feed_chunks(source: FeedSource, chunk_size: int) -> Iterator[Union[str, bytes]]:
+    if isinstance(source, (str, bytes)):
+        for start in range(0, len(source), chunk_size):
+            yield source[start : start + chunk_size]
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        yield from source
+
+
+def iter_arxiv_feed(source: FeedSource, *, chunk_size: int = FEED_CHUNK_SIZE) -> Iterator[Paper]:
+    """Incrementally parse an ArXiv Atom feed, yielding one Paper per ``entry``.
+
+    ``source`` may be the feed text, raw bytes, a file-like object or any
+    iterable of byte/str chunks (e.g. ``response.iter_content()``). Each entry
+    is dropped from the partial tree once it has been converted, so memory
+    stays bounded by the largest single entry.
+    """
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: List[ET.Element] = []
+
+    def drain() -> Iterator[Paper]:
+        for event, element in parser.read_events():
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            if _local_name(element.tag) == "entry":
+                yield _paper_from_entry(element)
+                if stack:
+                    stack[-1].remove(element)
+                element.clear()
+
+    for chunk in _feed_chunks(source, chunk_size):
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
 def parse_arxiv_feed(feed_text: str) -> List[Paper]:
     """Parse a small ArXiv Atom feed into Paper objects.
 
-    Only keeps the title, summary/abstract, and any child ``reference`` nodes.
+    Only keeps the title, summary/abstract, any child ``reference`` nodes and
+    the entry's id and published/updated timestamps.
     """
 
-    root = ET.fromstring(feed_text)
-    papers: List[Paper] = []
-    for entry in root.findall(".//{*}entry"):
-        title = _extract_text(entry.find("{*}title"))
-        abstract = _extract_text(entry.find("{*}summary"))
-        refs = [
-            _extract_text(ref)
-            for ref in entry.findall("{*}reference")
-            if _extract_text(ref)
-        ]
-        papers.append(Paper(title=title, abstract=abstract, references=refs))
-    return papers
-
-
-def fetch_arxiv_papers(query: str, max_results: int = 10, session: Optional[requests.Session] = None) -> List[Paper]:
+    return list(iter_arxiv_feed(feed_text))
+
+
+def fetch_arxiv_papers(
+    query: str,
+    max_results: int = 10,
+    session: Optional[requests.Session] = None,
+    *,
+    stream: bool = False,
+) -> List[Paper]:
     """Fetch a small set of papers from ArXiv.
 
     The call is intentionally lightweight so it can be mocked in tests. The
-    returned value is a list of :class:`Paper` instances.
+    returned value is a list of :class:`Paper` instances. With ``stream=True``
+    the response body is parsed chunk by chunk as it downloads instead of
+    being buffered in full first.
     """
 
-    client = session or requests.Session()
+    if session is None:
+        import requests
+
+        session = requests.Session()
     params = {
         "search_query": query,
         "start": 0,
         "max_results": max_results,
     }
-    response = client.get(ARXIV_API_URL, params=params, timeout=10)
-    response.raise_for_status()
-    return parse_arxiv_feed(response.text)
+    if not stream:
+        response = session.get(ARXIV_API_URL, params=params, timeout=10)
+        response.raise_for_status()
+        return parse_arxiv_feed(response.text)
+
+    response = session.get(ARXIV_API_URL, params=params, timeout=10, stream=True)
+    try:
+        response.raise_for_status()
+        return list(iter_arxiv_feed(response.iter_content(chunk_size=FEED_CHUNK_SIZE)))
+    finally:
+        response.close()
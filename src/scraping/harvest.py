@@ -0,0 +1,304 @@
+"""Paginated, concurrent and rate-limited ArXiv harvesting."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from src.data.harvest_state import HarvestCursor, load_harvest_state, persist_harvest_state
+from src.models import Paper
+from src.scraping.arxiv import ARXIV_API_URL, FEED_CHUNK_SIZE, iter_arxiv_feed
+
+if TYPE_CHECKING:  # pragma: no cover - requests loads on first fetch
+    import requests
+
+
+# ArXiv asks API clients for no more than one request every three seconds.
+ARXIV_REQUEST_RATE = 1.0 / 3.0
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Lower bound for a query's first date window.
+ARXIV_EPOCH = "1991-01-01T00:00:00+00:00"
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, at most ``capacity`` banked."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+def _retry_delay(response: Optional[requests.Response], attempt: int, backoff: float) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return backoff * (2**attempt)
+
+
+def _fetch_page(
+    session: requests.Session,
+    bucket: TokenBucket,
+    url: str,
+    params: dict,
+    *,
+    timeout: float,
+    max_retries: int,
+    backoff: float,
+    headers: Optional[Mapping[str, str]] = None,
+) -> List[Paper]:
+    """Fetch and parse one page, retrying transient failures with exponential backoff.
+
+    A ``304 Not Modified`` answer to a conditional request is an empty page.
+    """
+
+    import requests
+
+    for attempt in range(max_retries + 1):
+        bucket.acquire()
+        response: Optional[requests.Response] = None
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=timeout, stream=True)
+            if response.status_code == 304:
+                response.close()
+                return []
+            if response.status_code not in RETRY_STATUS_CODES:
+                with response:
+                    response.raise_for_status()
+                    return list(iter_arxiv_feed(response.iter_content(chunk_size=FEED_CHUNK_SIZE)))
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+        if response is not None:
+            response.close()
+        if attempt == max_retries:
+            response.raise_for_status()
+        time.sleep(_retry_delay(response, attempt, backoff))
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+def _shared_session(max_workers: int) -> requests.Session:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def harvest_arxiv(
+    query: str,
+    *,
+    max_results: Optional[int] = None,
+    page_size: int = 100,
+    max_workers: int = 4,
+    session: Optional[requests.Session] = None,
+    rate: float = ARXIV_REQUEST_RATE,
+    burst: float = 1.0,
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    timeout: float = 10.0,
+    base_url: str = ARXIV_API_URL,
+    start: int = 0,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Iterator[Paper]:
+    """Page through an ArXiv query and yield papers as pages arrive.
+
+    Up to ``max_workers`` pages are requested concurrently over one shared
+    session, with every request (including retries) drawing from a token
+    bucket of ``rate`` requests per second. Papers are yielded in page order as
+    soon as each page is ready. Harvesting stops after ``max_results`` papers or
+    at the first short page. ``sort_by``/``sort_order`` map to the API's
+    ``sortBy``/``sortOrder`` and ``headers`` (e.g. ``If-Modified-Since``) are
+    sent with every request.
+    """
+
+    if page_size <= 0 or max_workers <= 0:
+        raise ValueError("page_size and max_workers must be positive integers")
+
+    client = session or _shared_session(max_workers)
+    bucket = TokenBucket(rate, burst)
+    limit = max_results if max_results is not None else float("inf")
+    next_start = start
+    exhausted = False
+    yielded = 0
+
+    def submit(executor: ThreadPoolExecutor) -> Tuple[int, Future]:
+        nonlocal next_start
+        size = int(min(page_size, limit - (next_start - start)))
+        params = {"search_query": query, "start": next_start, "max_results": size}
+        if sort_by is not None:
+            params["sortBy"] = sort_by
+        if sort_order is not None:
+            params["sortOrder"] = sort_order
+        future = executor.submit(
+            _fetch_page,
+            client,
+            bucket,
+            base_url,
+            params,
+            timeout=timeout,
+            max_retries=max_retries,
+            backoff=backoff,
+            headers=headers,
+        )
+        next_start += size
+        return size, future
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Tuple[int, Future]] = deque()
+        try:
+            while True:
+                while not exhausted and len(pending) < max_workers and next_start - start < limit:
+                    pending.append(submit(executor))
+                if not pending:
+                    break
+                requested, future = pending.popleft()
+                papers = future.result()
+                if len(papers) < requested:
+                    exhausted = True
+                for paper in papers:
+                    if yielded >= limit:
+                        return
+                    yielded += 1
+                    yield paper
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def _arxiv_date(iso_timestamp: str) -> str:
+    """Format an ISO timestamp the way ArXiv date-range queries expect (UTC ``YYYYMMDDHHMM``)."""
+
+    moment = datetime.fromisoformat(iso_timestamp.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y%m%d%H%M")
+
+
+def harvest_incremental(
+    query: str,
+    corpus_path: str | Path,
+    *,
+    existing: Iterable[Paper] = (),
+    now: Optional[str] = None,
+    page_size: int = 100,
+    base_url: str = ARXIV_API_URL,
+    **harvest_options: Any,
+) -> Iterator[Paper]:
+    """Harvest only what changed for ``query`` since the last completed run.
+
+    The cursor saved beside ``corpus_path`` (see
+    :mod:`src.data.harvest_state`) picks the date window: a first run covers
+    everything up to ``now``, an interrupted run resumes its window at the
+    saved offset, and a completed run opens a new window from its previous end.
+    Entries are requested by ``lastUpdatedDate`` in ascending order. The
+    offset counts every paper handed to the caller and is checkpointed after
+    each page and whenever the generator stops. A window is only marked
+    complete once a request at the current offset comes back empty; stopping
+    early, including at ``max_results``, leaves it to be resumed. Papers
+    whose identifier is already in ``existing`` with the same ``updated``
+    timestamp are skipped. Requests after a completed run carry
+    ``If-Modified-Since`` so servers that honour it can answer ``304``.
+    Remaining keyword arguments go to :func:`harvest_arxiv`.
+    """
+
+    cursors = load_harvest_state(corpus_path)
+    previous = cursors.get(query)
+    headers: Dict[str, str] = {}
+    now = now or _utc_now_iso()
+    if previous is None:
+        cursor = HarvestCursor(query=query, endpoint=base_url, window_start=ARXIV_EPOCH, window_end=now)
+    elif previous.complete:
+        cursor = HarvestCursor(query=query, endpoint=base_url, window_start=previous.window_end, window_end=now)
+        if previous.retrieved_at:
+            modified = datetime.fromisoformat(previous.retrieved_at).astimezone(timezone.utc)
+            headers["If-Modified-Since"] = format_datetime(modified, usegmt=True)
+    else:
+        cursor = previous
+    cursors[query] = cursor
+
+    known = {paper.identifier: paper.updated for paper in existing if paper.identifier}
+    windowed_query = (
+        f"({query}) AND lastUpdatedDate:[{_arxiv_date(cursor.window_start)} TO {_arxiv_date(cursor.window_end)}]"
+    )
+    max_results = harvest_options.pop("max_results", None)
+    remaining = max_results if max_results is not None else float("inf")
+    exhausted = False
+    try:
+        # A short page can end a harvest_arxiv call early, so the window only
+        # counts as exhausted once a request from the current offset is empty.
+        while remaining > 0 and not exhausted:
+            papers = harvest_arxiv(
+                windowed_query,
+                start=cursor.offset,
+                max_results=None if max_results is None else int(remaining),
+                page_size=page_size,
+                base_url=base_url,
+                sort_by="lastUpdatedDate",
+                sort_order="ascending",
+                headers=headers or None,
+                **harvest_options,
+            )
+            exhausted = True
+            for paper in papers:
+                exhausted = False
+                remaining -= 1
+                cursor.offset += 1
+                identifier = paper.identifier
+                if identifier is None or identifier not in known or known[identifier] != paper.updated:
+                    if identifier is not None:
+                        known[identifier] = paper.updated
+                    yield paper
+                if cursor.offset % page_size == 0:
+                    persist_harvest_state(corpus_path, cursors)
+        if exhausted:
+            cursor.offset = 0
+            cursor.complete = True
+            cursor.retrieved_at = now
+    finally:
+        persist_harvest_state(corpus_path, cursors)
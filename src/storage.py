@@ -1,18 +1,45 @@
-"""Lightweight persistence for scraped papers."""
+"""Lightweight persistence for scraped papers.
+
+Three formats are supported: a JSON list (``save_papers``/``load_papers``) for
+import/export, streaming JSON Lines (``write_papers_jsonl``,
+``append_papers_jsonl``, ``iter_papers_jsonl``) for bounded-memory pipelines,
+and a columnar binary directory
+(``save_papers_columnar``/``load_papers_columnar``) for large corpora. The
+columnar layout stores each string field as a UTF-8 byte array plus an offsets
+array, references as one flattened string column plus per-paper offsets, and
+optionally the embedding matrix as float32. Every column is a ``.npy`` file
+that is memory mapped on load, so opening a corpus is instant and only the
+columns that are touched are read. A columnar corpus can also be loaded as a
+:class:`~src.models.PaperTable` sharing the same string columns.
+"""
 
 from __future__ import annotations
 
 import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Iterable, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.models import Paper, PaperTable, ReferenceVocabulary, encode_strings, paper_fields
+
+try:  # POSIX only; appends fall back to unlocked writes elsewhere
+    import fcntl
+except ImportError:  # pragma: no cover - platform dependent
+    fcntl = None
 
-from src.models import Paper
+
+COLUMNAR_SCHEMA_VERSION = "1.0"
+STRING_COLUMNS = ("title", "abstract", "identifier", "published", "updated")
+NULLABLE_COLUMNS = ("identifier", "published", "updated")
 
 
 def save_papers(path: str | Path, papers: Iterable[Paper]) -> None:
     """Write papers to disk as JSON."""
 
-    data = [paper.__dict__ for paper in papers]
+    data = [paper_fields(paper) for paper in papers]
     Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
 
 
@@ -21,3 +48,274 @@ def load_papers(path: str | Path) -> List[Paper]:
 
     entries = json.loads(Path(path).read_text(encoding="utf-8"))
     return [Paper(**entry) for entry in entries]
+
+
+def _jsonl_line(paper: Paper) -> str:
+    return json.dumps(paper_fields(paper), ensure_ascii=False) + "\n"
+
+
+def write_papers_jsonl(path: str | Path, papers: Iterable[Paper]) -> int:
+    """Stream papers to a JSON Lines file, replacing it atomically.
+
+    Records are written to a temporary file in the same directory which then
+    replaces ``path``, so readers never see a half-written corpus. Returns the
+    number of papers written.
+    """
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    handle = tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=target.parent, prefix=f".{target.name}.", delete=False
+    )
+    try:
+        with handle:
+            for paper in papers:
+                handle.write(_jsonl_line(paper))
+                count += 1
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(handle.name, target)
+    except BaseException:
+        Path(handle.name).unlink(missing_ok=True)
+        raise
+    return count
+
+
+def _complete_lines_size(fd: int, block_size: int = 64 * 1024) -> int:
+    """Byte length of a file up to and including its last newline."""
+
+    end = os.fstat(fd).st_size
+    while end > 0:
+        start = max(0, end - block_size)
+        block = os.pread(fd, end - start, start)
+        newline = block.rfind(b"\n")
+        if newline >= 0:
+            return start + newline + 1
+        end = start
+    return 0
+
+
+def append_papers_jsonl(path: str | Path, papers: Iterable[Paper]) -> int:
+    """Atomically append papers to a JSON Lines file.
+
+    The records of one call are encoded up front and written with a single
+    append under an exclusive lock. A torn final line left by an earlier
+    interrupted append is truncated first. Returns the number of papers added.
+    """
+
+    lines = [_jsonl_line(paper) for paper in papers]
+    if not lines:
+        return 0
+    payload = "".join(lines).encode("utf-8")
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(target, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        os.ftruncate(fd, _complete_lines_size(fd))
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return len(lines)
+
+
+def iter_papers_jsonl(
+    path: str | Path,
+    *,
+    start: int = 0,
+    stop: Optional[int] = None,
+    predicate: Optional[Callable[[Paper], bool]] = None,
+) -> Iterator[Paper]:
+    """Lazily read papers from a JSON Lines file.
+
+    ``start``/``stop`` select a record range (lines outside it are not
+    parsed) and ``predicate`` filters the papers inside it. An unterminated
+    final line, e.g. from an interrupted append, is ignored.
+    """
+
+    with Path(path).open("r", encoding="utf-8") as handle:
+        for index, line in enumerate(handle):
+            if stop is not None and index >= stop:
+                break
+            if index < start or not line.endswith("\n") or not line.strip():
+                continue
+            paper = Paper(**json.loads(line))
+            if predicate is None or predicate(paper):
+                yield paper
+
+
+def save_papers_columnar(
+    path: str | Path, papers: Iterable[Paper], embeddings: Optional[np.ndarray] = None
+) -> Path:
+    """Write papers (and optionally their embeddings) to a columnar directory."""
+
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    paper_list = list(papers)
+    if embeddings is not None and len(embeddings) != len(paper_list):
+        raise ValueError("embeddings must have one row per paper")
+
+    for name in STRING_COLUMNS:
+        values = [getattr(paper, name) for paper in paper_list]
+        data, offsets = encode_strings([value or "" for value in values])
+        np.save(directory / f"{name}.data.npy", data)
+        np.save(directory / f"{name}.offsets.npy", offsets)
+        if name in NULLABLE_COLUMNS:
+            np.save(directory / f"{name}.null.npy", np.array([value is None for value in values], dtype=bool))
+
+    flat_refs = [ref for paper in paper_list for ref in paper.references]
+    data, offsets = encode_strings(flat_refs)
+    ref_index = np.zeros(len(paper_list) + 1, dtype=np.int64)
+    np.cumsum([len(paper.references) for paper in paper_list], out=ref_index[1:])
+    np.save(directory / "references.data.npy", data)
+    np.save(directory / "references.offsets.npy", offsets)
+    np.save(directory / "references.index.npy", ref_index)
+
+    if embeddings is not None:
+        np.save(directory / "embeddings.npy", np.asarray(embeddings, dtype=np.float32))
+
+    meta = {
+        "schema_version": COLUMNAR_SCHEMA_VERSION,
+        "num_papers": len(paper_list),
+        "has_embeddings": embeddings is not None,
+    }
+    (directory / "meta.json").write_text(json.dumps(meta, indent=2, sort_keys=True), encoding="utf-8")
+    return directory
+
+
+class ColumnarCorpus:
+    """Read-only, memory-mapped view of a columnar corpus directory.
+
+    Behaves as a sequence of :class:`Paper` objects (built on access) and also
+    exposes raw per-column access via :meth:`column` and :meth:`value`.
+    """
+
+    def __init__(self, path: str | Path, columns: Optional[Iterable[str]] = None):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("schema_version") != COLUMNAR_SCHEMA_VERSION:
+            raise ValueError(f"schema_version must be '{COLUMNAR_SCHEMA_VERSION}'.")
+        self._num_papers = int(meta["num_papers"])
+        self._has_embeddings = bool(meta["has_embeddings"])
+        known = set(STRING_COLUMNS) | {"references", "embeddings"}
+        self.columns = tuple(columns) if columns is not None else tuple(sorted(known))
+        unknown = set(self.columns) - known
+        if unknown:
+            raise ValueError(f"Unknown corpus columns: {sorted(unknown)}")
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def _array(self, name: str) -> np.ndarray:
+        array = self._arrays.get(name)
+        if array is None:
+            array = np.load(self.path / f"{name}.npy", mmap_mode="r")
+            self._arrays[name] = array
+        return array
+
+    def _require(self, column: str) -> None:
+        if column not in self.columns:
+            raise KeyError(f"Column '{column}' was not loaded")
+
+    def __len__(self) -> int:
+        return self._num_papers
+
+    def _string(self, prefix: str, index: int) -> str:
+        offsets = self._array(f"{prefix}.offsets")
+        return bytes(self._array(f"{prefix}.data")[offsets[index] : offsets[index + 1]]).decode("utf-8")
+
+    def value(self, column: str, index: int):
+        """Return one field of one paper without materialising the others."""
+
+        self._require(column)
+        if column == "references":
+            ref_index = self._array("references.index")
+            return [self._string("references", ref) for ref in range(ref_index[index], ref_index[index + 1])]
+        if column == "embeddings":
+            return self.embeddings[index]
+        if column in NULLABLE_COLUMNS and self._array(f"{column}.null")[index]:
+            return None
+        return self._string(column, index)
+
+    def column(self, column: str) -> List:
+        """Return every value of one column."""
+
+        return [self.value(column, index) for index in range(len(self))]
+
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        if not self._has_embeddings:
+            return None
+        self._require("embeddings")
+        return self._array("embeddings")
+
+    def __getitem__(self, index: int) -> Paper:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("corpus index out of range")
+        fields = {
+            name: self.value(name, index)
+            for name in (*STRING_COLUMNS, "references")
+            if name in self.columns
+        }
+        fields.setdefault("title", "")
+        fields.setdefault("abstract", "")
+        fields.setdefault("references", [])
+        return Paper(**fields)
+
+    def __iter__(self) -> Iterator[Paper]:
+        return (self[index] for index in range(len(self)))
+
+    def to_table(self, vocabulary: Optional[ReferenceVocabulary] = None) -> PaperTable:
+        """Return the loaded columns as a :class:`~src.models.PaperTable`.
+
+        String columns are shared with the memory-mapped files rather than
+        copied; references are dictionary-encoded into ``vocabulary`` (a new
+        one by default). Columns that were not loaded read as they do through
+        indexing: empty titles/abstracts, ``None`` metadata, no references.
+        """
+
+        text = {}
+        for name in STRING_COLUMNS:
+            if name in self.columns:
+                data, offsets = self._array(f"{name}.data"), self._array(f"{name}.offsets")
+            else:
+                data, offsets = np.zeros(0, dtype=np.uint8), np.zeros(len(self) + 1, dtype=np.int64)
+            if name in NULLABLE_COLUMNS:
+                nulls = self._array(f"{name}.null") if name in self.columns else np.ones(len(self), dtype=bool)
+            else:
+                nulls = np.zeros(len(self), dtype=bool)
+            text[name] = (data, offsets, nulls)
+
+        vocabulary = vocabulary if vocabulary is not None else ReferenceVocabulary()
+        if "references" in self.columns:
+            raw = self._array("references.data").tobytes()
+            bounds = self._array("references.offsets").tolist()
+            references = (raw[start:stop].decode("utf-8") for start, stop in zip(bounds, bounds[1:]))
+            reference_ids = vocabulary.encode(references)
+            reference_offsets = self._array("references.index")
+        else:
+            reference_ids = np.zeros(0, dtype=np.int32)
+            reference_offsets = np.zeros(len(self) + 1, dtype=np.int64)
+        return PaperTable(text, reference_ids, reference_offsets, vocabulary)
+
+
+def load_papers_columnar(
+    path: str | Path, columns: Optional[Iterable[str]] = None, *, as_table: bool = False
+) -> ColumnarCorpus | PaperTable:
+    """Open a corpus written by :func:`save_papers_columnar`.
+
+    Only ``columns`` (all by default) are made available; their files are
+    memory mapped the first time they are read. With ``as_table=True`` the
+    corpus comes back as a :class:`~src.models.PaperTable` whose rows are
+    lightweight :class:`~src.models.PaperView` objects (see
+    :meth:`ColumnarCorpus.to_table`).
+    """
+
+    corpus = ColumnarCorpus(path, columns)
+    return corpus.to_table() if as_table else corpus
@@ -1,3 +1,8 @@
-from .plots import scatter_embeddings
+from typing import TYPE_CHECKING
 
-__all__ = ["scatter_embeddings"]
+from src._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {"plots": ["scatter_embeddings"]})
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .plots import scatter_embeddings
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from typing import Iterable, Optional
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from src.models import Paper
@@ -17,6 +16,8 @@ def scatter_embeddings(
 ):
     """Create a simple 2D scatter plot for reduced embeddings."""
 
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(6, 4))
     xs, ys = reduced_embeddings[:, 0], reduced_embeddings[:, 1]
     ax.scatter(xs, ys, c="C0", alpha=0.75)
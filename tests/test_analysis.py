@@ -1,5 +1,10 @@
+import tracemalloc
+from pathlib import Path
+
 import numpy as np
 import pytest
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
 
 from src.analysis import nearest_neighbors, similarity_matrix
 from src.models import Paper
@@ -13,6 +18,65 @@ def test_similarity_matrix_returns_square_matrix():
     assert matrix[1, 1] == pytest.approx(1.0)
 
 
+def test_blocked_similarity_matches_sklearn_including_zero_rows():
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((7, 4))
+    data[3] = 0.0
+
+    blocked = similarity_matrix(data, block_size=2)
+    single = similarity_matrix(data, dtype=np.float32, block_size=3)
+
+    assert np.allclose(blocked, cosine_similarity(data))
+    assert single.dtype == np.float32
+    assert np.allclose(single, cosine_similarity(data), atol=1e-6)
+
+
+def test_similarity_matrix_writes_memory_mapped_output(tmp_path: Path):
+    data = np.random.default_rng(1).standard_normal((5, 3))
+    path = tmp_path / "similarity.npy"
+
+    result = similarity_matrix(data, output_path=path, memory_budget=2 * 5 * 8 * 2)
+
+    assert np.allclose(np.load(path), cosine_similarity(data))
+    assert np.allclose(result, cosine_similarity(data))
+    with pytest.raises(ValueError, match="memory_budget"):
+        similarity_matrix(data, memory_budget=5 * 8 * 2)
+
+
+def test_similarity_matrix_top_k_returns_sparse_rows():
+    data = np.random.default_rng(2).standard_normal((6, 3))
+    dense = cosine_similarity(data)
+
+    top = similarity_matrix(data, top_k=2, block_size=4)
+
+    assert sparse.isspmatrix_csr(top)
+    assert np.all(np.diff(top.indptr) == 2)
+    for row in range(6):
+        expected = np.sort(np.argsort(dense[row])[-2:])
+        assert np.array_equal(top.indices[top.indptr[row] : top.indptr[row + 1]], expected)
+        assert np.allclose(top[row].toarray()[0, expected], dense[row, expected])
+    with pytest.raises(ValueError, match="top_k"):
+        similarity_matrix(data, top_k=0, memory_budget=1)
+
+
+def test_similarity_matrix_top_k_stays_within_memory_budget():
+    data = np.random.default_rng(3).standard_normal((2000, 8))
+    # float32 similarities plus int64 selection indices: 12 bytes per entry, 100 rows per tile.
+    budget = 2000 * 12 * 100
+    similarity_matrix(data[:10], dtype=np.float32, top_k=5)
+
+    tracemalloc.start()
+    try:
+        top = similarity_matrix(data, dtype=np.float32, top_k=5, memory_budget=budget)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert top.shape == (2000, 2000)
+    # Allow for the normalised input and the (n, top_k) outputs on top of the tiles.
+    assert peak < budget * 1.25
+
+
 def test_nearest_neighbors_returns_neighbors():
     papers = [
         Paper(title="A", abstract="alpha", references=[]),
@@ -24,3 +88,29 @@ def test_nearest_neighbors_returns_neighbors():
     assert len(neighbors) == 3
     # Paper C should be closest to A given the embedding
     assert neighbors[2][1][0].title == "A"
+
+
+def test_nearest_neighbors_accepts_prebuilt_index():
+    from src.analysis import IVFIndex
+
+    papers = [Paper(title=t, abstract="", references=[]) for t in "ABC"]
+    data = np.array([[1.0, 0.0], [0.0, 5.0], [1.0, 0.1]])
+    index = IVFIndex(n_lists=2, n_probe=2)
+    index.add(data)
+
+    neighbors = nearest_neighbors(data, papers, n_neighbors=1, index=index)
+    assert neighbors[2][1][0].title == "A"
+
+
+def test_nearest_neighbors_returns_index_arrays_for_query_subset():
+    papers = [Paper(title=t, abstract="", references=[]) for t in "ABCD"]
+    data = np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 0.1], [0.1, 1.0]])
+
+    result = nearest_neighbors(data, papers, n_neighbors=2, query_indices=[3, 0])
+
+    assert result.indices.shape == result.distances.shape == (2, 2)
+    assert result.indices[:, 0].tolist() == [1, 2]
+    assert np.all(result.indices != result.query_indices[:, None])
+    assert np.all(np.diff(result.distances, axis=1) >= 0)
+    assert result[0][0].title == "D"
+    assert [p.title for p in result.neighbors(1)] == ["C", "D"]
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.analysis import bootstrap_inheritance, solve_inheritance
+
+
+def _problem():
+    rng = np.random.default_rng(4)
+    parents = rng.standard_normal((20, 4))
+    target = parents @ np.array([0.7, 0.3, 0.0, 0.0]) + 0.01 * rng.standard_normal(20)
+    return target, parents
+
+
+def test_bootstrap_intervals_bracket_point_estimate():
+    target, parents = _problem()
+
+    result = bootstrap_inheritance(target, parents, n_resamples=200, random_state=0)
+
+    assert result.samples.shape == (200, 4)
+    assert np.all(result.lower <= result.point.weights + 1e-9)
+    assert np.all(result.point.weights <= result.upper + 1e-9)
+    assert np.allclose(result.samples.sum(axis=1), 1.0)
+    assert np.all((result.inclusion > 0.0) & (result.inclusion < 1.0))
+    # The dominant parent stays clearly non-zero whenever it is drawn.
+    assert result.upper[0] > result.upper[3]
+
+
+def test_bootstrap_resamples_match_standalone_fits():
+    target, parents = _problem()
+
+    result = bootstrap_inheritance(target, parents, n_resamples=5, random_state=1, method="active_set")
+
+    for sample in result.samples:
+        subset = np.flatnonzero(sample)
+        refit = solve_inheritance(target, parents[:, subset], method="active_set")
+        assert np.allclose(sample[subset], refit.weights, atol=1e-8)
+
+
+def test_bootstrap_is_reproducible_and_validates_confidence():
+    target, parents = _problem()
+
+    first = bootstrap_inheritance(target, parents, n_resamples=20, random_state=3)
+    second = bootstrap_inheritance(target, parents, n_resamples=20, random_state=3)
+
+    assert np.array_equal(first.samples, second.samples)
+    with pytest.raises(ValueError):
+        bootstrap_inheritance(target, parents, confidence=1.5)
@@ -0,0 +1,64 @@
+import numpy as np
+
+from src.analysis import build_citation_graph, solve_inheritance, solve_inheritance_parallel
+from src.models import Paper, PaperTable
+
+
+def _corpus():
+    return [
+        Paper("Root", "", [], identifier="p0", published="2019-01-01T00:00:00Z"),
+        Paper("Branch", "", ["p0", "p0", "unknown"], identifier="p1", published="2020-01-01T00:00:00Z"),
+        Paper("Leaf", "", ["p1", "  ROOT ", "p3"], identifier="p2", published="2021-01-01T00:00:00Z"),
+        Paper("Late", "", ["p2", "p3"], identifier="p3", published="2022-01-01T00:00:00Z"),
+        Paper("Undated", "", ["p3"], identifier="p4"),
+    ]
+
+
+def test_graph_resolves_references_and_drops_forward_edges():
+    graph = build_citation_graph(_corpus())
+
+    assert len(graph) == 5
+    assert graph.parents(1).tolist() == [0]
+    assert graph.parents(2).tolist() == [0, 1]
+    assert graph.parents(3).tolist() == [2]
+    assert graph.parents(4).tolist() == [3]
+    assert graph.dropped.tolist() == [[2, 3]]
+    assert graph.unresolved == 1
+    assert graph.order.tolist() == [0, 1, 2, 3, 4]
+    assert graph.generation.tolist() == [0, 1, 2, 3, 4]
+    assert graph.eligible(min_parents=2).tolist() == [2]
+
+    assert build_citation_graph(PaperTable.from_papers(_corpus())).indices.tolist() == graph.indices.tolist()
+
+
+def test_graph_breaks_cycles_among_undated_papers():
+    # A <-> B is a cycle; C cites A and X sits between the A/B and D/E cycles.
+    papers = [
+        Paper("A", "", ["B"]),
+        Paper("B", "", ["A"]),
+        Paper("C", "", ["A"]),
+        Paper("X", "", ["B"]),
+        Paper("D", "", ["E", "X"]),
+        Paper("E", "", ["D"], published="2020-01-01T00:00:00Z"),
+    ]
+    graph = build_citation_graph(papers)
+
+    assert graph.dropped.tolist() == [[0, 1], [5, 4]]
+    assert graph.parents(2).tolist() == [0]
+    assert graph.parents(3).tolist() == [1]
+    assert graph.parents(4).tolist() == [3, 5]
+    assert graph.order.tolist() == [0, 5, 1, 2, 3, 4]
+
+
+def test_graph_feeds_inheritance_solvers():
+    graph = build_citation_graph(_corpus())
+    embeddings = np.random.default_rng(0).standard_normal((5, 4))
+    focal = graph.eligible()
+
+    matrices = graph.gather_parents(embeddings, focal)
+    for index, matrix in zip(focal, matrices):
+        np.testing.assert_array_equal(matrix, embeddings[graph.parents(index)].T)
+
+    results = dict(solve_inheritance_parallel(embeddings, graph, focal, n_workers=1, method="fista"))
+    expected = solve_inheritance(embeddings[2], matrices[1], method="fista")
+    np.testing.assert_array_equal(results[2].weights, expected.weights)
@@ -1,7 +1,15 @@
+import tracemalloc
+
 import numpy as np
 import pytest
 
-from src.dimension_reduction import reduce_dimensions
+from src.dimension_reduction import (
+    FittedReducer,
+    LandmarkReducer,
+    LinearReducer,
+    fit_reducer,
+    reduce_dimensions,
+)
 
 
 def test_reduce_dimensions_with_pca():
@@ -14,3 +22,94 @@ def test_reduce_dimensions_invalid_method():
     data = np.eye(3)
     with pytest.raises(ValueError):
         reduce_dimensions(data, method="unknown")
+
+
+def _low_rank_embeddings(num=400, dim=20, seed=0):
+    rng = np.random.default_rng(seed)
+    signal = rng.standard_normal((num, 3)) @ rng.standard_normal((3, dim)) * 3.0
+    return signal + 0.01 * rng.standard_normal((num, dim))
+
+
+@pytest.mark.parametrize("method", ["randomized_pca", "incremental_pca"])
+def test_streamed_pca_matches_exact_pca_on_memmap(tmp_path, method):
+    data = _low_rank_embeddings()
+    path = tmp_path / "embeddings.npy"
+    np.save(path, data)
+    mapped = np.load(path, mmap_mode="r")
+
+    exact = fit_reducer(data, "pca", n_components=3)
+    streamed = fit_reducer(mapped, method, n_components=3, chunk_size=64)
+
+    # Same subspace, up to the sign of each axis.
+    alignment = np.abs(np.sum(exact.components * streamed.components, axis=1))
+    np.testing.assert_allclose(alignment, 1.0, atol=1e-6)
+    reduced = reduce_dimensions(mapped, method=method, n_components=3, chunk_size=64)
+    np.testing.assert_allclose(np.abs(reduced), np.abs(exact.transform(data)), atol=1e-6)
+
+
+def test_fitted_reducer_round_trips_and_projects_new_points(tmp_path):
+    data = _low_rank_embeddings()
+    reducer = fit_reducer(data[:300], "randomized_pca", n_components=2, chunk_size=50)
+    reducer.save(tmp_path / "reducer.npz")
+
+    loaded = FittedReducer.load(tmp_path / "reducer.npz")
+    assert isinstance(loaded, LinearReducer)
+    np.testing.assert_array_equal(loaded.transform(data[300:]), reducer.transform(data[300:]))
+
+
+def test_incomplete_reducer_subclass_cannot_be_created():
+    class Unfinished(FittedReducer):
+        @property
+        def n_components(self):
+            return 2
+
+    with pytest.raises(TypeError):
+        Unfinished()
+
+
+def test_landmark_tsne_places_remaining_points(tmp_path):
+    rng = np.random.default_rng(1)
+    centres = rng.standard_normal((3, 8)) * 10
+    data = np.repeat(centres, 40, axis=0) + rng.standard_normal((120, 8)) * 0.1
+
+    reducer = fit_reducer(data, "tsne", n_landmarks=45, n_neighbors=5)
+    assert isinstance(reducer, LandmarkReducer)
+    reduced = reduce_dimensions(data, method="tsne", n_landmarks=45)
+    assert reduced.shape == (120, 2)
+
+    # Landmarks keep their fitted coordinates; other points land inside their cluster.
+    placed = reducer.transform(reducer.landmarks)
+    np.testing.assert_allclose(placed, reducer.coordinates, atol=1e-9)
+    mapped = reducer.transform(data)
+    labels = np.repeat(np.arange(3), 40)
+    spread = max(
+        np.linalg.norm(mapped[labels == c] - mapped[labels == c].mean(axis=0), axis=1).max() for c in range(3)
+    )
+    gaps = min(
+        np.linalg.norm(mapped[labels == a].mean(axis=0) - mapped[labels == b].mean(axis=0))
+        for a, b in [(0, 1), (0, 2), (1, 2)]
+    )
+    assert spread < gaps
+
+    reducer.save(tmp_path / "tsne.npz")
+    np.testing.assert_array_equal(FittedReducer.load(tmp_path / "tsne.npz").transform(data), mapped)
+
+
+def test_landmark_transform_is_bounded_by_memory_budget():
+    rng = np.random.default_rng(2)
+    landmarks, coordinates = rng.standard_normal((500, 4)), rng.standard_normal((500, 2))
+    data = rng.standard_normal((4000, 4))
+    budget = 16 * 500 * 50  # 50 rows of distances and selection indices per block
+    bounded = LandmarkReducer(landmarks, coordinates, 5, memory_budget=budget)
+    bounded.transform(data[:10])
+
+    tracemalloc.start()
+    try:
+        placed = bounded.transform(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Budget plus the float64 copy of the chunk and the (n, 2) output.
+    assert peak < budget + 3 * data.nbytes
+    np.testing.assert_allclose(placed, LandmarkReducer(landmarks, coordinates, 5).transform(data), atol=1e-12)
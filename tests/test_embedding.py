@@ -42,3 +42,91 @@ def test_embed_papers_creates_sci_bert_embeddings():
     assert matrix.shape == (2, 12)
     assert model_name == "dummy"
     assert np.allclose(matrix[0], matrix[1]) is False
+
+
+class WordTokenizer:
+    """Maps each word to an id so sequence length varies with the text."""
+
+    def __init__(self):
+        self.padded_lengths = []
+
+    def __call__(self, texts, padding=True, truncation=True, max_length=512, return_tensors=None):
+        ids = [[len(word) + 1 for word in text.split()][:max_length] for text in texts]
+        if not padding:
+            return {"input_ids": ids}
+        width = max(len(row) for row in ids)
+        self.padded_lengths.append(width)
+        input_ids = torch.zeros((len(ids), width), dtype=torch.long)
+        attention_mask = torch.zeros((len(ids), width), dtype=torch.long)
+        for row, values in enumerate(ids):
+            input_ids[row, : len(values)] = torch.tensor(values)
+            attention_mask[row, : len(values)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+class TokenValueModel(torch.nn.Module):
+    def __init__(self, hidden_size: int = 3):
+        super().__init__()
+        self.config = type("Config", (), {"hidden_size": hidden_size, "name_or_path": "token-value"})
+        self.scale = torch.arange(1, hidden_size + 1, dtype=torch.float32)
+
+    def forward(self, input_ids=None, attention_mask=None):
+        hidden = input_ids.float().unsqueeze(-1) * self.scale
+        return type("Output", (), {"last_hidden_state": hidden})
+
+
+def _varied_papers():
+    return [
+        Paper(title="Long", abstract="a much longer abstract with many words in it", references=[]),
+        Paper(title="Short", abstract="tiny", references=[]),
+        Paper(title="Medium", abstract="some moderate text here", references=[]),
+        Paper(title="Mini", abstract="x", references=[]),
+    ]
+
+
+def test_embed_papers_batches_preserve_input_order():
+    papers = _varied_papers()
+    model = TokenValueModel()
+
+    single, _ = embed_papers(papers, tokenizer=WordTokenizer(), model=model, batch_size=len(papers))
+    batched, _ = embed_papers(papers, tokenizer=WordTokenizer(), model=model, batch_size=1)
+
+    assert np.allclose(single, batched)
+    assert not np.allclose(batched[0], batched[1])
+
+
+def test_embed_papers_pads_each_bucket_to_its_own_length():
+    tokenizer = WordTokenizer()
+    embed_papers(_varied_papers(), tokenizer=tokenizer, model=TokenValueModel(), batch_size=2)
+
+    # Sorted by length the two short texts share a batch, so it pads to 2 tokens, not 10.
+    assert tokenizer.padded_lengths == [2, 10]
+
+
+def test_length_pass_tokenizes_in_bounded_chunks(monkeypatch):
+    import src.embedding.basic as basic
+
+    class CountingTokenizer(WordTokenizer):
+        def __init__(self):
+            super().__init__()
+            self.unpadded_sizes = []
+
+        def __call__(self, texts, padding=True, **options):
+            if not padding:
+                self.unpadded_sizes.append(len(texts))
+            return super().__call__(texts, padding=padding, **options)
+
+    monkeypatch.setattr(basic, "LENGTH_CHUNK_SIZE", 3)
+    papers = _varied_papers() * 2
+    tokenizer = CountingTokenizer()
+    chunked, _ = embed_papers(papers, tokenizer=tokenizer, model=TokenValueModel(), batch_size=2)
+    monkeypatch.setattr(basic, "LENGTH_CHUNK_SIZE", 1_024)
+    whole, _ = embed_papers(papers, tokenizer=WordTokenizer(), model=TokenValueModel(), batch_size=2)
+
+    assert tokenizer.unpadded_sizes == [3, 3, 2]
+    np.testing.assert_array_equal(chunked, whole)
+
+
+def test_embed_papers_handles_empty_corpus():
+    matrix, _ = embed_papers([], tokenizer=WordTokenizer(), model=TokenValueModel(hidden_size=5))
+    assert matrix.shape == (0, 5)
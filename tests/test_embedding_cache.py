@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.embedding import EmbeddingCache, embed_papers
+from src.embedding.cache import embedding_cache_key
+from src.models import Paper
+from test_embedding import TokenValueModel, WordTokenizer
+
+
+class CountingModel(TokenValueModel):
+    def __init__(self):
+        super().__init__()
+        self.rows_seen = 0
+
+    def forward(self, input_ids=None, attention_mask=None):
+        self.rows_seen += input_ids.shape[0]
+        return super().forward(input_ids=input_ids, attention_mask=attention_mask)
+
+
+def _papers(count):
+    return [Paper(title=f"Paper {i}", abstract="word " * (i + 1), references=[]) for i in range(count)]
+
+
+def test_cache_key_depends_on_model_and_max_length():
+    base = embedding_cache_key("text", "scibert", 512)
+    assert base == embedding_cache_key("text", "scibert", 512)
+    assert base != embedding_cache_key("text", "other", 512)
+    assert base != embedding_cache_key("text", "scibert", 256)
+
+
+def test_embed_papers_only_runs_model_on_cache_misses(tmp_path: Path):
+    cache = EmbeddingCache(tmp_path / "cache")
+    model = CountingModel()
+
+    first, _ = embed_papers(_papers(4), tokenizer=WordTokenizer(), model=model, cache=cache)
+    assert model.rows_seen == 4
+
+    grown = _papers(5)
+    second, _ = embed_papers(grown, tokenizer=WordTokenizer(), model=model, cache=EmbeddingCache(tmp_path / "cache"))
+    assert model.rows_seen == 5
+    assert np.allclose(second[:4], first)
+
+    uncached, _ = embed_papers(grown, tokenizer=WordTokenizer(), model=TokenValueModel())
+    assert np.allclose(second, uncached)
+
+
+def test_cache_rejects_mismatched_dimension(tmp_path: Path):
+    cache = EmbeddingCache(tmp_path)
+    cache.put(["a"], np.zeros((1, 3)))
+    with pytest.raises(ValueError):
+        cache.put(["b"], np.zeros((1, 4)))
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import torch
+
+from src.embedding import CPUInferenceProfile, embed_papers, measure_profile_drift
+from src.embedding.cache import EmbeddingCache
+from src.embedding.cpu import quantize_linear_layers
+from test_embedding import WordTokenizer, _varied_papers
+
+
+class LinearModel(torch.nn.Module):
+    def __init__(self, hidden_size: int = 16):
+        super().__init__()
+        self.config = type("Config", (), {"hidden_size": hidden_size, "name_or_path": "linear"})
+        torch.manual_seed(0)
+        self.embed = torch.nn.Embedding(32, hidden_size)
+        self.project = torch.nn.Linear(hidden_size, hidden_size)
+        self.calls_in_inference_mode = []
+
+    def forward(self, input_ids=None, attention_mask=None):
+        self.calls_in_inference_mode.append(torch.is_inference_mode_enabled())
+        hidden = self.project(self.embed(input_ids))
+        return type("Output", (), {"last_hidden_state": hidden})
+
+
+def test_profile_quantizes_linear_layers_and_uses_inference_mode():
+    model = LinearModel()
+    quantized = quantize_linear_layers(model)
+
+    assert quantized is quantize_linear_layers(model)
+    assert type(quantized.project).__name__ == "Linear" and type(model.project) is torch.nn.Linear
+    assert "quantized" in type(quantized.project).__module__
+
+    embeddings, name = embed_papers(
+        _varied_papers(), tokenizer=WordTokenizer(), model=model, profile=CPUInferenceProfile()
+    )
+    assert embeddings.shape == (4, 16)
+    assert name == "linear"
+    assert model.calls_in_inference_mode == []
+    assert quantized.calls_in_inference_mode and all(quantized.calls_in_inference_mode)
+
+
+def test_profile_pins_intra_op_threads():
+    previous = torch.get_num_threads()
+    try:
+        CPUInferenceProfile(quantize=False, intra_op_threads=1).configure_threads()
+        assert torch.get_num_threads() == 1
+    finally:
+        torch.set_num_threads(previous)
+
+
+def test_drift_report_compares_against_fp32():
+    report = measure_profile_drift(_varied_papers(), tokenizer=WordTokenizer(), model=LinearModel())
+
+    assert report.num_papers == 4
+    assert 0.99 < report.mean_cosine <= 1.0 + 1e-6
+    assert report.min_cosine <= report.mean_cosine
+    assert report.speedup > 0
+
+    exact = measure_profile_drift(
+        _varied_papers(), CPUInferenceProfile(quantize=False), tokenizer=WordTokenizer(), model=LinearModel()
+    )
+    assert np.isclose(exact.min_cosine, 1.0)
+    with pytest.raises(ValueError):
+        measure_profile_drift(_varied_papers(), model=LinearModel())
+
+
+def test_quantized_embeddings_are_cached_separately(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache")
+    model = LinearModel()
+    fp32, _ = embed_papers(_varied_papers(), tokenizer=WordTokenizer(), model=model, cache=cache)
+    int8, _ = embed_papers(
+        _varied_papers(), tokenizer=WordTokenizer(), model=model, cache=cache, profile=CPUInferenceProfile()
+    )
+
+    assert not np.array_equal(fp32, int8)
+    assert np.allclose(fp32, int8, atol=0.1)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.embedding import embed_papers, embed_stream
+from test_embedding import TokenValueModel, WordTokenizer, _varied_papers
+
+
+def _papers(count):
+    base = _varied_papers()
+    return [base[i % len(base)] for i in range(count)]
+
+
+def test_embed_stream_matches_embed_papers_for_a_generator():
+    papers = _papers(11)
+    expected, _ = embed_papers(papers, tokenizer=WordTokenizer(), model=TokenValueModel())
+
+    streamed, name = embed_stream(
+        (paper for paper in papers),
+        tokenizer=WordTokenizer(),
+        model=TokenValueModel(),
+        batch_size=2,
+        window_batches=2,
+        queue_size=1,
+    )
+
+    assert name == "token-value"
+    assert streamed.shape == expected.shape
+    assert np.allclose(streamed, expected)
+
+
+def test_embed_stream_writes_into_memmap(tmp_path):
+    papers = _papers(6)
+    path = tmp_path / "embeddings.npy"
+
+    result, _ = embed_stream(papers, tokenizer=WordTokenizer(), model=TokenValueModel(), batch_size=4, output_path=path)
+
+    assert isinstance(result, np.memmap)
+    assert np.allclose(np.load(path), embed_papers(papers, tokenizer=WordTokenizer(), model=TokenValueModel())[0])
+
+    output = np.zeros((3, 3), dtype=np.float32)
+    with pytest.raises(ValueError):
+        embed_stream(iter(papers), tokenizer=WordTokenizer(), model=TokenValueModel(), output=output)
+
+
+def test_embed_stream_propagates_producer_errors():
+    def broken():
+        yield from _papers(3)
+        raise RuntimeError("scraper failed")
+
+    with pytest.raises(RuntimeError, match="scraper failed"):
+        embed_stream(broken(), tokenizer=WordTokenizer(), model=TokenValueModel(), batch_size=1)
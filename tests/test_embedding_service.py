@@ -0,0 +1,92 @@
+import asyncio
+import contextlib
+import threading
+
+import numpy as np
+import pytest
+
+from src.embedding import CPUInferenceProfile, EmbeddingClient, EmbeddingService, embed_papers, run_load_test
+from src.embedding.cache import EmbeddingCache
+from test_embedding import TokenValueModel, WordTokenizer, _varied_papers
+from test_embedding_cpu import LinearModel
+
+
+def test_load_test_micro_batches_concurrent_requests(tmp_path):
+    texts = ["alpha beta", "a much longer query text", "x", "some words here"]
+
+    async def scenario():
+        service = EmbeddingService(WordTokenizer(), TokenValueModel(), batch_window=0.02)
+        address = await service.start(str(tmp_path / "service.sock"))
+        try:
+            direct = await service.embed(texts)
+            report = await run_load_test(address, texts, clients=8, requests_per_client=5)
+        finally:
+            await service.close()
+        return direct, report
+
+    direct, report = asyncio.run(scenario())
+
+    assert direct.shape == (4, 3)
+    assert report.requests == 40
+    assert report.server.requests == 41
+    assert report.server.batches < report.server.requests
+    assert report.server.mean_batch_size > 1
+    assert report.latency_p95 >= report.latency_p50 > 0
+
+
+@contextlib.contextmanager
+def _serving(service):
+    loop = asyncio.new_event_loop()
+    address = loop.run_until_complete(service.start(("127.0.0.1", 0)))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield address
+    finally:
+        asyncio.run_coroutine_threadsafe(service.close(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        loop.close()
+
+
+@pytest.fixture
+def running_service():
+    with _serving(EmbeddingService(WordTokenizer(), TokenValueModel())) as address:
+        yield address
+
+
+def test_embed_papers_uses_service_client(running_service, tmp_path):
+    papers = _varied_papers()
+    expected, _ = embed_papers(papers, tokenizer=WordTokenizer(), model=TokenValueModel())
+
+    with EmbeddingClient(running_service) as client:
+        served, name = embed_papers(papers, client=client, cache=EmbeddingCache(tmp_path / "cache"))
+        cached, _ = embed_papers(papers, client=client, cache=EmbeddingCache(tmp_path / "cache"))
+        stats = client.stats()
+
+        with pytest.raises(ValueError):
+            embed_papers(papers, client=client, tokenizer=WordTokenizer(), model=TokenValueModel())
+
+    assert name == "token-value"
+    assert np.array_equal(served, expected)
+    assert np.array_equal(cached, expected)
+    assert stats.requests == 1 and stats.texts == len(papers)
+
+
+def test_quantized_service_vectors_do_not_share_fp32_cache_keys(tmp_path):
+    papers = _varied_papers()
+    fp32, _ = embed_papers(papers, tokenizer=WordTokenizer(), model=LinearModel())
+    service = EmbeddingService(WordTokenizer(), LinearModel(), profile=CPUInferenceProfile())
+
+    with _serving(service) as address, EmbeddingClient(address) as client:
+        assert client.info()["quantized"] is True
+        assert client.cache_name == "linear+int8"
+        int8, name = embed_papers(papers, client=client, cache=EmbeddingCache(tmp_path / "cache"))
+
+    local, _ = embed_papers(
+        papers, tokenizer=WordTokenizer(), model=LinearModel(), cache=EmbeddingCache(tmp_path / "cache")
+    )
+
+    assert name == "linear"
+    assert not np.array_equal(int8, fp32)
+    assert np.array_equal(local, fp32)
@@ -0,0 +1,89 @@
+import functools
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.embedding import embed_papers, embed_papers_sharded
+from test_embedding import WordTokenizer, _varied_papers
+from test_embedding_cpu import LinearModel
+
+
+def _papers(count):
+    base = _varied_papers()
+    return [base[i % len(base)] for i in range(count)]
+
+
+def _load():
+    return WordTokenizer(), LinearModel()
+
+
+class CrashOnceModel(LinearModel):
+    def __init__(self, marker):
+        super().__init__()
+        self.marker = marker
+
+    def forward(self, input_ids=None, attention_mask=None):
+        if not os.path.exists(self.marker):
+            open(self.marker, "w").close()
+            os._exit(1)
+        return super().forward(input_ids, attention_mask)
+
+
+def _load_crashing(marker):
+    return WordTokenizer(), CrashOnceModel(marker)
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_sharded_matches_single_process_bit_for_bit(n_workers):
+    papers = _papers(13)
+    expected, name = embed_papers(papers, tokenizer=WordTokenizer(), model=LinearModel(), batch_size=2)
+
+    sharded, sharded_name = embed_papers_sharded(
+        papers, n_workers=n_workers, loader=_load, batch_size=2, shard_batches=2
+    )
+
+    assert sharded_name == name
+    assert sharded.dtype == np.float32
+    assert np.array_equal(sharded, expected)
+
+
+def test_sharded_requeues_shards_of_a_crashed_worker(tmp_path):
+    papers = _papers(9)
+    expected, _ = embed_papers(papers, tokenizer=WordTokenizer(), model=LinearModel(), batch_size=3)
+    path = tmp_path / "embeddings.npy"
+
+    sharded, _ = embed_papers_sharded(
+        papers,
+        n_workers=2,
+        loader=functools.partial(_load_crashing, str(tmp_path / "crashed")),
+        batch_size=3,
+        shard_batches=1,
+        output_path=path,
+    )
+
+    assert (tmp_path / "crashed").exists()
+    assert isinstance(sharded, np.memmap)
+    assert np.array_equal(np.load(path), expected)
+
+
+def test_spawned_workers_release_shared_output_cleanly():
+    tests = Path(__file__).resolve().parent
+    script = (
+        "import numpy as np\n"
+        "from src.embedding import embed_papers_sharded\n"
+        "from test_embedding_sharded import _load, _papers\n"
+        "embeddings, _ = embed_papers_sharded(_papers(9), n_workers=2, loader=_load, batch_size=2, mp_context='spawn')\n"
+        "assert embeddings.shape == (9, 16)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(tests.parent), str(tests)])}
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=tests.parent, env=env, capture_output=True, text=True, timeout=300
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    assert "KeyError" not in completed.stderr
+    assert "leaked" not in completed.stderr
@@ -0,0 +1,217 @@
+import re
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from src.data import build_manifest, load_harvest_state
+from src.scraping import TokenBucket, harvest_arxiv, harvest_incremental
+
+
+def validate_manifest_source(source):
+    paper = {
+        "paper_id": "arxiv:2401.00001",
+        "arxiv_id": "2401.00001",
+        "citation_extraction_confidence": 1.0,
+        "missingness_flags": {"citations_missing": True, "references_missing": True},
+    }
+    return build_manifest(sources=[source], papers=[paper], retrieval_timestamp="2024-02-01T00:00:00+00:00")
+
+
+def _feed(start, count):
+    entries = "".join(
+        f"<entry><title>Paper {i}</title><summary>Abstract {i}.</summary></entry>"
+        for i in range(start, start + count)
+    )
+    return f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+
+
+@contextmanager
+def arxiv_stand_in(total, fail_first=()):
+    """Serve ``total`` synthetic entries; each ``start`` in ``fail_first`` gets one 503 first."""
+
+    requests_seen = []
+    failures = set(fail_first)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = parse_qs(urlparse(self.path).query)
+            start = int(params["start"][0])
+            size = int(params["max_results"][0])
+            with lock:
+                requests_seen.append(start)
+                fail = start in failures
+                failures.discard(start)
+            if fail:
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+            body = _feed(start, max(0, min(size, total - start))).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/atom+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/api/query", requests_seen
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_harvest_pages_through_all_results_in_order():
+    with arxiv_stand_in(total=23, fail_first={10}) as (url, seen):
+        papers = list(harvest_arxiv("all:test", page_size=5, max_workers=3, rate=1000, burst=5, backoff=0, base_url=url))
+
+    assert [p.title for p in papers] == [f"Paper {i}" for i in range(23)]
+    assert seen.count(10) == 2  # retried after the 503
+
+
+def test_harvest_respects_max_results():
+    with arxiv_stand_in(total=100) as (url, seen):
+        papers = list(harvest_arxiv("all:test", max_results=12, page_size=5, rate=1000, burst=5, base_url=url))
+
+    assert len(papers) == 12
+    assert sorted(seen) == [0, 5, 10]
+
+
+def test_harvest_gives_up_after_max_retries():
+    with arxiv_stand_in(total=5, fail_first={0}) as (url, _):
+        with pytest.raises(requests.HTTPError):
+            list(harvest_arxiv("all:test", page_size=5, rate=1000, max_retries=0, base_url=url))
+
+
+def test_token_bucket_spaces_requests_by_rate():
+    now = [0.0]
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=0.5, capacity=1, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        bucket.acquire()
+
+    assert waits == [pytest.approx(2.0), pytest.approx(2.0)]
+
+
+@contextmanager
+def dated_arxiv_stand_in(entries):
+    """Serve ``entries`` (identifier -> updated ISO timestamp) honouring lastUpdatedDate windows."""
+
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = parse_qs(urlparse(self.path).query)
+            seen.append({"params": params, "if_modified_since": self.headers.get("If-Modified-Since")})
+            low, high = re.search(r"lastUpdatedDate:\[(\d{12}) TO (\d{12})\]", params["search_query"][0]).groups()
+            start = int(params["start"][0])
+            size = int(params["max_results"][0])
+            matching = sorted(
+                (updated, identifier)
+                for identifier, updated in entries.items()
+                if low <= re.sub(r"\D", "", updated)[:12] <= high
+            )
+            body = "".join(
+                f"<entry><id>http://arxiv.org/abs/{identifier}v1</id><updated>{updated}</updated>"
+                f"<title>{identifier}</title><summary>s</summary></entry>"
+                for updated, identifier in matching[start : start + size]
+            )
+            payload = f'<feed xmlns="http://www.w3.org/2005/Atom">{body}</feed>'.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/api/query", seen
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_incremental_harvest_fetches_only_new_or_changed_entries(tmp_path):
+    corpus = tmp_path / "corpus.json"
+    entries = {f"2401.0000{i}": f"2024-01-0{i + 1}T00:00:00Z" for i in range(5)}
+    options = dict(page_size=2, rate=1000, burst=5, max_workers=1)
+
+    with dated_arxiv_stand_in(entries) as (url, seen):
+        first = list(harvest_incremental("cat:cs.LG", corpus, now="2024-02-01T00:00:00+00:00", base_url=url, **options))
+        assert [p.identifier for p in first] == sorted(entries)
+
+        cursor = load_harvest_state(corpus)["cat:cs.LG"]
+        assert cursor.complete and cursor.window_end == "2024-02-01T00:00:00+00:00"
+        assert validate_manifest_source(cursor.to_source())
+
+        entries["2401.00009"] = "2024-02-03T00:00:00Z"
+        entries["2401.00002"] = "2024-02-04T00:00:00Z"
+        second = list(
+            harvest_incremental(
+                "cat:cs.LG", corpus, existing=first, now="2024-03-01T00:00:00+00:00", base_url=url, **options
+            )
+        )
+
+    assert [p.identifier for p in second] == ["2401.00009", "2401.00002"]
+    assert "lastUpdatedDate:[202402010000 TO 202403010000]" in seen[-1]["params"]["search_query"][0]
+    assert seen[-1]["if_modified_since"] == "Thu, 01 Feb 2024 00:00:00 GMT"
+
+
+def test_incremental_harvest_resumes_from_checkpointed_offset(tmp_path):
+    corpus = tmp_path / "corpus.json"
+    entries = {f"2401.0000{i}": f"2024-01-0{i + 1}T00:00:00Z" for i in range(5)}
+    options = dict(now="2024-02-01T00:00:00+00:00", page_size=2, rate=1000, burst=5, max_workers=1)
+
+    with dated_arxiv_stand_in(entries) as (url, seen):
+        stream = harvest_incremental("q", corpus, base_url=url, **options)
+        taken = [next(stream) for _ in range(3)]
+        stream.close()  # interrupted mid-way through the second page
+
+        cursor = load_harvest_state(corpus)["q"]
+        assert not cursor.complete and cursor.offset == 3
+
+        rest = list(harvest_incremental("q", corpus, base_url=url, **options))
+
+    assert seen[-1]["params"]["start"] != ["0"]
+    assert [p.identifier for p in taken + rest] == sorted(entries)
+
+
+def test_incremental_harvest_stopped_by_max_results_resumes_its_window(tmp_path):
+    corpus = tmp_path / "corpus.json"
+    entries = {f"2401.0000{i}": f"2024-01-0{i + 1}T00:00:00Z" for i in range(5)}
+    options = dict(page_size=2, rate=1000, burst=5, max_workers=1)
+
+    with dated_arxiv_stand_in(entries) as (url, seen):
+        first = list(
+            harvest_incremental("q", corpus, now="2024-02-01T00:00:00+00:00", base_url=url, max_results=3, **options)
+        )
+        cursor = load_harvest_state(corpus)["q"]
+        assert len(first) == 3
+        assert not cursor.complete and cursor.offset == 3
+        resumed_at = len(seen)
+
+        rest = list(harvest_incremental("q", corpus, now="2024-03-01T00:00:00+00:00", base_url=url, **options))
+        cursor = load_harvest_state(corpus)["q"]
+
+    assert [p.identifier for p in first + rest] == sorted(entries)
+    assert seen[resumed_at]["params"]["start"] == ["3"]
+    assert all("TO 202402010000]" in request["params"]["search_query"][0] for request in seen)
+    assert cursor.complete and cursor.offset == 0 and cursor.window_end == "2024-02-01T00:00:00+00:00"
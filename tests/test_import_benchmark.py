@@ -0,0 +1,42 @@
+import pytest
+
+from src.import_benchmark import ImportTiming, find_regressions, measure_import, record_import_times
+
+
+@pytest.mark.parametrize(
+    "module, statement",
+    [
+        ("src.storage", None),
+        ("src.analysis", "from src.analysis import solve_inheritance, build_citation_graph"),
+        ("src.embedding", "from src.embedding import EmbeddingCache, embed_papers"),
+        ("src.dimension_reduction", "from src.dimension_reduction import reduce_dimensions"),
+        ("src.visualisation", "from src.visualisation import scatter_embeddings"),
+        ("src.scraping", "from src.scraping import parse_arxiv_feed, harvest_arxiv"),
+    ],
+)
+def test_light_imports_do_not_load_heavy_dependencies(module, statement):
+    timing = measure_import(module, repeats=1, statement=statement)
+
+    assert timing.heavy_modules == ()
+
+
+def test_lazy_exports_resolve_on_access():
+    import src.analysis
+
+    assert "LineageEngine" in dir(src.analysis)
+    assert src.analysis.LineageEngine.__module__ == "src.analysis.lineage"
+    with pytest.raises(AttributeError):
+        src.analysis.not_a_real_export
+
+
+def test_find_regressions_flags_slow_and_heavier_imports(tmp_path):
+    baseline = record_import_times(
+        tmp_path / "baseline.json",
+        [ImportTiming("src.storage", 0.10, ()), ImportTiming("src.analysis", 0.20, ())],
+    )
+
+    current = [ImportTiming("src.storage", 0.40, ()), ImportTiming("src.analysis", 0.21, ("torch",))]
+    problems = find_regressions(current, baseline)
+
+    assert problems == ["src.storage: 0.400s exceeds 0.200s", "src.analysis: now imports torch"]
+    assert find_regressions([ImportTiming("src.storage", 0.12, ())], baseline) == []
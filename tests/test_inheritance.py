@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from src.analysis import solve_inheritance
+from src.analysis import solve_inheritance, solve_inheritance_batch
 
 
 def test_collinear_parents_prefers_stable_simplex_solution():
@@ -60,3 +60,196 @@ def test_interpretability_checks_weight_sum_and_residual_behavior():
     assert sparse.weights.sum() == pytest.approx(1.0, abs=1e-8)
     assert np.count_nonzero(sparse.weights > 1e-12) == 1
     assert np.linalg.norm(sparse.residual) >= np.linalg.norm(full.residual) - 1e-9
+
+
+def _ragged_problems(seed=0):
+    rng = np.random.default_rng(seed)
+    targets, parent_sets = [], []
+    for num_parents in (3, 0, 2, 3, 5, 2, 1):
+        parents = rng.standard_normal((6, num_parents))
+        weights = rng.dirichlet(np.ones(num_parents)) if num_parents else np.zeros(0)
+        targets.append(parents @ weights + 0.05 * rng.standard_normal(6))
+        parent_sets.append(parents)
+    return targets, parent_sets
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"constraint": "simplex"},
+        {"constraint": "nonnegative"},
+        {"constraint": "simplex", "sparsity": 2, "random_state": 7},
+    ],
+)
+def test_batch_solver_matches_single_paper_solver(options):
+    targets, parent_sets = _ragged_problems()
+
+    batched = solve_inheritance_batch(targets, parent_sets, batch_size=2, **options)
+
+    assert len(batched) == len(targets)
+    for target, parents, result in zip(targets, parent_sets, batched):
+        single = solve_inheritance(target, parents, **options)
+        assert np.allclose(result.weights, single.weights, atol=1e-10)
+        assert np.allclose(result.residual, single.residual, atol=1e-10)
+        assert result.objective == pytest.approx(single.objective, abs=1e-12)
+        assert result.converged == single.converged
+        assert result.iterations == single.iterations
+
+
+def test_batch_solver_rejects_mismatched_inputs():
+    with pytest.raises(ValueError):
+        solve_inheritance_batch([np.ones(2)], [])
+
+
+@pytest.mark.parametrize("constraint", ["simplex", "nonnegative"])
+def test_accelerated_methods_reach_same_objective_in_fewer_iterations(constraint):
+    targets, parent_sets = _ragged_problems(seed=3)
+    target, parents = targets[4], parent_sets[4]
+
+    baseline = solve_inheritance(target, parents, constraint=constraint)
+    fista = solve_inheritance(target, parents, constraint=constraint, method="fista")
+    exact = solve_inheritance(target, parents, constraint=constraint, method="active_set")
+
+    assert baseline.converged and fista.converged and exact.converged
+    assert fista.objective == pytest.approx(baseline.objective, abs=1e-8)
+    assert exact.objective == pytest.approx(baseline.objective, abs=1e-8)
+    assert fista.iterations < baseline.iterations
+    assert exact.iterations < fista.iterations
+    assert exact.solve_time >= 0.0
+
+
+def test_lipschitz_step_handles_ill_conditioned_collinear_parents():
+    rng = np.random.default_rng(1)
+    shared = rng.standard_normal((50, 1))
+    parents = np.hstack([shared + 0.01 * rng.standard_normal((50, 6)), rng.standard_normal((50, 2))])
+    target = parents @ np.array([0.3, 0.2, 0.0, 0.0, 0.1, 0.0, 0.4, 0.0])
+
+    fixed = solve_inheritance(target, parents)
+    fista = solve_inheritance(target, parents, method="fista")
+    exact = solve_inheritance(target, parents, method="active_set")
+
+    assert not fixed.converged
+    assert exact.converged
+    assert fista.objective == pytest.approx(exact.objective, abs=1e-8)
+    assert fista.objective < fixed.objective
+    assert exact.weights.sum() == pytest.approx(1.0)
+
+
+def test_batch_solver_supports_fista():
+    targets, parent_sets = _ragged_problems()
+
+    batched = solve_inheritance_batch(targets, parent_sets, method="fista")
+
+    for target, parents, result in zip(targets, parent_sets, batched):
+        single = solve_inheritance(target, parents, method="fista")
+        assert np.allclose(result.weights, single.weights, atol=1e-10)
+        assert result.iterations == single.iterations
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError, match="method"):
+        solve_inheritance(np.ones(2), np.eye(2), method="newton")
+
+
+def test_compact_results_drop_dense_vectors_but_recompute_them():
+    rng = np.random.default_rng(4)
+    parents = rng.standard_normal((16, 6))
+    target = parents[:, :2] @ np.array([0.3, 0.2])
+
+    full = solve_inheritance(target, parents, constraint="nonnegative", method="active_set")
+    compact = solve_inheritance(target, parents, constraint="nonnegative", method="active_set", compact=True)
+
+    assert compact.support.size == np.count_nonzero(full.weights) < parents.shape[1]
+    assert compact.objective == full.objective
+    assert compact.contribution == pytest.approx(full.contribution) == pytest.approx(0.5, abs=1e-3)
+    np.testing.assert_array_equal(compact.dense_weights(), full.weights)
+    np.testing.assert_allclose(compact.residual(target, parents), full.residual)
+
+    batch = solve_inheritance_batch([target, target], [parents, parents[:, :0]], compact=True)
+    assert batch[0].num_parents == 6 and batch[1].num_parents == 0
+
+
+def test_warm_start_converges_faster_to_the_same_solution():
+    rng = np.random.default_rng(5)
+    parents = rng.standard_normal((20, 8))
+    target = rng.standard_normal(20)
+    options = dict(method="fista", tolerance=1e-12)
+
+    cold = solve_inheritance(target, parents, **options)
+    warm = solve_inheritance(target, parents, initial_weights=cold.weights, **options)
+    assert warm.iterations < cold.iterations
+    np.testing.assert_allclose(warm.weights, cold.weights, atol=1e-8)
+
+    batch = solve_inheritance_batch([target, target], [parents, parents], initial_weights=[cold.weights, None], **options)
+    assert batch[0].iterations == warm.iterations
+    assert batch[1].iterations == cold.iterations
+    with pytest.raises(ValueError):
+        solve_inheritance(target, parents, initial_weights=np.ones(3))
+
+
+def _sorted_simplex_projection(vector):
+    ordered = np.sort(vector)[::-1]
+    cumulative = np.cumsum(ordered)
+    rho = np.nonzero(ordered + (1.0 - cumulative) / np.arange(1, vector.size + 1) > 0)[0][-1]
+    return np.maximum(vector - (cumulative[rho] - 1.0) / (rho + 1), 0.0)
+
+
+def _truncated_simplex_projection(vector, k):
+    projected = _sorted_simplex_projection(vector)
+    keep = np.argpartition(projected, -k)[-k:]
+    sparse = np.zeros_like(projected)
+    sparse[keep] = projected[keep]
+    return sparse / sparse.sum()
+
+
+def test_simplex_projector_matches_sort_based_projection():
+    from src.analysis.inheritance import _SparseSimplexProjector
+
+    rows = np.random.default_rng(6).standard_normal((50, 9))
+    projected = _SparseSimplexProjector(rows.shape, "simplex", None)(rows, np.empty_like(rows))
+    expected = np.stack([_sorted_simplex_projection(row) for row in rows])
+    np.testing.assert_allclose(projected, expected, atol=1e-14)
+
+
+@pytest.mark.parametrize("size", [10, 50, 200])
+def test_sparse_projector_matches_project_then_truncate(size):
+    from src.analysis.inheritance import _SparseSimplexProjector
+
+    rows = np.random.default_rng(9).standard_normal((4, size))
+    projected = _SparseSimplexProjector(rows.shape, "simplex", 5)(rows, np.empty_like(rows))
+    expected = np.stack([_truncated_simplex_projection(row, 5) for row in rows])
+    np.testing.assert_allclose(projected, expected, atol=1e-14)
+
+
+def test_exact_sparse_projection_is_the_closest_k_sparse_point():
+    from itertools import combinations
+
+    from src.analysis.inheritance import _SparseSimplexProjector
+
+    rows = np.random.default_rng(7).standard_normal((20, 6))
+    projector = _SparseSimplexProjector(rows.shape, "simplex", 2, "exact")
+    projected = projector(rows.copy(), np.empty_like(rows))
+    for row, result in zip(rows, projected):
+        best = np.inf
+        for support in combinations(range(6), 2):
+            candidate = np.zeros(6)
+            candidate[list(support)] = _sorted_simplex_projection(row[list(support)])
+            best = min(best, np.linalg.norm(candidate - row))
+        assert np.count_nonzero(result) <= 2
+        assert result.sum() == pytest.approx(1.0)
+        assert np.linalg.norm(result - row) == pytest.approx(best)
+
+
+@pytest.mark.parametrize("constraint", ["simplex", "nonnegative"])
+def test_exact_sparse_mode_respects_sparsity_in_single_and_batch(constraint):
+    rng = np.random.default_rng(8)
+    parents = rng.standard_normal((24, 7))
+    target = parents @ np.array([0.6, 0.3, 0.0, 0.1, 0.0, 0.0, 0.0])
+    options = dict(constraint=constraint, sparsity=2, method="fista", sparse_projection="exact")
+
+    single = solve_inheritance(target, parents, **options)
+    batch = solve_inheritance_batch([target], [parents], **options)[0]
+    assert np.count_nonzero(single.weights) <= 2
+    np.testing.assert_array_equal(single.weights, batch.weights)
+    with pytest.raises(ValueError):
+        solve_inheritance(target, parents, sparse_projection="greedy")
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from src.analysis import LineageEngine, build_citation_graph, solve_inheritance_parallel
+from src.models import Paper
+
+
+def _chain_weights():
+    # 3 <- 2 <- 1 <- 0 plus a shortcut 2 <- 0
+    dense = np.zeros((4, 4))
+    dense[1, 0] = 0.5
+    dense[2, 1] = 0.4
+    dense[2, 0] = 0.2
+    dense[3, 2] = 0.6
+    return dense
+
+
+def test_full_influence_matches_closed_form():
+    dense = _chain_weights()
+    engine = LineageEngine(sparse.csr_matrix(dense))
+    expected = np.linalg.inv(np.eye(4) - dense) - np.eye(4)
+
+    np.testing.assert_allclose(engine.influence(range(4)).toarray(), expected)
+    np.testing.assert_allclose(engine.descendant_influence(range(4)).toarray(), expected.T)
+    assert engine.contribution(3, 0) == pytest.approx(0.6 * (0.2 + 0.4 * 0.5))
+
+
+def test_truncation_and_threshold_prune_paths():
+    engine = LineageEngine(sparse.csr_matrix(_chain_weights()))
+
+    direct = engine.influence([3, 2], [0, 1, 2], max_depth=1).toarray()
+    np.testing.assert_allclose(direct, [[0.0, 0.0, 0.6], [0.2, 0.4, 0.0]])
+
+    kept = engine.influence([3], [0, 1], threshold=0.1).toarray()
+    np.testing.assert_allclose(kept, [[0.6 * 0.2 + 0.6 * 0.4 * 0.5, 0.6 * 0.4]])
+    pruned = engine.influence([3], [0, 1], threshold=0.15).toarray()
+    np.testing.assert_allclose(pruned, [[0.0, 0.6 * 0.4]])
+    with pytest.raises(ValueError):
+        engine.influence([3], max_depth=0)
+
+
+def test_engine_from_fitted_graph():
+    papers = [
+        Paper("A", "", [], identifier="a", published="2020-01-01"),
+        Paper("B", "", ["a"], identifier="b", published="2021-01-01"),
+        Paper("C", "", ["a", "b"], identifier="c", published="2022-01-01"),
+    ]
+    graph = build_citation_graph(papers)
+    embeddings = np.random.default_rng(1).standard_normal((3, 6))
+    results = dict(solve_inheritance_parallel(embeddings, graph, graph.eligible(), n_workers=1))
+
+    engine = LineageEngine.from_results(graph, results)
+    w_ca, w_cb = results[2].weights
+    w_ba = results[1].weights[0]
+    assert engine.contribution(2, 0) == pytest.approx(w_ca + w_cb * w_ba)
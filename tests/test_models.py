@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.embedding import embed_papers
+from src.models import FrozenPaper, Paper, PaperTable, ReferenceVocabulary
+from src.storage import load_papers, save_papers
+from test_embedding import TokenValueModel, WordTokenizer
+
+
+def _papers():
+    return [
+        Paper("Alpha", "first abstract", ["ref-a", "ref-b"], identifier="1", published="2020-01-01T00:00:00Z"),
+        Paper("Beta", "second abstract", ["ref-b"]),
+        Paper("Gamma é", "third abstract", [], identifier="3"),
+    ]
+
+
+def test_paper_is_slotted_and_freezes_to_hashable_copy():
+    paper = _papers()[0]
+    assert not hasattr(paper, "__dict__")
+
+    frozen = paper.freeze()
+    assert isinstance(frozen, FrozenPaper)
+    assert frozen.references == ("ref-a", "ref-b")
+    assert hash(frozen) == hash(paper.freeze())
+    assert frozen.thaw() == paper
+
+
+def test_reference_vocabulary_shares_ids_across_papers():
+    vocabulary = ReferenceVocabulary()
+    first = vocabulary.encode(["ref-a", "ref-b"])
+    second = vocabulary.encode(["ref-b", "ref-c"])
+
+    assert first.tolist() == [0, 1]
+    assert second.tolist() == [1, 2]
+    assert len(vocabulary) == 3
+    assert vocabulary.decode(second) == ["ref-b", "ref-c"]
+
+
+def test_paper_table_round_trips_and_feeds_existing_callers(tmp_path):
+    papers = _papers()
+    table = PaperTable.from_papers(papers)
+
+    assert len(table) == 3
+    assert table.to_papers() == papers
+    assert table[-1] == papers[-1]
+    assert table[1].identifier is None
+    assert table[0].reference_ids.tolist() == [0, 1]
+    assert len(table.vocabulary) == 2
+    with pytest.raises(IndexError):
+        table[3]
+
+    head = table[:2]
+    assert isinstance(head, PaperTable) and head.vocabulary is table.vocabulary
+    assert head.to_papers() == papers[:2]
+    assert head[1].reference_ids.tolist() == [1]
+    assert table[1:].to_papers() == papers[1:]
+    assert table[::-2].to_papers() == papers[::-2]
+    assert len(table[2:1]) == 0
+
+    save_papers(tmp_path / "papers.json", table)
+    assert load_papers(tmp_path / "papers.json") == papers
+
+    model = TokenValueModel()
+    from_table, _ = embed_papers(table, tokenizer=WordTokenizer(), model=model)
+    from_papers, _ = embed_papers(papers, tokenizer=WordTokenizer(), model=model)
+    np.testing.assert_array_equal(from_table, from_papers)
@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.neighbors import NearestNeighbors
+
+from src.analysis import ExactIndex, IVFIndex, NeighborIndex, evaluate_recall, recall_at_k
+
+
+def _clustered(num_points=400, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((8, dim))
+    return centres[rng.integers(0, 8, num_points)] + 0.3 * rng.standard_normal((num_points, dim))
+
+
+def test_exact_index_matches_sklearn_cosine_search():
+    data = _clustered(num_points=60)
+    index = ExactIndex(query_block=7)
+    index.add(data)
+
+    distances, indices = index.search(data[:10], k=4)
+
+    expected_dist, expected_idx = (
+        NearestNeighbors(n_neighbors=4, metric="cosine").fit(data).kneighbors(data[:10])
+    )
+    assert np.array_equal(indices, expected_idx)
+    assert np.allclose(distances, expected_dist, atol=1e-5)
+
+
+def test_ivf_recall_improves_with_more_probes():
+    data = _clustered()
+    queries = data[:50]
+
+    coarse = IVFIndex(n_lists=16, n_probe=1, random_state=0)
+    coarse.add(data)
+    full = IVFIndex(n_lists=16, n_probe=16, random_state=0)
+    full.add(data)
+
+    low = evaluate_recall(coarse, queries, k=10)
+    assert 0.0 < low <= evaluate_recall(full, queries, k=10) == pytest.approx(1.0)
+
+
+def test_indexes_support_incremental_add_and_save_load(tmp_path: Path):
+    data = _clustered(num_points=120)
+    for index in (ExactIndex(), IVFIndex(n_lists=4, n_probe=2)):
+        index.add(data[:80])
+        index.add(data[80:])
+        assert len(index) == 120
+
+        path = tmp_path / f"{index.kind}.npz"
+        index.save(path)
+        loaded = NeighborIndex.load(path)
+
+        assert type(loaded) is type(index)
+        before = index.search(data[100:110], k=5)
+        after = loaded.search(data[100:110], k=5)
+        assert np.array_equal(before[1], after[1])
+        assert np.allclose(before[0], after[0])
+
+
+def test_base_index_is_abstract():
+    with pytest.raises(TypeError):
+        NeighborIndex()
+
+
+def test_search_pads_when_index_is_small():
+    index = ExactIndex()
+    index.add(np.eye(2))
+    distances, indices = index.search(np.eye(2), k=3)
+    assert indices[:, -1].tolist() == [-1, -1]
+    assert np.isinf(distances[:, -1]).all()
+    assert recall_at_k(indices, indices) == 1.0
+
+
+def test_many_small_adds_match_one_bulk_add(tmp_path: Path):
+    data = _clustered(num_points=150)
+    for make in (ExactIndex, lambda: IVFIndex(n_lists=4, n_probe=2)):
+        bulk, grown = make(), make()
+        bulk.add(data)
+        grown.add(data[:40])
+        for row in data[40:100]:
+            grown.add(row)
+        grown.save(tmp_path / "grown.npz")
+        grown = NeighborIndex.load(tmp_path / "grown.npz")
+        grown.add(data[100:])
+
+        assert len(grown) == len(bulk) == 150
+        assert np.array_equal(grown.search(data[:20], k=6)[1], bulk.search(data[:20], k=6)[1])
+
+
+def test_ivf_batched_search_matches_scanning_probed_cells_per_query():
+    data = _clustered(num_points=300)
+    queries = _clustered(num_points=40, seed=1)
+    index = IVFIndex(n_lists=8, n_probe=3)
+    index.add(data)
+
+    distances, indices = index.search(queries, k=7)
+
+    unit = data / np.linalg.norm(data, axis=1, keepdims=True)
+    cells = np.argmax(unit @ index.centroids.T, axis=1)
+    for query, found, found_dist in zip(queries, indices, distances):
+        query = query / np.linalg.norm(query)
+        probed = np.argsort(-(index.centroids @ query))[:3]
+        candidates = np.flatnonzero(np.isin(cells, probed))
+        scores = unit[candidates] @ query
+        best = candidates[np.lexsort((candidates, -scores))[:7]]
+        assert found.tolist() == best.tolist()
+        assert np.allclose(found_dist, 1.0 - unit[best] @ query, atol=1e-5)
+
+
+def test_incremental_adds_reallocate_storage_logarithmically():
+    index = ExactIndex()
+    index.add(np.ones((1, 4)))
+    reallocations = 0
+    for row in _clustered(num_points=1_000, dim=4):
+        before = index._vectors
+        index.add(row)
+        reallocations += not np.shares_memory(before, index._vectors)
+
+    assert len(index) == 1_001
+    assert reallocations <= 11
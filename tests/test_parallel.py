@@ -0,0 +1,73 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.analysis import solve_inheritance, solve_inheritance_parallel
+
+
+def _corpus(num_papers=12, dim=5, seed=0):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((num_papers, dim))
+    parent_indices = [rng.choice(i, size=min(i, 3), replace=False) if i else [] for i in range(num_papers)]
+    return embeddings, parent_indices
+
+
+def _serial(embeddings, parent_indices, focal_indices, **options):
+    return [
+        solve_inheritance(embeddings[i], embeddings[np.asarray(parent_indices[i], dtype=int)].T, **options)
+        for i in focal_indices
+    ]
+
+
+@pytest.mark.parametrize("n_workers", [1, 2, 3])
+def test_parallel_results_are_ordered_and_match_serial(n_workers):
+    embeddings, parent_indices = _corpus()
+    focal = [11, 3, 0, 7, 5]
+
+    results = list(
+        solve_inheritance_parallel(
+            embeddings, parent_indices, focal, n_workers=n_workers, chunk_size=2, method="fista"
+        )
+    )
+
+    assert [idx for idx, _ in results] == focal
+    for (_, result), expected in zip(results, _serial(embeddings, parent_indices, focal, method="fista")):
+        assert np.array_equal(result.weights, expected.weights)
+        assert result.objective == expected.objective
+
+
+def test_parallel_reads_file_backed_memmap(tmp_path: Path):
+    embeddings, parent_indices = _corpus()
+    mapped = np.lib.format.open_memmap(tmp_path / "emb.npy", mode="w+", dtype=float, shape=embeddings.shape)
+    mapped[...] = embeddings
+    mapped.flush()
+
+    results = dict(solve_inheritance_parallel(np.load(tmp_path / "emb.npy", mmap_mode="r"), parent_indices, n_workers=2))
+
+    expected = _serial(embeddings, parent_indices, range(len(parent_indices)))
+    assert len(results) == len(expected)
+    for idx, result in enumerate(expected):
+        assert np.array_equal(results[idx].weights, result.weights)
+
+
+@pytest.mark.parametrize("context", ["fork", "spawn"])
+def test_shared_memory_segment_is_released_cleanly(context):
+    script = (
+        "import numpy as np\n"
+        "from src.analysis import solve_inheritance_parallel\n"
+        "rng = np.random.default_rng(0)\n"
+        "embeddings = rng.standard_normal((40, 5))\n"
+        "parents = [list(range(max(0, i - 3), i)) for i in range(40)]\n"
+        f"results = list(solve_inheritance_parallel(embeddings, parents, n_workers=4, chunk_size=3, mp_context={context!r}))\n"
+        "assert len(results) == 40\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=Path(__file__).resolve().parents[1], capture_output=True, text=True, timeout=300
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    assert "KeyError" not in completed.stderr
+    assert "leaked" not in completed.stderr
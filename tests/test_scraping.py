@@ -1,6 +1,7 @@
+import io
 import types
 
-from src.scraping import fetch_arxiv_papers, parse_arxiv_feed
+from src.scraping import fetch_arxiv_papers, iter_arxiv_feed, parse_arxiv_feed
 
 
 SAMPLE_FEED = """
@@ -42,3 +43,43 @@ def test_fetch_arxiv_papers_uses_session(monkeypatch):
     session = types.SimpleNamespace(get=fake_get)
     papers = fetch_arxiv_papers("quantum", max_results=2, session=session)
     assert [p.title for p in papers] == ["First Paper", "Second Paper"]
+
+
+def test_iter_arxiv_feed_streams_entries_from_chunks():
+    data = SAMPLE_FEED.encode("utf-8")
+    consumed = []
+
+    def chunks():
+        for start in range(0, len(data), 16):
+            consumed.append(start)
+            yield data[start : start + 16]
+
+    stream = iter_arxiv_feed(chunks())
+    first = next(stream)
+
+    assert first.title == "First Paper"
+    assert first.references == ["Ref A", "Ref B"]
+    assert len(consumed) < len(range(0, len(data), 16))  # yielded before the feed was fully read
+    assert [p.title for p in stream] == ["Second Paper"]
+
+
+def test_iter_arxiv_feed_accepts_file_objects():
+    papers = list(iter_arxiv_feed(io.BytesIO(SAMPLE_FEED.encode("utf-8")), chunk_size=7))
+    assert papers == parse_arxiv_feed(SAMPLE_FEED)
+
+
+def test_fetch_arxiv_papers_can_stream_the_body():
+    calls = {}
+
+    def fake_get(url, params=None, timeout=None, stream=False):
+        calls["stream"] = stream
+        body = SAMPLE_FEED.encode("utf-8")
+        return types.SimpleNamespace(
+            raise_for_status=lambda: None,
+            iter_content=lambda chunk_size: (body[i : i + 10] for i in range(0, len(body), 10)),
+            close=lambda: None,
+        )
+
+    papers = fetch_arxiv_papers("quantum", session=types.SimpleNamespace(get=fake_get), stream=True)
+    assert calls["stream"] is True
+    assert [p.title for p in papers] == ["First Paper", "Second Paper"]
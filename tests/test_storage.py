@@ -1,7 +1,18 @@
 from pathlib import Path
 
-from src.models import Paper
-from src.storage import load_papers, save_papers
+import numpy as np
+import pytest
+
+from src.models import Paper, PaperTable, PaperView
+from src.storage import (
+    append_papers_jsonl,
+    iter_papers_jsonl,
+    load_papers,
+    load_papers_columnar,
+    save_papers,
+    save_papers_columnar,
+    write_papers_jsonl,
+)
 
 
 def test_save_and_load_roundtrip(tmp_path: Path):
@@ -15,3 +26,83 @@ def test_save_and_load_roundtrip(tmp_path: Path):
 
     loaded = load_papers(path)
     assert loaded == papers
+
+
+def test_columnar_roundtrip_with_embeddings(tmp_path: Path):
+    papers = [
+        Paper(title="Sample", abstract="An example paper", references=["Ref1", "Réf2"], identifier="2401.00001"),
+        Paper(title="Another", abstract="Second paper", references=[], updated="2024-01-02T00:00:00Z"),
+    ]
+    embeddings = np.arange(6, dtype=np.float64).reshape(2, 3)
+
+    save_papers_columnar(tmp_path / "corpus", papers, embeddings=embeddings)
+    corpus = load_papers_columnar(tmp_path / "corpus")
+
+    assert list(corpus) == papers
+    assert corpus[-1].identifier is None
+    assert corpus.embeddings.dtype == np.float32
+    assert isinstance(corpus.embeddings, np.memmap)
+    assert np.allclose(corpus.embeddings, embeddings)
+
+
+def test_columnar_loads_only_requested_columns(tmp_path: Path):
+    papers = [Paper(title=f"T{i}", abstract="a" * i, references=[f"R{i}"]) for i in range(4)]
+    save_papers_columnar(tmp_path / "corpus", papers)
+
+    corpus = load_papers_columnar(tmp_path / "corpus", columns=["title"])
+
+    assert corpus.column("title") == ["T0", "T1", "T2", "T3"]
+    assert corpus.embeddings is None
+    assert corpus[2] == Paper(title="T2", abstract="", references=[])
+    with pytest.raises(KeyError):
+        corpus.value("references", 0)
+
+
+def test_columnar_corpus_loads_as_paper_table(tmp_path: Path):
+    papers = [
+        Paper(title="Sample", abstract="An example paper", references=["Ref1", "Réf2"], identifier="2401.00001"),
+        Paper(title="Another", abstract="Second paper", references=["Réf2"], updated="2024-01-02T00:00:00Z"),
+    ]
+    save_papers_columnar(tmp_path / "corpus", papers)
+
+    table = load_papers_columnar(tmp_path / "corpus", as_table=True)
+
+    assert isinstance(table, PaperTable)
+    assert isinstance(table[0], PaperView)
+    assert table.to_papers() == papers
+    assert table[1].reference_ids.tolist() == [1]
+    assert table.vocabulary.decode([0, 1]) == ["Ref1", "Réf2"]
+
+    titles_only = load_papers_columnar(tmp_path / "corpus", columns=["title"]).to_table(table.vocabulary)
+    assert titles_only.to_papers() == [Paper(title=paper.title, abstract="", references=[]) for paper in papers]
+    assert titles_only.vocabulary is table.vocabulary
+
+
+def test_columnar_handles_empty_corpus(tmp_path: Path):
+    save_papers_columnar(tmp_path / "corpus", [])
+    assert list(load_papers_columnar(tmp_path / "corpus")) == []
+    assert len(load_papers_columnar(tmp_path / "corpus", as_table=True)) == 0
+
+
+def test_jsonl_streams_writes_appends_and_slices(tmp_path: Path):
+    path = tmp_path / "papers.jsonl"
+    papers = (Paper(title=f"P{i}", abstract="", references=[f"R{i}"]) for i in range(5))
+
+    assert write_papers_jsonl(path, papers) == 5
+    assert append_papers_jsonl(path, [Paper(title="P5", abstract="", references=[])]) == 1
+
+    assert [p.title for p in iter_papers_jsonl(path)] == [f"P{i}" for i in range(6)]
+    assert [p.title for p in iter_papers_jsonl(path, start=2, stop=4)] == ["P2", "P3"]
+    odd = iter_papers_jsonl(path, predicate=lambda p: int(p.title[1:]) % 2 == 1)
+    assert [p.title for p in odd] == ["P1", "P3", "P5"]
+
+
+def test_jsonl_append_repairs_torn_final_line(tmp_path: Path):
+    path = tmp_path / "papers.jsonl"
+    write_papers_jsonl(path, [Paper(title="Kept", abstract="", references=[])])
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"title": "Tor')
+
+    assert [p.title for p in iter_papers_jsonl(path)] == ["Kept"]
+    append_papers_jsonl(path, [Paper(title="Next", abstract="", references=[])])
+    assert [p.title for p in iter_papers_jsonl(path)] == ["Kept", "Next"]